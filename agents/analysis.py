@@ -1,41 +1,81 @@
-from openai import OpenAI
+from typing import List
 
-class AnalysisAgent:
-    def __init__(self, client: OpenAI):
-        self.client = client
+from agents.base import LLMAgent, message_content
+from agents.quality import analysis_issue, summary_issue
 
-    def process(self, text: str) -> str:
-        """
-        Analyzes the meeting flow and context.
-        """
-        print("🧠 [Analysis Agent] Analyzing meeting context and flow...")
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
+class AnalysisAgent(LLMAgent):
+    tiers_env = "ANALYSIS_MODEL_TIERS"
+
+    def _analysis_request(self, text: str) -> dict:
+        return dict(
             messages=[
                 {"role": "system", "content": "You are an expert business analyst. Analyze the following meeting transcript. Identify the main topics, key decisions made, and the general flow of the conversation. Output a concise analysis in Korean."},
                 {"role": "user", "content": text}
             ]
         )
-        analysis = response.choices[0].message.content
+
+    def _merge_request(self, analyses: List[str]) -> dict:
+        sections = "\n\n".join(f"[Section {i + 1}]\n{a}" for i, a in enumerate(analyses))
+        return dict(
+            messages=[
+                {"role": "system", "content": "You are an expert business analyst. You are given analyses of consecutive sections of one meeting, in order. Merge them into a single analysis of the whole meeting: main topics, key decisions made, and the general flow of the conversation. Remove repetition. Output a concise analysis in Korean."},
+                {"role": "user", "content": sections}
+            ]
+        )
+
+    async def aprocess(self, text: str) -> str:
+        """
+        Analyzes the meeting flow and context.
+        """
+        print("🧠 [Analysis Agent] Analyzing meeting context and flow...")
+        analysis = await self._acomplete(self._analysis_request(text), message_content, analysis_issue)
         print("✅ [Analysis Agent] Analysis complete.")
         return analysis
 
-class SummarizationAgent:
-    def __init__(self, client: OpenAI):
-        self.client = client
-
-    def process(self, text: str, analysis: str) -> str:
+    async def amerge(self, analyses: List[str]) -> str:
         """
-        Generates a concise executive summary based on text and analysis.
+        Merges analyses of consecutive transcript sections into one analysis.
         """
-        print("📝 [Summarization Agent] Generating executive summary...")
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
+        if len(analyses) == 1:
+            return analyses[0]
+        print(f"🧠 [Analysis Agent] Merging {len(analyses)} section analyses...")
+        return await self._acomplete(self._merge_request(analyses), message_content, analysis_issue)
+
+class SummarizationAgent(LLMAgent):
+    tiers_env = "SUMMARY_MODEL_TIERS"
+
+    def _summary_request(self, text: str, analysis: str) -> dict:
+        return dict(
             messages=[
                 {"role": "system", "content": "You are an executive secretary. Create a 3-5 sentence summary of the meeting based on the transcript and analysis provided. The summary should be suitable for an executive report. Tone: Professional, Concise. Language: Korean (Must)."},
                 {"role": "user", "content": f"Context Analysis: {analysis}\n\nTranscript: {text}"}
             ]
         )
-        summary = response.choices[0].message.content
+
+    def _sections_request(self, section_analyses: List[str], analysis: str) -> dict:
+        sections = "\n\n".join(f"[Section {i + 1}]\n{a}" for i, a in enumerate(section_analyses))
+        return dict(
+            messages=[
+                {"role": "system", "content": "You are an executive secretary. Create a 3-5 sentence summary of the meeting based on the overall analysis and the section-by-section analyses provided. The summary should be suitable for an executive report. Tone: Professional, Concise. Language: Korean (Must)."},
+                {"role": "user", "content": f"Overall Analysis: {analysis}\n\nSection Analyses:\n{sections}"}
+            ]
+        )
+
+    async def aprocess(self, text: str, analysis: str) -> str:
+        """
+        Generates a concise executive summary based on text and analysis.
+        """
+        print("📝 [Summarization Agent] Generating executive summary...")
+        summary = await self._acomplete(self._summary_request(text, analysis), message_content, summary_issue)
+        print("✅ [Summarization Agent] Summary generated.")
+        return summary
+
+    async def aprocess_sections(self, section_analyses: List[str], analysis: str) -> str:
+        """
+        Generates the executive summary from per-section analyses instead of the full transcript.
+        Used when the transcript is too long for a single prompt.
+        """
+        print(f"📝 [Summarization Agent] Generating executive summary from {len(section_analyses)} sections...")
+        summary = await self._acomplete(self._sections_request(section_analyses, analysis), message_content, summary_issue)
         print("✅ [Summarization Agent] Summary generated.")
         return summary
@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import subprocess
+from typing import List, Tuple
+
+# Helpers around the ffmpeg / ffprobe binaries (installed in the Docker image)
+
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
+
+
+def probe_duration(audio_file_path: str) -> float:
+    """
+    Returns the duration of an audio file in seconds.
+    """
+    result = subprocess.run(
+        [FFPROBE_BIN, "-v", "error", "-show_entries", "format=duration", "-of", "json", audio_file_path],
+        capture_output=True, text=True, check=True
+    )
+    return float(json.loads(result.stdout)["format"]["duration"])
+
+
+def extract_segment(audio_file_path: str, start: float, duration: float, output_path: str) -> str:
+    """
+    Cuts [start, start + duration) out of the input as a mono 16 kHz mp3.
+    Re-encoding keeps the cut sample-accurate and the upload small.
+    """
+    subprocess.run(
+        [FFMPEG_BIN, "-v", "error", "-y", "-ss", f"{start:.3f}", "-t", f"{duration:.3f}",
+         "-i", audio_file_path, "-vn", "-ac", "1", "-ar", "16000", "-b:a", "64k", output_path],
+        capture_output=True, check=True
+    )
+    return output_path
+
+
+def plan_segments(total: float, chunk_seconds: float, overlap_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Splits [0, total) into (start, duration) windows of `chunk_seconds`,
+    each overlapping the previous one by `overlap_seconds`.
+    """
+    if chunk_seconds <= overlap_seconds:
+        raise ValueError("chunk_seconds must be larger than overlap_seconds")
+    segments = []
+    start = 0.0
+    step = chunk_seconds - overlap_seconds
+    while start < total:
+        duration = min(chunk_seconds, total - start)
+        segments.append((start, duration))
+        if start + duration >= total:
+            break
+        start += step
+    return segments
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word).lower()
+
+
+def _longest_common_run(a: List[str], b: List[str]) -> Tuple[int, int, int]:
+    """
+    Returns (i, j, length) of the longest contiguous run shared by a[i:] and b[j:].
+    """
+    best = (0, 0, 0)
+    prev = [0] * (len(b) + 1)
+    for i in range(1, len(a) + 1):
+        cur = [0] * (len(b) + 1)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] and a[i - 1] == b[j - 1]:
+                cur[j] = prev[j - 1] + 1
+                if cur[j] > best[2]:
+                    best = (i - cur[j], j - cur[j], cur[j])
+        prev = cur
+    return best
+
+
+def stitch_transcripts(parts: List[str], max_overlap_words: int = 40, min_overlap_words: int = 2) -> str:
+    """
+    Joins chunk transcripts, dropping words repeated across each overlap.
+    The longest run of words shared by the tail of the running text and the head
+    of the next chunk (ignoring case and punctuation) is treated as the duplicated
+    region; words cut off at either chunk boundary around it are discarded too.
+    """
+    words: List[str] = []
+    for part in parts:
+        next_words = part.split()
+        if not words:
+            words.extend(next_words)
+            continue
+
+        tail = [_normalize_word(w) for w in words[-max_overlap_words:]]
+        head = [_normalize_word(w) for w in next_words[:max_overlap_words]]
+        i, j, length = _longest_common_run(tail, head)
+        if length >= min_overlap_words:
+            del words[len(words) - len(tail) + i + length:]
+            words.extend(next_words[j + length:])
+        else:
+            words.extend(next_words)
+    return " ".join(words)
+
+
+def decode_pcm(audio_file_path: str, sample_rate: int = 16000) -> bytes:
+    """
+    Decodes any input to raw 16-bit little-endian mono PCM at `sample_rate`
+    (ffmpeg handles the downmix and resampling).
+    """
+    result = subprocess.run(
+        [FFMPEG_BIN, "-v", "error", "-i", audio_file_path, "-vn", "-ac", "1", "-ar", str(sample_rate),
+         "-f", "s16le", "-"],
+        capture_output=True, check=True
+    )
+    return result.stdout
+
+
+def encode_pcm(pcm: bytes, output_path: str, sample_rate: int = 16000, bitrate: str = "48k") -> str:
+    """
+    Encodes raw 16-bit mono PCM to a compact mp3 suitable for Whisper upload.
+    """
+    subprocess.run(
+        [FFMPEG_BIN, "-v", "error", "-y", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "-",
+         "-b:a", bitrate, output_path],
+        input=pcm, capture_output=True, check=True
+    )
+    return output_path
+
+
+def detect_speech(samples, sample_rate: int, frame_ms: int = 30, margin_db: float = 12.0,
+                  floor_db: float = -50.0, min_silence_ms: int = 600, pad_ms: int = 200) -> List[Tuple[int, int]]:
+    """
+    Energy-based voice activity detection over int16 samples (numpy array).
+    A frame counts as speech when its RMS level is `margin_db` above the noise floor
+    (10th percentile of frame levels) and above `floor_db`. Speech regions are padded
+    by `pad_ms` and silences shorter than `min_silence_ms` are kept.
+    Returns (start_sample, end_sample) spans to keep.
+    """
+    import numpy as np
+
+    frame = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    frames = samples[:n_frames * frame].astype(np.float32).reshape(n_frames, frame) / 32768.0
+    level_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+    threshold = max(floor_db, float(np.percentile(level_db, 10)) + margin_db)
+    speech = level_db > threshold
+
+    # Pad speech regions, then fill gaps shorter than the minimum silence
+    pad = max(0, pad_ms // frame_ms)
+    if pad:
+        speech = np.convolve(speech.astype(np.int32), np.ones(2 * pad + 1, dtype=np.int32), mode="same") > 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) == 0:
+        return []
+
+    min_gap = max(1, min_silence_ms // frame_ms)
+    keep = np.concatenate(([True], (starts[1:] - ends[:-1]) >= min_gap))
+    merged_starts = starts[keep]
+    merged_ends = np.append(ends[np.flatnonzero(keep)[1:] - 1], ends[-1])
+
+    spans = [(int(s) * frame, int(e) * frame) for s, e in zip(merged_starts, merged_ends)]
+    # The trailing partial frame belongs to the last span if that span reaches the end
+    if spans and spans[-1][1] == n_frames * frame:
+        spans[-1] = (spans[-1][0], len(samples))
+    return spans
+
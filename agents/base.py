@@ -0,0 +1,123 @@
+import asyncio
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, TypeVar
+
+from hedging import HedgePolicy, get_policy, hedged
+from metrics import (LLM_CALLS, LLM_CALL_SECONDS, LLM_ESCALATIONS, LLM_HEDGES, LLM_TIER_RESULTS,
+                     record_llm_usage, track_request)
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+T = TypeVar("T")
+
+# Models tried in order (fastest first); a later tier is only used when the previous answer fails its checks
+DEFAULT_MODEL_TIERS = "gpt-4o-mini,gpt-4o"
+
+def message_content(response) -> str:
+    return response.choices[0].message.content
+
+class LLMAgent:
+    """
+    Shared plumbing for agents that call chat completions. Agents are async-only:
+    requests go through `async_client`, and only fall back to the sync `client` in a
+    worker thread when no async client is configured.
+    Every call is timed and its token usage recorded under the agent's class name.
+    Calls are hedged when the hedge policy (LLM_HEDGE_*) says so.
+
+    `_acomplete` runs a request through the agent's model tiers
+    (`tiers_env`, else LLM_MODEL_TIERS), escalating while the parsed answer fails its check.
+    """
+
+    # Env var holding this agent's comma-separated model tiers
+    tiers_env = ""
+
+    def __init__(self, client: "OpenAI", async_client: Optional["AsyncOpenAI"] = None,
+                 hedge_policy: Optional[HedgePolicy] = None, model_tiers: Optional[List[str]] = None):
+        self.client = client
+        self.async_client = async_client
+        self._hedge_policy = hedge_policy
+        if model_tiers is None:
+            spec = (os.getenv(self.tiers_env) if self.tiers_env else None) or os.getenv("LLM_MODEL_TIERS", DEFAULT_MODEL_TIERS)
+            model_tiers = [model.strip() for model in spec.split(",") if model.strip()]
+            if not model_tiers:
+                print(f"⚠️ [{self._tag}] No model tiers configured ({spec!r}). Using {DEFAULT_MODEL_TIERS}.")
+                model_tiers = DEFAULT_MODEL_TIERS.split(",")
+        if not model_tiers:
+            raise ValueError(f"{type(self).__name__} needs at least one model tier")
+        self.model_tiers = list(model_tiers)
+
+    @property
+    def _tag(self) -> str:
+        # Log tag: "TaskExtractionAgent" -> "Task Extraction Agent"
+        return re.sub(r"(?<!^)(?=[A-Z])", " ", type(self).__name__)
+
+    @property
+    def hedge_policy(self) -> HedgePolicy:
+        return self._hedge_policy or get_policy()
+
+    def _create(self, **request: Any):
+        # Transport fallback for `_acreate` (run in a worker thread) when there is no async client
+        agent = type(self).__name__
+        started = time.perf_counter()
+        with track_request("openai_chat", agent):
+            response = self.client.chat.completions.create(**request)
+        LLM_CALLS.inc(agent=agent)
+        LLM_CALL_SECONDS.observe(time.perf_counter() - started, agent=agent)
+        record_llm_usage(agent, request.get("model", ""), response)
+        return response
+
+    async def _arequest(self, agent: str, request: dict):
+        started = time.perf_counter()
+        with track_request("openai_chat", agent):
+            response = await self.async_client.chat.completions.create(**request)
+        if not getattr(response, "cached", False):
+            self.hedge_policy.observe(agent, time.perf_counter() - started)
+        return response
+
+    async def _acreate(self, **request: Any):
+        if self.async_client is None:
+            return await asyncio.to_thread(self._create, **request)
+        agent = type(self).__name__
+        policy = self.hedge_policy
+        started = time.perf_counter()
+        response, winner = await hedged(lambda: self._arequest(agent, request), policy.delay(agent))
+        elapsed = time.perf_counter() - started
+        LLM_CALLS.inc(agent=agent)
+        LLM_CALL_SECONDS.observe(elapsed, agent=agent)
+        if policy.enabled:
+            policy.record_call(winner is not None)
+        if winner is not None:
+            LLM_HEDGES.inc(agent=agent, winner=winner)
+        record_llm_usage(agent, request.get("model", ""), response)
+        return response
+
+    def _accept(self, model: str, tier: int, issue: Optional[str]) -> bool:
+        """
+        Records the tier outcome; returns True when the answer should be used.
+        """
+        agent = type(self).__name__
+        tag = self._tag
+        if issue is None:
+            LLM_TIER_RESULTS.inc(agent=agent, model=model, outcome="accepted")
+            return True
+        if tier == len(self.model_tiers) - 1:
+            LLM_TIER_RESULTS.inc(agent=agent, model=model, outcome="exhausted")
+            print(f"⚠️ [{tag}] {model} output failed checks ({issue}); no larger model left.")
+            return True
+        LLM_TIER_RESULTS.inc(agent=agent, model=model, outcome="escalated")
+        LLM_ESCALATIONS.inc(agent=agent, model=model, reason=issue)
+        print(f"⤴️ [{tag}] {model} output failed checks ({issue}); escalating to {self.model_tiers[tier + 1]}.")
+        return False
+
+    async def _acomplete(self, request: dict, parse: Callable[[Any], T], check: Callable[[T], Optional[str]]) -> T:
+        """
+        Sends `request` with each model tier in turn and returns `parse(response)` from the
+        first tier whose answer passes `check` (None = ok, else a reason); the last tier's answer is kept regardless.
+        """
+        for tier, model in enumerate(self.model_tiers):
+            result = parse(await self._acreate(**request, model=model))
+            if self._accept(model, tier, check(result)):
+                return result
@@ -0,0 +1,65 @@
+import re
+from typing import List
+
+# Speaker turn such as "John: ..." or "화자 1: ..." at the start of a line
+SPEAKER_TURN_RE = re.compile(r"^\s*[^\n:]{1,40}:\s", re.MULTILINE)
+SENTENCE_END_RE = re.compile(r"(?<=[.!?。？！])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate without a tokenizer: ~4 ASCII chars per token,
+    ~1.5 chars per token for Hangul and other non-ASCII text.
+    """
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+
+def split_turns(text: str) -> List[str]:
+    """
+    Splits a transcript at speaker turns. Transcripts without speaker labels
+    (e.g. raw Whisper output) are split at sentence boundaries instead.
+    """
+    starts = [m.start() for m in SPEAKER_TURN_RE.finditer(text)]
+    if len(starts) > 1:
+        if starts[0] != 0:
+            starts.insert(0, 0)
+        turns = [text[a:b] for a, b in zip(starts, starts[1:] + [len(text)])]
+    else:
+        turns = SENTENCE_END_RE.split(text)
+    return [t.strip() for t in turns if t.strip()]
+
+
+def _split_oversized(turn: str, max_tokens: int) -> List[str]:
+    if estimate_tokens(turn) <= max_tokens:
+        return [turn]
+    pieces = []
+    for sentence in SENTENCE_END_RE.split(turn):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # A single run-on sentence: fall back to fixed-size slices
+        step = max(1, int(len(sentence) * max_tokens / estimate_tokens(sentence)))
+        pieces.extend(sentence[i:i + step] for i in range(0, len(sentence), step))
+    return pieces
+
+
+def chunk_transcript(text: str, max_tokens: int) -> List[str]:
+    """
+    Packs consecutive turns into chunks of at most ~max_tokens each.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for turn in split_turns(text):
+        for piece in _split_oversized(turn, max_tokens):
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,91 @@
+import json
+
+from typing import Optional
+
+from agents.base import LLMAgent
+from agents.quality import analysis_issue, extraction_issue, summary_issue
+
+class CombinedExtractionAgent(LLMAgent):
+    tiers_env = "COMBINED_MODEL_TIERS"
+
+    def _combined_request(self, text: str) -> dict:
+        prompt = f"""
+        Analyze the meeting transcript and produce the analysis, an executive summary, meeting metadata and actionable tasks (TODOs).
+        All output values must be in Korean (except for dates).
+
+        Output JSON Format:
+        {{
+            "analysis": "string (Main topics, key decisions made and the general flow of the conversation. Concise.)",
+            "summary": "string (3-5 sentence executive summary. Tone: Professional, Concise.)",
+            "meeting_title": "string (Inferred title in Korean)",
+            "meeting_date": "YYYY-MM-DD (If mentioned, else null. MUST be YYYY-MM-DD format)",
+            "participants": ["Name1", "Name2", ...],
+            "todos": [
+                {{
+                    "action": "string (Task Title in Korean)",
+                    "description": "string (Detailed description in Korean)",
+                    "owner": "string (Assignee name or null)",
+                    "due": "YYYY-MM-DD or null (MUST be YYYY-MM-DD format. If vague like 'next week', use null)"
+                }}
+            ]
+        }}
+
+        Rules:
+        1. 'action' should be a short summary (Tasks.Title) in Korean.
+        2. 'description' should contain more context (Tasks.Description) in Korean.
+        3. Extract all participants mentioned or speaking.
+        4. Dates MUST be strictly YYYY-MM-DD. If exact date is unknown, use null. Do NOT use text like "다음주" or "올겨울".
+
+        Transcript: {text}
+        """
+
+        return dict(
+            messages=[
+                {"role": "system", "content": "You are an expert business analyst and executive secretary. You output only valid JSON. All text content must be in Korean."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"}
+        )
+
+    def _parse(self, response) -> Optional[dict]:
+        # None on a parse failure, so the model tiers can escalate
+        try:
+            data = json.loads(response.choices[0].message.content)
+        except (TypeError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    def _check(data: Optional[dict]) -> Optional[str]:
+        if data is None:
+            return "json"
+        return analysis_issue(data.get("analysis")) or summary_issue(data.get("summary")) or extraction_issue(data)
+
+    def _result(self, data: Optional[dict]) -> dict:
+        if data is None:
+            print("❌ [Combined Extraction Agent] Failed to parse JSON.")
+            data = {}
+        else:
+            data = dict(data)
+
+        result = {
+            "analysis": data.pop("analysis", "") or "",
+            "summary": data.pop("summary", "") or "",
+            "extracted_data": {
+                "meeting_title": data.get("meeting_title") or "Untitled Meeting",
+                "meeting_date": data.get("meeting_date"),
+                "participants": data.get("participants") or [],
+                "todos": data.get("todos") or [],
+            },
+        }
+        print("✅ [Combined Extraction Agent] Extraction complete.")
+        return result
+
+    async def aprocess(self, text: str) -> dict:
+        """
+        Produces the analysis, executive summary, meeting metadata and todos in a single call.
+        Returns {"analysis": str, "summary": str, "extracted_data": dict} where
+        extracted_data has the same shape as TaskExtractionAgent's output.
+        """
+        print("⚡ [Combined Extraction Agent] Analyzing, summarizing and extracting tasks in one pass...")
+        return self._result(await self._acomplete(self._combined_request(text), self._parse, self._check))
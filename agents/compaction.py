@@ -0,0 +1,196 @@
+import re
+from typing import List, Optional, Tuple
+
+from agents.chunking import estimate_tokens
+from metrics import TRANSCRIPT_TOKENS
+
+# Deterministic transcript clean-up ahead of the LLM prompts.
+# Everything here is rule-based so the same transcript always compacts the same way
+# (which also keeps the LLM response cache effective).
+
+TIMESTAMP_RE = re.compile(r"^\s*[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?[\])]?\s*[-–]?\s*")
+# Speaker labels: generic diarization labels ("Speaker 1", "SPEAKER_01", "화자 1"), or a name of
+# 1-3 words without digits ("Sarah", "Dr. Kim", "김민수"); Latin words must be capitalized so
+# "The plan is: ..." stays text. The colon must be followed by a space, so "10:30" never matches.
+GENERIC_LABEL = r"(?i:speaker|spk|화자|발화자)[\s_-]*\d+"
+NAME_WORD = r"(?:[A-Z][A-Za-z.'’-]*|[가-힣]+)"
+TURN_RE = re.compile(
+    rf"^\s*(?P<speaker>{GENERIC_LABEL}|{NAME_WORD}(?:[ \t]+{NAME_WORD}){{0,2}})[ \t]*:(?:\s+|$)(?P<text>.*)$"
+)
+# Generic diarization labels shortened to "S1"
+GENERIC_SPEAKER_RE = re.compile(r"^(?:speaker|spk|화자|발화자)[\s_-]*0*(\d+)$", re.IGNORECASE)
+
+# Fillers that carry no content. Korean fillers are only removed as standalone words;
+# ambiguous ones ("그", "저", "이제", "막", "그러니까") are left alone.
+EN_FILLERS = r"(?:u+m+|u+h+m*|e+r+m*|hmm+|mm+|ah+|you know|i mean)"
+KO_FILLERS = r"(?:음+|으음|어+|에+|흠+|그니까|뭐랄까|있잖아요?)"
+FILLER_RE = re.compile(
+    rf"(?:,\s*)?(?<![\w가-힣])(?:{EN_FILLERS}|{KO_FILLERS})(?![\w가-힣])(?:\s*(?:\.\.\.|…|,))?\s*",
+    re.IGNORECASE
+)
+# ", like," used as a filler (but not "I like it")
+LIKE_FILLER_RE = re.compile(r",\s*like,\s*", re.IGNORECASE)
+# False starts: "I- I", "w-we" (the fragment must prefix the next word, so "follow-up" is kept)
+FALSE_START_RE = re.compile(r"(?<![\w가-힣])([\w가-힣]+)-\s*(?=\1)", re.IGNORECASE)
+WORD_RE = re.compile(r"\S+")
+# Sentence boundary: end punctuation followed by whitespace, so "3.5", "1.5 million" and
+# "example.com" are never split. The whitespace is captured to be put back unchanged.
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?。？！])(\s+)")
+# Words that are collapsed when merely doubled ("I I think", "the the plan"); any other word
+# or phrase needs three repeats in a row, so names like "Bora Bora" are kept
+STUTTER_WORDS = frozenset((
+    "i", "im", "we", "were", "you", "he", "she", "it", "its", "they", "the", "a", "an", "to", "and", "so",
+    "but", "or", "that", "this", "is", "was", "my", "our", "lets", "like",
+    "저", "제가", "저는", "나", "내가", "그", "이", "그래서", "근데", "그리고", "네", "아니",
+))
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w가-힣]", "", word).lower()
+
+
+def _strip_fillers(text: str) -> Tuple[str, int]:
+    text, like_count = LIKE_FILLER_RE.subn(" ", text)
+    text, filler_count = FILLER_RE.subn(" ", text)
+    text, false_starts = FALSE_START_RE.subn("", text)
+    return text, like_count + filler_count + false_starts
+
+
+def _collapse_repeated_words(text: str, max_ngram: int = 4) -> Tuple[str, int]:
+    """
+    Collapses immediately repeated 1-4 word sequences ("we we need", "let's start let's start
+    let's start"). Comparison ignores case and punctuation; the first occurrence is kept.
+    A doubled sequence is only collapsed when it consists of STUTTER_WORDS; anything else
+    has to occur three times in a row.
+    """
+    words = WORD_RE.findall(text)
+    keys = [_normalize_word(w) for w in words]
+    out: List[str] = []
+    collapsed = 0
+    i = 0
+    while i < len(words):
+        for n in range(max_ngram, 0, -1):
+            unit = keys[i:i + n]
+            if len(unit) < n or not all(unit):
+                continue
+            repeats = 1
+            while keys[i + repeats * n:i + (repeats + 1) * n] == unit:
+                repeats += 1
+            if repeats >= 3 or (repeats == 2 and all(key in STUTTER_WORDS for key in unit)):
+                kept = words[i:i + n]
+                # Keep the trailing punctuation of the last repeat (e.g. the sentence end)
+                last = words[i + repeats * n - 1]
+                if last[-1:] in ".!?" and kept[-1][-1:] not in ".!?":
+                    kept[-1] = kept[-1].rstrip(",;") + last[-1]
+                out.extend(kept)
+                i += repeats * n
+                collapsed += repeats - 1
+                break
+        else:
+            out.append(words[i])
+            i += 1
+    return " ".join(out), collapsed
+
+
+def _dedupe_sentences(text: str) -> Tuple[str, int]:
+    """
+    Drops a sentence that repeats the previous one, keeping the original separators.
+    """
+    # [sentence, separator, sentence, separator, ..., sentence]
+    parts = SENTENCE_SPLIT_RE.split(text)
+    out = [parts[0]]
+    last_key = _normalize_word(parts[0])
+    removed = 0
+    for separator, sentence in zip(parts[1::2], parts[2::2]):
+        key = _normalize_word(sentence)
+        if key and key == last_key:
+            removed += 1
+            continue
+        out += [separator, sentence]
+        if key:
+            last_key = key
+    return "".join(out), removed
+
+
+def _tidy(text: str) -> str:
+    text = re.sub(r"\s+([,.!?])", r"\1", text)
+    text = re.sub(r"([,.!?])(?:\s*,)+", r"\1", text)  # ", ," / "., "
+    text = re.sub(r"^[\s,.…]+", "", text)
+    text = re.sub(r"\s{2,}", " ", text).strip()
+    # Re-capitalize an English sentence start left lowercase by a removed filler
+    return text[:1].upper() + text[1:] if text[:1].isascii() else text
+
+
+def _speaker_label(label: str) -> str:
+    label = re.sub(r"\s+", " ", label).strip()
+    generic = GENERIC_SPEAKER_RE.match(label)
+    return f"S{generic.group(1)}" if generic else label
+
+
+def compact_transcript(text: str) -> Tuple[str, dict]:
+    """
+    Returns (compacted_text, report). Compaction:
+    - drops timestamps and normalizes speaker labels (generic ones become "S1", "S2", ...)
+    - merges consecutive turns by the same speaker into one line
+    - strips English and Korean fillers and hyphenated false starts
+    - collapses immediately repeated words, phrases and sentences
+    """
+    turns: List[List[Optional[str]]] = []  # [speaker, text]
+    for line in text.splitlines():
+        line = TIMESTAMP_RE.sub("", line.strip())
+        if not line:
+            continue
+        match = TURN_RE.match(line)
+        speaker, body = (_speaker_label(match.group("speaker")), match.group("text")) if match else (None, line)
+        if turns and (speaker is None or speaker == turns[-1][0]):
+            turns[-1][1] += " " + body
+        else:
+            turns.append([speaker, body])
+
+    stats = {"fillers_removed": 0, "repeats_collapsed": 0}
+    lines = []
+    for speaker, body in turns:
+        body, fillers = _strip_fillers(body)
+        body, repeats = _collapse_repeated_words(body)
+        body, sentences = _dedupe_sentences(body)
+        stats["fillers_removed"] += fillers
+        stats["repeats_collapsed"] += repeats + sentences
+        body = _tidy(body)
+        if body:
+            lines.append(f"{speaker}: {body}" if speaker else body)
+
+    compacted = "\n".join(lines)
+    tokens_before, tokens_after = estimate_tokens(text), estimate_tokens(compacted)
+    report = {
+        "turns": len(lines),
+        **stats,
+        "chars_before": len(text),
+        "chars_after": len(compacted),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "token_reduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0,
+    }
+    return compacted, report
+
+
+def missing_facts(text: str, facts: List[str]) -> List[str]:
+    """
+    Returns the facts (names, key phrases) that do not appear in `text` (case-insensitive).
+    """
+    lowered = text.lower()
+    return [fact for fact in facts if fact.lower() not in lowered]
+
+
+class TranscriptCompactionAgent:
+    def process(self, text: str) -> str:
+        """
+        Compacts the transcript and logs the token reduction.
+        """
+        compacted, report = compact_transcript(text)
+        TRANSCRIPT_TOKENS.inc(report["tokens_before"], stage="raw")
+        TRANSCRIPT_TOKENS.inc(report["tokens_after"], stage="compacted")
+        print(f"🗜️ [Compaction Agent] {report['tokens_before']} → {report['tokens_after']} tokens "
+              f"(-{report['token_reduction']:.0%}; {report['fillers_removed']} fillers, "
+              f"{report['repeats_collapsed']} repeats removed)")
+        return compacted
+
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import tempfile
+from typing import Optional
+
+from agents.audio import decode_pcm, detect_speech, encode_pcm
+from metrics import AUDIO_BYTES, AUDIO_SECONDS
+
+class AudioPreprocessingAgent:
+    """
+    Downmixes to mono, resamples to 16 kHz and cuts silence before the Whisper upload.
+    """
+
+    def __init__(self, sample_rate: Optional[int] = None):
+        self.sample_rate = sample_rate or int(os.getenv("AUDIO_PREPROCESS_SAMPLE_RATE", "16000"))
+        self.bitrate = os.getenv("AUDIO_PREPROCESS_BITRATE", "48k")
+        self.margin_db = float(os.getenv("VAD_MARGIN_DB", "12"))
+        self.floor_db = float(os.getenv("VAD_FLOOR_DB", "-50"))
+        self.min_silence_ms = int(os.getenv("VAD_MIN_SILENCE_MS", "600"))
+        self.pad_ms = int(os.getenv("VAD_PAD_MS", "200"))
+
+    def process(self, audio_file_path: str) -> dict:
+        """
+        Writes a preprocessed copy of the audio to a temp file (the caller deletes it).
+        Returns {"path", "original_seconds", "processed_seconds", "removed_seconds",
+        "original_bytes", "processed_bytes", "removed_bytes"}.
+        """
+        import numpy as np
+
+        print(f"🎚️ [Audio Preprocessing Agent] Downmixing and removing silence: {audio_file_path}...")
+        samples = np.frombuffer(decode_pcm(audio_file_path, self.sample_rate), dtype=np.int16)
+        spans = detect_speech(samples, self.sample_rate, margin_db=self.margin_db, floor_db=self.floor_db,
+                              min_silence_ms=self.min_silence_ms, pad_ms=self.pad_ms)
+        if not spans:
+            # Nothing above the threshold; keep everything rather than upload empty audio
+            spans = [(0, len(samples))]
+        kept = np.concatenate([samples[start:end] for start, end in spans])
+
+        fd, output_path = tempfile.mkstemp(prefix="preprocessed_", suffix=".mp3")
+        os.close(fd)
+        try:
+            encode_pcm(kept.tobytes(), output_path, self.sample_rate, self.bitrate)
+        except Exception:
+            os.remove(output_path)
+            raise
+
+        original_seconds = len(samples) / self.sample_rate
+        processed_seconds = len(kept) / self.sample_rate
+        original_bytes = os.path.getsize(audio_file_path)
+        processed_bytes = os.path.getsize(output_path)
+        report = {
+            "path": output_path,
+            "original_seconds": round(original_seconds, 2),
+            "processed_seconds": round(processed_seconds, 2),
+            "removed_seconds": round(original_seconds - processed_seconds, 2),
+            "original_bytes": original_bytes,
+            "processed_bytes": processed_bytes,
+            "removed_bytes": original_bytes - processed_bytes,
+        }
+        AUDIO_SECONDS.inc(original_seconds, stage="raw")
+        AUDIO_SECONDS.inc(processed_seconds, stage="preprocessed")
+        AUDIO_BYTES.inc(original_bytes, stage="raw")
+        AUDIO_BYTES.inc(processed_bytes, stage="preprocessed")
+        print(f"✅ [Audio Preprocessing Agent] Removed {report['removed_seconds']:.1f}s of "
+              f"{report['original_seconds']:.1f}s and {report['removed_bytes'] / 1e6:.1f} MB "
+              f"({original_bytes / 1e6:.1f} MB → {processed_bytes / 1e6:.1f} MB, {len(spans)} speech segments)")
+        return report
+
+    async def aprocess(self, audio_file_path: str) -> dict:
+        """
+        Async counterpart of `process`; decoding, VAD and encoding run in a worker thread.
+        """
+        return await asyncio.to_thread(self.process, audio_file_path)
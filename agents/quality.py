@@ -0,0 +1,63 @@
+import os
+import re
+from typing import Optional
+
+from agents.structure import StructuringAgent, validation_error
+
+# Output checks that decide whether a fast-tier model's answer is kept or the call is
+# escalated to the next tier. Each check returns None (ok) or a short reason label.
+
+HANGUL_RE = re.compile(r"[가-힣]")
+SENTENCE_END_RE = re.compile(r"[.!?。]+(?=\s|$)")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+MIN_ANALYSIS_CHARS = int(os.getenv("LLM_MIN_ANALYSIS_CHARS", "60"))
+MIN_SUMMARY_CHARS = int(os.getenv("LLM_MIN_SUMMARY_CHARS", "40"))
+
+
+def text_issue(text: Optional[str], min_chars: int) -> Optional[str]:
+    """
+    Free-text answers must be non-trivial and in Korean, as every prompt asks.
+    """
+    text = (text or "").strip()
+    if not text:
+        return "empty"
+    if len(text) < min_chars:
+        return "too_short"
+    if not HANGUL_RE.search(text):
+        return "not_korean"
+    return None
+
+
+def analysis_issue(analysis: Optional[str]) -> Optional[str]:
+    return text_issue(analysis, MIN_ANALYSIS_CHARS)
+
+
+def summary_issue(summary: Optional[str]) -> Optional[str]:
+    issue = text_issue(summary, MIN_SUMMARY_CHARS)
+    if issue:
+        return issue
+    # The prompt asks for 3-5 sentences; allow some slack either way
+    sentences = len(SENTENCE_END_RE.findall(summary.strip()))
+    if not 2 <= sentences <= 8:
+        return "sentence_count"
+    return None
+
+
+def extraction_issue(data: Optional[dict]) -> Optional[str]:
+    """
+    Task extraction output: must be JSON, pass the MeetingResult validation used before
+    the Notion sync, and keep dates in YYYY-MM-DD.
+    """
+    if not isinstance(data, dict):
+        return "json"
+    todos = data.get("todos") or []
+    if not isinstance(todos, list) or not all(isinstance(todo, dict) for todo in todos) \
+            or not isinstance(data.get("participants") or [], list):
+        return "validation"
+    if validation_error(StructuringAgent.structure("-", data)):
+        return "validation"
+    dates = [data.get("meeting_date")] + [todo.get("due") for todo in todos]
+    if any(date and not DATE_RE.match(str(date)) for date in dates):
+        return "date_format"
+    return None
@@ -1,28 +1,133 @@
+import asyncio
 import os
-from openai import OpenAI
+import tempfile
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from cache import TranscriptCache, hash_file
+from metrics import track_request
+from agents.audio import extract_segment, plan_segments, probe_duration, stitch_transcripts
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+# Whisper API rejects uploads above 25 MB
+WHISPER_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
 
 class SpeechAgent:
-    def __init__(self, client: OpenAI):
+    def __init__(self, client: "OpenAI", cache: Optional[TranscriptCache] = None, async_client: Optional["AsyncOpenAI"] = None):
         self.client = client
+        self.async_client = async_client
+        self.cache = cache
+        # Chunked mode: "auto" (only for long / oversized files), "on" or "off"
+        self.chunk_mode = os.getenv("WHISPER_CHUNK_MODE", "auto").strip().lower()
+        self.chunk_seconds = float(os.getenv("WHISPER_CHUNK_SECONDS", "300"))
+        self.overlap_seconds = float(os.getenv("WHISPER_CHUNK_OVERLAP_SECONDS", "5"))
+        self.max_concurrency = int(os.getenv("WHISPER_MAX_CONCURRENCY", "4"))
 
-    def process(self, audio_file_path: str) -> str:
+    async def alookup(self, audio_file_path: str, audio_hash: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         """
-        Transcribes audio file to text using OpenAI Whisper.
+        Returns (cache_key, cached_transcript). Both are None when the cache is disabled;
+        the transcript is None on a cache miss. Hashing runs in a worker thread.
+        `audio_hash` (SHA-256 of the file) may be passed to skip re-hashing.
         """
-        print(f"🎙️ [Speech Agent] Processing audio file: {audio_file_path}...")
-        
-        # Check if file exists
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        print(f"🎙️ [Speech Agent] Processing audio file: {audio_file_path}...")
+        if self.cache is None:
+            return None, None
+        cache_key = audio_hash or await asyncio.to_thread(hash_file, audio_file_path)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ [Speech Agent] Transcript cache hit ({cache_key[:12]}). Skipping Whisper.")
+        return cache_key, cached
+
+    async def aprocess(self, audio_file_path: str, audio_hash: Optional[str] = None) -> str:
+        """
+        Transcribes audio file to text using OpenAI Whisper. Hashing and ffmpeg work run in worker threads;
+        Whisper requests go through `async_client` when configured.
+        """
+        cache_key, cached = await self.alookup(audio_file_path, audio_hash)
+        if cached is not None:
+            return cached
+        return await self.atranscribe(audio_file_path, cache_key)
 
+    async def atranscribe(self, audio_file_path: str, cache_key: Optional[str] = None) -> str:
+        """
+        Transcribes without a cache lookup and stores the result under `cache_key`.
+        The file may be a preprocessed copy while `cache_key` refers to the original upload.
+        """
         try:
-            with open(audio_file_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file
-                )
+            duration = await asyncio.to_thread(self._chunking_duration, audio_file_path)
+            if duration is not None:
+                text = await self._atranscribe_chunked(audio_file_path, duration)
+            else:
+                text = await self._atranscribe_file(audio_file_path)
+            if cache_key is not None and self.cache is not None:
+                self.cache.put(cache_key, text)
             print("✅ [Speech Agent] Transcription complete.")
-            return transcription.text
+            return text
         except Exception as e:
             print(f"❌ [Speech Agent] Error: {e}")
             raise e
+
+    async def _atranscribe_file(self, audio_file_path: str) -> str:
+        if self.async_client is None:
+            return await asyncio.to_thread(self._transcribe_file, audio_file_path)
+        with open(audio_file_path, "rb") as audio_file, track_request("openai_whisper", "transcribe"):
+            transcription = await self.async_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file
+            )
+        return transcription.text
+
+    async def _atranscribe_chunked(self, audio_file_path: str, duration: float) -> str:
+        """
+        Splits the audio into overlapping segments, transcribes them concurrently (bounded
+        by a semaphore) and stitches the text back together.
+        """
+        segments = plan_segments(duration, self.chunk_seconds, self.overlap_seconds)
+        print(f"✂️ [Speech Agent] Chunked mode: {len(segments)} segments of ≤{self.chunk_seconds:.0f}s "
+              f"(overlap {self.overlap_seconds:.0f}s, concurrency {self.max_concurrency})")
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        with tempfile.TemporaryDirectory(prefix="whisper_chunks_") as chunk_dir:
+            async def transcribe_segment(index: int) -> str:
+                async with semaphore:
+                    start, length = segments[index]
+                    chunk_path = os.path.join(chunk_dir, f"chunk_{index:04d}.mp3")
+                    await asyncio.to_thread(extract_segment, audio_file_path, start, length, chunk_path)
+                    return await self._atranscribe_file(chunk_path)
+
+            parts = await asyncio.gather(*(transcribe_segment(i) for i in range(len(segments))))
+
+        # ~3 words per second of speech, doubled for safety
+        max_overlap_words = max(10, int(self.overlap_seconds * 6))
+        return stitch_transcripts(list(parts), max_overlap_words=max_overlap_words)
+
+    def _transcribe_file(self, audio_file_path: str) -> str:
+        # Transport fallback for `_atranscribe_file` (run in a worker thread) when there is no async client
+        with open(audio_file_path, "rb") as audio_file, track_request("openai_whisper", "transcribe"):
+            transcription = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file
+            )
+        return transcription.text
+
+    def _chunking_duration(self, audio_file_path: str):
+        """
+        Returns the audio duration if the file should be transcribed in chunks, else None.
+        """
+        if self.chunk_mode == "off":
+            return None
+        try:
+            duration = probe_duration(audio_file_path)
+        except Exception as e:
+            if self.chunk_mode == "on" or os.path.getsize(audio_file_path) > WHISPER_MAX_UPLOAD_BYTES:
+                print(f"⚠️ [Speech Agent] Could not probe audio duration ({e}). Falling back to single upload.")
+            return None
+
+        if self.chunk_mode == "on":
+            return duration
+        if duration > self.chunk_seconds or os.path.getsize(audio_file_path) > WHISPER_MAX_UPLOAD_BYTES:
+            return duration
+        return None
@@ -1,8 +1,20 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, ValidationError
+import asyncio
 import json
 import os
-from notion_client import Client
+import time
+import threading
+from typing import TYPE_CHECKING
+
+from lazy import lazy_property
+from metrics import API_RETRIES, track_request
+from ratelimit import TokenBucket, backoff_delay
+from storage import state_path
+from sync_index import SyncIndex, content_hash, todo_fingerprint
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient, Client
 
 # --- Data Models ---
 class TodoItem(BaseModel):
@@ -16,20 +28,56 @@ class MeetingInfo(BaseModel):
     date: Optional[str]
     participants: List[str]
 
+class AudioPreprocessing(BaseModel):
+    # Silence removed before transcription (transcripts are plain text, so there are no
+    # segment offsets to map back to the original recording)
+    original_seconds: float
+    processed_seconds: float
+    removed_seconds: float
+    original_bytes: int
+    processed_bytes: int
+    removed_bytes: int
+
 class MeetingResult(BaseModel):
     summary: str
     meeting_info: MeetingInfo
     todos: List[TodoItem]
+    audio: Optional[AudioPreprocessing] = None
 
 # --- Agents ---
 
+def validation_error(data: dict) -> Optional[str]:
+    """
+    Returns the MeetingResult validation error for `data`, or None if it is valid.
+    """
+    try:
+        MeetingResult.model_validate(data)
+        return None
+    except ValidationError as e:
+        return str(e)
+
+def as_meeting_result(data: Union[MeetingResult, dict]) -> MeetingResult:
+    """
+    Returns `data` as a MeetingResult: models pass through untouched, dicts (e.g. a restored
+    checkpoint) are validated. Raises ValidationError.
+    """
+    return data if isinstance(data, MeetingResult) else MeetingResult.model_validate(data)
+
 class StructuringAgent:
-    def process(self, summary: str, extracted_data: dict) -> dict:
+    def process(self, summary: str, extracted_data: dict) -> Optional[MeetingResult]:
         """
-        Normalizes the output into strict JSON structure.
+        Normalizes the output into a validated MeetingResult, which is passed along as-is
+        until the API serializes it. Returns None if validation fails.
         """
         print("📐 [Structuring Agent] Normalizing data structure...")
-        
+        try:
+            return MeetingResult.model_validate(self.structure(summary, extracted_data))
+        except ValidationError as e:
+            print(f"❌ [Structuring Agent] Validation Failed: {e}")
+            return None
+
+    @staticmethod
+    def structure(summary: str, extracted_data: dict) -> dict:
         raw_todos = extracted_data.get("todos", [])
         
         # Clean up todos
@@ -59,8 +107,12 @@ class IntegrationAgent:
     def __init__(self):
         self.notion_api_key = os.getenv("NOTION_API_KEY", "").strip()
         self.database_id = os.getenv("NOTION_DATABASE_ID", "").strip()
-        self.client = None
         self._db_properties = None  # 데이터베이스 프로퍼티 캐시
+        # 스키마 검증은 첫 동기화 시점으로 지연하고, 결과는 TTL 동안 디스크에 캐시
+        self.schema_cache_path = os.getenv("NOTION_SCHEMA_CACHE_PATH") or state_path("notion_schema.json")
+        self.schema_ttl_seconds = float(os.getenv("NOTION_SCHEMA_TTL_SECONDS", "86400"))
+        self._schema_checked = False
+        self._schema_lock = threading.Lock()
         # 프로퍼티 이름을 .env에서 설정 가능하도록 지원 (기본값은 영어 스키마)
         self.prop_title = os.getenv("NOTION_PROP_TITLE", "Name").strip() or "Name"
         self.prop_meeting_title = os.getenv("NOTION_PROP_MEETING_TITLE", "Meeting Title").strip() or "Meeting Title"
@@ -70,22 +122,115 @@ class IntegrationAgent:
         self.prop_meeting_date = os.getenv("NOTION_PROP_MEETING_DATE", "Meeting Date").strip() or "Meeting Date"
         self.prop_due_date = os.getenv("NOTION_PROP_DUE_DATE", "Due Date").strip() or "Due Date"
 
-        if self.notion_api_key:
-            try:
-                self.client = Client(auth=self.notion_api_key)
-                print(f"🔹 [Integration Agent] Initialized with DB ID: {self.database_id}")
+        # Notion allows an average of 3 requests/second per integration
+        self._rate_limiter = TokenBucket(
+            rate=float(os.getenv("NOTION_RATE_LIMIT", "3")),
+            capacity=float(os.getenv("NOTION_RATE_BURST", "3"))
+        )
+        self.max_concurrency = int(os.getenv("NOTION_MAX_CONCURRENCY", "4"))
+        self.max_retries = int(os.getenv("NOTION_MAX_RETRIES", "5"))
+        self.last_sync_report = []  # per-row result of the most recent sync
+        # Local fingerprint -> page ID index that makes re-syncs idempotent
+        self.sync_index = None
+        if os.getenv("NOTION_SYNC_INDEX_ENABLED", "true").strip().lower() in ("1", "true", "yes"):
+            self.sync_index = SyncIndex()
+
+    @lazy_property
+    def _clients(self) -> tuple:
+        """
+        Builds the Notion clients on first use: (Client, AsyncClient), or (None, None)
+        when no credentials are configured.
+        """
+        if os.getenv("NOTION_MOCK", "false").strip().lower() in ("1", "true", "yes"):
+            # Offline stand-in (latency / 429 injection via MOCK_NOTION_PROFILE), e.g. for benchmark.py
+            from mocks import AsyncMockNotionClient, MockNotionClient, MOCK_NOTION_DATABASE_ID
+            self.database_id = self.database_id or MOCK_NOTION_DATABASE_ID
+            print(f"🧪 [Integration Agent] NOTION_MOCK enabled. Using mock Notion client (DB ID: {self.database_id})")
+            return MockNotionClient(), AsyncMockNotionClient()
+        if not self.notion_api_key:
+            return None, None
+        try:
+            from notion_client import AsyncClient, Client
+            clients = Client(auth=self.notion_api_key), AsyncClient(auth=self.notion_api_key)
+            print(f"🔹 [Integration Agent] Initialized with DB ID: {self.database_id}")
+            return clients
+        except Exception as e:
+            print(f"❌ [Integration Agent] Notion 클라이언트 초기화 실패: {e}")
+            return None, None
+
+    @property
+    def client(self) -> Optional["Client"]:
+        return self._clients[0]
+
+    @property
+    def async_client(self) -> Optional["AsyncClient"]:
+        return self._clients[1]
+
+    def _ensure_schema(self):
+        """
+        Validates the database schema once per process, before the first sync.
+        """
+        if self._schema_checked:
+            return
+        with self._schema_lock:
+            if not self._schema_checked:
                 self._validate_database_connection()
-            except Exception as e:
-                print(f"❌ [Integration Agent] Notion 클라이언트 초기화 실패: {e}")
-                self.client = None
+                self._schema_checked = True
+
+    def _read_schema_cache(self) -> dict:
+        try:
+            with open(self.schema_cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_cached_schema(self) -> Optional[dict]:
+        if self.schema_ttl_seconds <= 0:
+            return None
+        entry = self._read_schema_cache().get(self.database_id)
+        if entry and time.time() - entry.get("fetched_at", 0) < self.schema_ttl_seconds:
+            return entry
+        return None
+
+    def _save_schema(self, db: dict):
+        if self.schema_ttl_seconds <= 0:
+            return
+        cache = self._read_schema_cache()
+        cache[self.database_id] = {"fetched_at": time.time(), "title": db.get("title", []), "properties": db.get("properties", {})}
+        tmp_path = f"{self.schema_cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.schema_cache_path)
+        except OSError as e:
+            print(f"⚠️ [Integration Agent] 스키마 캐시 저장 실패: {e}")
+
+    def invalidate_schema_cache(self):
+        """
+        Drops the cached schema so the next process (and this one) re-fetches it.
+        """
+        cache = self._read_schema_cache()
+        if cache.pop(self.database_id, None) is not None:
+            try:
+                with open(self.schema_cache_path, "w", encoding="utf-8") as f:
+                    json.dump(cache, f, ensure_ascii=False)
+            except OSError:
+                pass
+        self._schema_checked = False
 
     def _validate_database_connection(self):
-        """시작 시 데이터베이스 연결 및 스키마 검증"""
+        """데이터베이스 연결 및 스키마 검증 (디스크 캐시가 유효하면 Notion 호출 생략)"""
         if not self.client or not self.database_id:
             return
 
         try:
-            db = self.client.databases.retrieve(database_id=self.database_id)
+            db = self._load_cached_schema()
+            if db is not None:
+                print(f"⚡ [Integration Agent] 캐시된 데이터베이스 스키마 사용 (TTL {self.schema_ttl_seconds:.0f}s)")
+            else:
+                with track_request("notion", "databases.retrieve"):
+                    db = self.client.databases.retrieve(database_id=self.database_id)
+                self._save_schema(db)
 
             # 데이터베이스 이름 출력
             title = db.get("title", [{}])
@@ -126,25 +271,29 @@ class IntegrationAgent:
             if "unauthorized" in str(e).lower() or "Could not find" in str(e):
                 print("   💡 힌트: Integration이 데이터베이스에 연결(Share)되어 있는지 확인하세요.")
 
-    def validate(self, data: dict) -> bool:
+    def validate(self, data: Union[MeetingResult, dict, None]) -> Optional[MeetingResult]:
         """
         Validates if the data is ready for Notion integration.
+        Returns the MeetingResult (the same object when it already is one), or None.
         """
         print("🔌 [Integration Agent] Validating for Notion Database compatibility...")
+        if data is None:
+            print("❌ [Integration Agent] Validation Failed: no structured result")
+            return None
+        # Pydantic validation (skipped for results the structuring stage already validated)
         try:
-            # Pydantic validation
-            validated_model = MeetingResult(**data)
-            print("✅ [Integration Agent] Validation Successful. Payload ready.")
-            return True
+            result = as_meeting_result(data)
         except ValidationError as e:
             print(f"❌ [Integration Agent] Validation Failed: {e}")
-            return False
+            return None
+        print("✅ [Integration Agent] Validation Successful. Payload ready.")
+        return result
 
-    def export(self, data: dict) -> str:
+    def export(self, result: MeetingResult) -> str:
         """
-        Returns the final JSON string.
+        Returns the final JSON string (pretty-printed, for the CLI).
         """
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return result.model_dump_json(indent=2)
     
     def _is_valid_date(self, date_str: Optional[str]) -> bool:
         if not date_str:
@@ -152,90 +301,230 @@ class IntegrationAgent:
         # Simple YYYY-MM-DD regex
         return bool(re.match(r"^\d{4}-\d{2}-\d{2}$", date_str))
 
-    def sync_to_notion(self, data: dict) -> bool:
+    def _build_properties(self, meeting_info: dict, todo: dict) -> dict:
+        properties = {
+            self.prop_title: {
+                "title": [{"text": {"content": todo.get("action", "Untitled Task")}}]
+            },
+            self.prop_meeting_title: {
+                "rich_text": [{"text": {"content": meeting_info.get("title", "")}}]
+            },
+            self.prop_description: {
+                "rich_text": [{"text": {"content": todo.get("description", "")}}]
+            },
+            self.prop_participants: {
+                "rich_text": [{"text": {"content": ", ".join(meeting_info.get("participants", []))}}]
+            },
+            self.prop_assignee: {
+                "rich_text": [{"text": {"content": todo.get("owner") or "Unassigned"}}]
+            }
+        }
+
+        # Add Date fields ONLY if valid
+        meeting_date = meeting_info.get("date")
+        if self._is_valid_date(meeting_date):
+            properties[self.prop_meeting_date] = {"date": {"start": meeting_date}}
+        elif meeting_date:
+            print(f"⚠️ [Integration Agent] Invalid Meeting Date format: '{meeting_date}'. Skipping date field.")
+
+        due_date = todo.get("due")
+        if self._is_valid_date(due_date):
+            properties[self.prop_due_date] = {"date": {"start": due_date}}
+        elif due_date:
+            print(f"⚠️ [Integration Agent] Invalid Due Date format: '{due_date}'. Appending to description.")
+            # Append invalid date text to description so it's not lost
+            current_desc = todo.get("description", "")
+            properties[self.prop_description]["rich_text"][0]["text"]["content"] = f"{current_desc} (기한: {due_date})"
+        return properties
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """
+        Returns the server-requested delay for retryable errors (429 / 5xx / timeouts),
+        0.0 if the error is retryable without a hint, or None if it should not be retried.
+        """
+        from notion_client.errors import HTTPResponseError, RequestTimeoutError
+        if isinstance(error, RequestTimeoutError):
+            return 0.0
+        if not isinstance(error, HTTPResponseError):
+            return None
+        if error.status == 429 or error.status >= 500:
+            try:
+                return float(error.headers.get("Retry-After", 0))
+            except (TypeError, ValueError):
+                return 0.0
+        return None
+
+    def _operation_name(self, func) -> str:
+        # e.g. client.pages.create -> "pages.create" (metrics label)
+        owner = getattr(func, "__self__", None)
+        for endpoint in ("pages", "databases"):
+            if owner is not None and owner in (getattr(self.client, endpoint, None), getattr(self.async_client, endpoint, None)):
+                return f"{endpoint}.{func.__name__}"
+        return func.__name__
+
+    async def _anotion_call(self, func, **kwargs):
+        """
+        Calls a Notion AsyncClient method behind the shared rate limiter, retrying 429 / 5xx
+        responses with exponential backoff. Retry-After pauses every caller, not just this one.
+        Returns (result, attempts).
+        """
+        operation = self._operation_name(func)
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire_async()
+            try:
+                with track_request("notion", operation):
+                    return await func(**kwargs), attempt + 1
+            except Exception as e:
+                retry_after = self._retry_after(e)
+                if retry_after is None or attempt >= self.max_retries:
+                    raise
+                delay = max(retry_after, backoff_delay(attempt))
+                if retry_after:
+                    self._rate_limiter.pause(retry_after)
+                API_RETRIES.inc(service="notion", operation=operation)
+                print(f"⏳ [Integration Agent] Notion 요청 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {e}")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _plan_row(self, meeting_info: dict, todo: dict, occurrence: int,
+                  source: Optional[str] = None, position: int = 0) -> dict:
+        properties = self._build_properties(meeting_info, todo)
+        fingerprint = todo_fingerprint(self.database_id, meeting_info, todo, occurrence, source, position)
+        return {
+            "action": todo.get("action", "Untitled Task"),
+            "properties": properties,
+            "fingerprint": fingerprint,
+            "hash": content_hash(properties),
+            "indexed": self.sync_index.get(fingerprint) if self.sync_index else None,
+            "started": time.perf_counter(),
+        }
+
+    def _row_unchanged(self, row: dict) -> Optional[dict]:
+        if row["indexed"] and row["indexed"][1] == row["hash"]:
+            print(f"⏭️ [Integration Agent] 변경 없음, 건너뜀: {row['action']}")
+            return {"action": row["action"], "ok": True, "status": "skipped", "attempts": 0, "latency": 0.0}
+        return None
+
+    def _row_synced(self, row: dict, result: dict, status: str, attempts: int) -> dict:
+        if self.sync_index and result.get("id"):
+            self.sync_index.put(row["fingerprint"], result["id"], row["hash"])
+
+        # 생성된 페이지 URL 출력
+        page_url = result.get("url", "URL 없음")
+        print(f"   ✅ {'생성' if status == 'created' else '업데이트'} 완료: {page_url}")
+        return {"action": row["action"], "ok": True, "status": status, "attempts": attempts, "latency": time.perf_counter() - row["started"]}
+
+    def _row_failed(self, row: dict, row_error: Exception) -> dict:
+        print(f"❌ [Integration Agent] 삽입 실패: {row_error}")
+        # 상세 에러 정보 출력
+        if hasattr(row_error, "code"):
+            print(f"   에러 코드: {row_error.code}")
+        if hasattr(row_error, "body"):
+            print(f"   에러 상세: {row_error.body}")
+        print(f"   페이로드: {json.dumps(row['properties'], ensure_ascii=False, indent=2)}")
+        # 스키마가 바뀌었을 수 있으므로 캐시된 스키마를 버리고 다음 동기화에서 다시 검증
+        if getattr(row_error, "code", None) == "validation_error":
+            self.invalidate_schema_cache()
+        return {"action": row["action"], "ok": False, "status": "failed", "attempts": None, "latency": time.perf_counter() - row["started"]}
+
+    async def _async_sync_row(self, meeting_info: dict, todo: dict, occurrence: int = 0,
+                              source: Optional[str] = None, position: int = 0) -> dict:
+        """
+        Creates, updates or skips one todo row depending on the local sync index.
+        """
+        row = self._plan_row(meeting_info, todo, occurrence, source, position)
+        skipped = self._row_unchanged(row)
+        if skipped:
+            return skipped
+
+        try:
+            if row["indexed"]:
+                print(f"🔄 [Integration Agent] 업데이트 중: {row['action']}")
+                try:
+                    result, attempts = await self._anotion_call(self.async_client.pages.update, page_id=row["indexed"][0], properties=row["properties"])
+                    return self._row_synced(row, result, "updated", attempts)
+                except Exception as e:
+                    # 페이지가 Notion에서 삭제된 경우 새로 생성
+                    if getattr(e, "status", None) != 404:
+                        raise
+                    self.sync_index.delete(row["fingerprint"])
+
+            # 디버그: 전송 전 페이로드 출력
+            print(f"📤 [Integration Agent] 전송 중: {row['action']}")
+            result, attempts = await self._anotion_call(
+                self.async_client.pages.create,
+                parent={"database_id": self.database_id},
+                properties=row["properties"]
+            )
+            return self._row_synced(row, result, "created", attempts)
+        except Exception as row_error:
+            return self._row_failed(row, row_error)
+
+    @staticmethod
+    def _occurrences(todos: list) -> list:
+        # Number identical todos so each keeps its own fingerprint
+        occurrences = []
+        seen = {}
+        for todo in todos:
+            key = (todo.get("action"), todo.get("owner"))
+            occurrences.append(seen.get(key, 0))
+            seen[key] = occurrences[-1] + 1
+        return occurrences
+
+    @staticmethod
+    def _rows_source(data: Union[MeetingResult, dict]) -> tuple:
+        # Property builders work on plain dicts; convert only the parts Notion needs
+        if isinstance(data, MeetingResult):
+            return data.meeting_info.model_dump(), [todo.model_dump() for todo in data.todos]
+        return data.get("meeting_info", {}), data.get("todos", [])
+
+    def _report_sync(self, rows: list, todos: list):
+        self.last_sync_report = rows
+        success_count = sum(1 for row in rows if row["ok"])
+        counts = {status: sum(1 for row in rows if row["status"] == status) for status in ("created", "updated", "skipped", "failed")}
+
+        print(f"✅ [Integration Agent] Successfully synced {success_count}/{len(todos)} tasks to Notion! {counts}")
+        if rows:
+            latencies = sorted(row["latency"] for row in rows)
+            print(f"   ⏱️ Row latency: p50 {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s, "
+                  f"retries {sum((row['attempts'] or 1) - 1 for row in rows)}")
+
+        if success_count == 0 and len(todos) > 0:
+            print("⚠️ [Integration Agent] Warning: No tasks were synced. Check property names in Notion Database.")
+            print(f"   Expected Properties: '{self.prop_title}', '{self.prop_meeting_title}', '{self.prop_meeting_date}', '{self.prop_due_date}', '{self.prop_description}', '{self.prop_participants}', '{self.prop_assignee}'")
+
+    async def async_sync_to_notion(self, data: Union[MeetingResult, dict], source: Optional[str] = None) -> bool:
         """
         Syncs the validated data to Notion Database.
+        Rows are synced concurrently (bounded by a semaphore) behind a token-bucket rate limiter.
+        Rows already recorded in the sync index are skipped if unchanged and updated in place otherwise;
+        `source` (e.g. the audio hash) keys rows by position within that meeting (see todo_fingerprint).
+        Returns True only if every row synced.
         """
-        if not self.client or not self.database_id:
+        if not self.async_client or not self.database_id:
             print("⚠️ [Integration Agent] Notion credentials missing. Skipping sync.")
             return False
-            
+
+        if not self._schema_checked:
+            await asyncio.to_thread(self._ensure_schema)
         print("🚀 [Integration Agent] Syncing to Notion Database...")
-        
+
         try:
-            meeting_info = data.get("meeting_info", {})
-            todos = data.get("todos", [])
-            
-            success_count = 0
-            
+            meeting_info, todos = self._rows_source(data)
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+            async def sync_row(todo: dict, occurrence: int, position: int) -> dict:
+                async with semaphore:
+                    return await self._async_sync_row(meeting_info, todo, occurrence, source, position)
+
             # Insert each task as a row in the Tasks Database
-            for todo in todos:
-                properties = {
-                    self.prop_title: { 
-                        "title": [{"text": {"content": todo.get("action", "Untitled Task")}}]
-                    },
-                    self.prop_meeting_title: {
-                        "rich_text": [{"text": {"content": meeting_info.get("title", "")}}]
-                    },
-                    self.prop_description: {
-                        "rich_text": [{"text": {"content": todo.get("description", "")}}]
-                    },
-                    self.prop_participants: {
-                        "rich_text": [{"text": {"content": ", ".join(meeting_info.get("participants", []))}}]
-                    },
-                    self.prop_assignee: {
-                        "rich_text": [{"text": {"content": todo.get("owner") or "Unassigned"}}]
-                    }
-                }
-                
-                # Add Date fields ONLY if valid
-                meeting_date = meeting_info.get("date")
-                if self._is_valid_date(meeting_date):
-                    properties[self.prop_meeting_date] = {"date": {"start": meeting_date}}
-                elif meeting_date:
-                     print(f"⚠️ [Integration Agent] Invalid Meeting Date format: '{meeting_date}'. Skipping date field.")
-
-                due_date = todo.get("due")
-                if self._is_valid_date(due_date):
-                    properties[self.prop_due_date] = {"date": {"start": due_date}}
-                elif due_date:
-                    print(f"⚠️ [Integration Agent] Invalid Due Date format: '{due_date}'. Appending to description.")
-                    # Append invalid date text to description so it's not lost
-                    current_desc = todo.get("description", "")
-                    properties[self.prop_description]["rich_text"][0]["text"]["content"] = f"{current_desc} (기한: {due_date})"
+            rows = list(await asyncio.gather(*(sync_row(todo, n, position) for position, (todo, n)
+                                               in enumerate(zip(todos, self._occurrences(todos))))))
+            self._report_sync(rows, todos)
+            return all(row["ok"] for row in rows)
 
-                try:
-                    # 디버그: 전송 전 페이로드 출력
-                    print(f"📤 [Integration Agent] 전송 중: {todo.get('action', 'Untitled Task')}")
-
-                    result = self.client.pages.create(
-                        parent={"database_id": self.database_id},
-                        properties=properties
-                    )
-
-                    # 생성된 페이지 URL 출력
-                    page_url = result.get("url", "URL 없음")
-                    print(f"   ✅ 생성 완료: {page_url}")
-
-                    success_count += 1
-                except Exception as row_error:
-                    print(f"❌ [Integration Agent] 삽입 실패: {row_error}")
-                    # 상세 에러 정보 출력
-                    if hasattr(row_error, "code"):
-                        print(f"   에러 코드: {row_error.code}")
-                    if hasattr(row_error, "body"):
-                        print(f"   에러 상세: {row_error.body}")
-                    print(f"   페이로드: {json.dumps(properties, ensure_ascii=False, indent=2)}")
-                
-            print(f"✅ [Integration Agent] Successfully synced {success_count}/{len(todos)} tasks to Notion!")
-            
-            if success_count == 0 and len(todos) > 0:
-                print("⚠️ [Integration Agent] Warning: No tasks were synced. Check property names in Notion Database.")
-                print(f"   Expected Properties: '{self.prop_title}', '{self.prop_meeting_title}', '{self.prop_meeting_date}', '{self.prop_due_date}', '{self.prop_description}', '{self.prop_participants}', '{self.prop_assignee}'")
-                
-            return True
-            
         except Exception as e:
             print(f"❌ [Integration Agent] Notion Sync Critical Failure: {e}")
             return False
-
@@ -1,17 +1,16 @@
 import json
-from openai import OpenAI
+import re
+from typing import List, Optional
 
-class TaskExtractionAgent:
-    def __init__(self, client: OpenAI):
-        self.client = client
+from agents.base import LLMAgent
+from agents.quality import extraction_issue
 
-    def process(self, text: str, analysis: str) -> dict:
-        """
-        Extracts TODOs and Meeting Info from the text.
-        Returns a dictionary containing meeting info and a list of tasks.
-        """
-        print("⛏️ [Task Extraction Agent] Extracting actionable tasks and meeting details...")
-        
+EMPTY_EXTRACTION = {"meeting_title": "Untitled Meeting", "meeting_date": None, "participants": [], "todos": []}
+
+class TaskExtractionAgent(LLMAgent):
+    tiers_env = "TASK_MODEL_TIERS"
+
+    def _extraction_request(self, text: str, analysis: str) -> dict:
         prompt = f"""
         Extract actionable tasks (TODOs) and meeting metadata from the transcript.
         All output values must be in Korean (except for dates).
@@ -41,19 +40,68 @@ class TaskExtractionAgent:
         Transcript: {text}
         """
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
+        return dict(
             messages=[
                 {"role": "system", "content": "You are a precise task extractor. You output only valid JSON. All text content must be in Korean."},
                 {"role": "user", "content": prompt}
             ],
-            response_format={"type": "json_object"} 
+            response_format={"type": "json_object"}
         )
-        
+
+    def _parse(self, response) -> Optional[dict]:
+        # None on a parse failure, so the model tiers can escalate
         content = response.choices[0].message.content
         try:
             data = json.loads(content)
-            return data
-        except json.JSONDecodeError:
+        except (TypeError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _result(self, data: Optional[dict]) -> dict:
+        if data is None:
             print("❌ [Task Extraction Agent] Failed to parse JSON.")
-            return {"meeting_title": "Untitled Meeting", "meeting_date": None, "participants": [], "todos": []}
+            return {**EMPTY_EXTRACTION, "participants": [], "todos": []}
+        return data
+
+    async def aprocess(self, text: str, analysis: str) -> dict:
+        """
+        Extracts TODOs and Meeting Info from the text.
+        Returns a dictionary containing meeting info and a list of tasks.
+        """
+        print("⛏️ [Task Extraction Agent] Extracting actionable tasks and meeting details...")
+        return self._result(await self._acomplete(self._extraction_request(text, analysis), self._parse, extraction_issue))
+
+    @staticmethod
+    def _todo_key(todo: dict) -> tuple:
+        return tuple(re.sub(r"\s+", "", str(todo.get(field) or "")).lower() for field in ("action", "owner"))
+
+    def merge(self, partials: List[dict]) -> dict:
+        """
+        Merges extraction results from transcript sections into one result.
+        Todos with the same action and owner are deduplicated, keeping the
+        most detailed description and the first known due date.
+        """
+        merged = {**EMPTY_EXTRACTION, "participants": [], "todos": []}
+        seen = {}
+        for partial in partials:
+            title = partial.get("meeting_title")
+            if merged["meeting_title"] == "Untitled Meeting" and title:
+                merged["meeting_title"] = title
+            if not merged["meeting_date"] and partial.get("meeting_date"):
+                merged["meeting_date"] = partial["meeting_date"]
+            for name in partial.get("participants") or []:
+                if name not in merged["participants"]:
+                    merged["participants"].append(name)
+            for todo in partial.get("todos") or []:
+                key = self._todo_key(todo)
+                if key not in seen:
+                    seen[key] = dict(todo)
+                    merged["todos"].append(seen[key])
+                    continue
+                existing = seen[key]
+                if len(todo.get("description") or "") > len(existing.get("description") or ""):
+                    existing["description"] = todo.get("description")
+                if not existing.get("due") and todo.get("due"):
+                    existing["due"] = todo["due"]
+        print(f"🔗 [Task Extraction Agent] Merged {len(partials)} sections into {len(merged['todos'])} tasks.")
+        return merged
@@ -1,18 +1,42 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-import shutil
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import ClientDisconnect
+import asyncio
+import hashlib
 import os
+import threading
 import uuid
-from pipeline import PipelineOrchestrator
+from contextlib import asynccontextmanager
+from event_loop import BackgroundLoop
+from pipeline import PipelineOrchestrator, PIPELINE_MODES, PARTIAL_OUTPUTS
 import json
-from typing import Dict, Any
+from typing import List, Literal, Optional
+from task_store import create_task_store, MemoryTaskStore, FINISHED_STATUSES
+from checkpoints import CheckpointStore, TaskCheckpoints, restore_checkpoints, resume_stage
+from meeting_store import DATE_RE
+from agents.structure import MeetingResult
+from pydantic_core import to_json
+from job_queue import JobQueue, QueueFullError, clamp_priority
+from live import LiveSession
+from metrics import COMPONENT_INIT_SECONDS, PROMETHEUS_CONTENT_TYPE, registry
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Process-pool workers would otherwise outlive the API process
+    await asyncio.to_thread(job_queue.shutdown)
 
 app = FastAPI(
     title="Meeting STT & Todo Pipeline API", 
     docs_url="/api/docs", 
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan
 )
 
 # Enable CORS for Next.js
@@ -24,100 +48,611 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Orchestrator
-orchestrator = PipelineOrchestrator()
+# Orchestrator is built on first use so cold starts don't pay for SDK imports or Notion calls.
+# The event loop is created up front because the job queue needs it.
+pipeline_loop = BackgroundLoop()
+_orchestrator: Optional[PipelineOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+def get_orchestrator() -> PipelineOrchestrator:
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                started = time.perf_counter()
+                _orchestrator = PipelineOrchestrator(background_loop=pipeline_loop)
+                COMPONENT_INIT_SECONDS.observe(time.perf_counter() - started, component="PipelineOrchestrator")
+    return _orchestrator
 
 TEMP_DIR = "/tmp"
 os.makedirs(TEMP_DIR, exist_ok=True)
 
-# Task storage (In-memory for MVP, use Redis/DB for production)
-tasks: Dict[str, Dict[str, Any]] = {}
+# Containers accepted for live segments (Whisper's input formats). The value becomes the
+# segment files' extension, so anything else is rejected before the socket is accepted.
+LiveFormat = Literal["webm", "ogg", "oga", "mp3", "mp4", "m4a", "mpeg", "mpga", "wav", "flac"]
+
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Form fields sent next to the file (mode, priority) are tiny
+UPLOAD_MAX_FIELDS = 16
+UPLOAD_FIELD_MAX_BYTES = 1024
+
+async def receive_upload(request: Request, task_id: str) -> dict:
+    """
+    Reads a multipart/form-data upload straight from the request stream, so nothing is
+    spooled before the handler runs: the "file" part is written to TEMP_DIR as it arrives and
+    hashed in the same pass, the other parts are small text fields.
+    Returns {"fields", "filename", "path", "sha256"} ("path" is None without a file part).
+    Raises 413 (removing the partial file) as soon as the body exceeds MAX_UPLOAD_BYTES,
+    and 400 on a malformed body.
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    if b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+
+    upload = {"fields": {}, "filename": None, "path": None, "sha256": None}
+    part = {"header": b"", "value": b"", "disposition": b"", "name": "", "is_file": False, "data": bytearray()}
+    file_chunks: List[bytes] = []
+
+    def on_part_begin():
+        part.update(disposition=b"", name="", is_file=False, data=bytearray())
+
+    def on_header_field(data: bytes, start: int, end: int):
+        part["header"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        if part["header"].lower() == b"content-disposition":
+            part["disposition"] = part["value"]
+        part["header"] = part["value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["disposition"])
+        part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        part["is_file"] = b"filename" in options
+        if not part["is_file"]:
+            if len(upload["fields"]) >= UPLOAD_MAX_FIELDS:
+                raise HTTPException(status_code=400, detail="Too many form fields")
+            return
+        if part["name"] != "file" or upload["path"] is not None:
+            raise HTTPException(status_code=400, detail="Expected exactly one file, in the 'file' field")
+        upload["filename"] = options[b"filename"].decode("utf-8", "replace")
+        upload["path"] = os.path.join(TEMP_DIR, f"{task_id}{os.path.splitext(upload['filename'])[1]}")
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if part["is_file"]:
+            file_chunks.append(data[start:end])
+            return
+        part["data"] += data[start:end]
+        if len(part["data"]) > UPLOAD_FIELD_MAX_BYTES:
+            raise HTTPException(status_code=400, detail=f"Form field '{part['name']}' is too large")
+
+    def on_part_end():
+        if not part["is_file"]:
+            upload["fields"][part["name"]] = part["data"].decode("utf-8", "replace")
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin, "on_header_field": on_header_field, "on_header_value": on_header_value,
+        "on_header_end": on_header_end, "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data, "on_part_end": on_part_end,
+    })
+    digest = hashlib.sha256()
+    received = size = 0
+    buffer = None
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+                raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+            parser.write(chunk)
+            if upload["path"] is not None and buffer is None:
+                buffer = await asyncio.to_thread(open, upload["path"], "wb")
+            if file_chunks:
+                data = b"".join(file_chunks)
+                file_chunks.clear()
+                size += len(data)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+                digest.update(data)
+                await asyncio.to_thread(buffer.write, data)
+        parser.finalize()
+    except BaseException as e:
+        if buffer is not None:
+            await asyncio.to_thread(buffer.close)
+        if upload["path"]:
+            _cleanup(upload["path"])
+        if isinstance(e, (HTTPException, asyncio.CancelledError, ClientDisconnect)):
+            raise
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}") from e
+    if buffer is not None:
+        await asyncio.to_thread(buffer.close)
+    upload["sha256"] = digest.hexdigest()
+    return upload
+
+# Stage checkpoints so a failed job can be retried from its last completed stage
+checkpoint_store = CheckpointStore()
+
+# Task storage (SQLite WAL by default so every uvicorn worker sees the same jobs).
+# Failed tasks live as long as their checkpoints, so /api/retry can still find them.
+task_store = create_task_store(failed_ttl_seconds=checkpoint_store.ttl_seconds)
+
+# A finished task drops its progress fields: `stage` is only the phase of a running task, and
+# `partial` (the intermediate outputs) would otherwise ride along with every later status response
+def _finish_task(task_id: str, result: Optional[MeetingResult]):
+    # The MeetingResult is stored as-is; it is serialized once, by the task store
+    if result is not None:
+        task_store.update(task_id, status="completed", stage=None, partial=None, result=result)
+        print(f"✅ [Worker] Task {task_id} completed.")
+    else:
+        task_store.update(task_id, status="failed", stage=None, partial=None, error="Pipeline failed to generate output")
+        print(f"❌ [Worker] Task {task_id} failed.")
+
+def _fail_task(task_id: str, error: Exception):
+    task_store.update(task_id, status="failed", stage=None, partial=None, error=str(error))
+    print(f"❌ [Worker] Task {task_id} error: {str(error)}")
+
+def _progress_reporter(task_id: str):
+    """
+    Pipeline `on_progress` callback that records the current phase and partial outputs
+    on the task, where /api/status and /api/events pick them up.
+    """
+    # A resumed run keeps the partial outputs of the stages it skips
+    partial = dict((task_store.get(task_id) or {}).get("partial") or {})
+
+    def report(event: dict):
+        if event["type"] == "stage":
+            task_store.update(task_id, stage=event["stage"])
+        elif event["type"] == "partial":
+            partial[event["name"]] = event["value"]
+            task_store.update(task_id, partial=dict(partial))
+
+    return report
+
+def _cleanup(file_path: str):
+    if os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+            print(f"🧹 [Worker] Cleaned up: {file_path}")
+        except Exception as cleanup_error:
+            print(f"⚠️ [Worker] Cleanup warning: {cleanup_error}")
 
-def process_audio_task(task_id: str, file_path: str):
+def _task_checkpoints(task_id: str, file_path: Optional[str]) -> TaskCheckpoints:
+    # The audio is only needed until the transcript is checkpointed
+    def on_save(stage: str):
+        if stage == "transcript" and file_path:
+            _cleanup(file_path)
+    return TaskCheckpoints(checkpoint_store, task_id, on_save=on_save)
+
+def _release(task_id: str, file_path: Optional[str], checkpoints: TaskCheckpoints):
+    """
+    After a run: a completed task drops its checkpoints and audio; a failed one keeps
+    its checkpoints, and its audio too if the transcript never got checkpointed.
+    """
+    task = task_store.get(task_id) or {}
+    if task.get("status") == "completed":
+        checkpoints.clear()
+        if file_path:
+            _cleanup(file_path)
+    elif "transcript" not in checkpoints.saved and file_path and os.path.exists(file_path):
+        task_store.update(task_id, audio_path=checkpoint_store.retain_audio(task_id, file_path))
+        print(f"📦 [Worker] Kept audio of failed task {task_id} for a retry.")
+
+def process_audio_task(task_id: str, file_path: Optional[str], mode: Optional[str] = None, audio_hash: Optional[str] = None):
     """
-    Background worker to process the audio file.
+    Background worker to process the audio file (thread / process job backends).
+    `file_path` is None when a retry resumes after the transcript checkpoint.
     """
+    checkpoints = _task_checkpoints(task_id, file_path)
     try:
-        tasks[task_id]["status"] = "processing"
+        task_store.update(task_id, status="processing")
         print(f"⚙️ [Worker] Processing task {task_id}...")
-        
-        result_json_str = orchestrator.run(file_path)
-        
-        if result_json_str:
-            tasks[task_id]["status"] = "completed"
-            tasks[task_id]["result"] = json.loads(result_json_str)
-            print(f"✅ [Worker] Task {task_id} completed.")
-        else:
-            tasks[task_id]["status"] = "failed"
-            tasks[task_id]["error"] = "Pipeline failed to generate output"
-            print(f"❌ [Worker] Task {task_id} failed.")
+        _finish_task(task_id, get_orchestrator().run(file_path, mode=mode, audio_hash=audio_hash,
+                                                     on_progress=_progress_reporter(task_id), checkpoints=checkpoints))
+    except Exception as e:
+        _fail_task(task_id, e)
+    finally:
+        _release(task_id, file_path, checkpoints)
 
+async def aprocess_audio_task(task_id: str, file_path: Optional[str], mode: Optional[str] = None, audio_hash: Optional[str] = None):
+    """
+    Async counterpart of `process_audio_task` (async job backend), run on the orchestrator's loop.
+    """
+    checkpoints = _task_checkpoints(task_id, file_path)
+    try:
+        task_store.update(task_id, status="processing")
+        print(f"⚙️ [Worker] Processing task {task_id}...")
+        _finish_task(task_id, await get_orchestrator().arun(file_path, mode=mode, audio_hash=audio_hash,
+                                                            on_progress=_progress_reporter(task_id), checkpoints=checkpoints))
     except Exception as e:
-        tasks[task_id]["status"] = "failed"
-        tasks[task_id]["error"] = str(e)
-        print(f"❌ [Worker] Task {task_id} error: {str(e)}")
-    
+        _fail_task(task_id, e)
     finally:
-        # Cleanup
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"🧹 [Worker] Cleaned up: {file_path}")
-            except Exception as cleanup_error:
-                print(f"⚠️ [Worker] Cleanup warning: {cleanup_error}")
+        _release(task_id, file_path, checkpoints)
+
+# Dedicated pipeline workers with a bounded queue (JOB_WORKERS, JOB_QUEUE_SIZE, JOB_BACKEND)
+JOB_BACKEND = os.getenv("JOB_BACKEND", "async").strip().lower()
+job_queue = JobQueue(
+    aprocess_audio_task if JOB_BACKEND == "async" else process_audio_task,
+    backend=JOB_BACKEND,
+    loop=pipeline_loop
+)
+if job_queue.backend == "process" and isinstance(task_store, MemoryTaskStore):
+    print("⚠️ [API] JOB_BACKEND=process needs a shared task store. Set TASK_STORE=sqlite.")
+
+def _queue_gauges():
+    stats = job_queue.stats()
+    return {("depth",): stats["depth"], ("running",): stats["running"], ("maxsize",): stats["maxsize"]}
+
+registry.gauge("stt_job_queue_jobs", "Job queue depth, running jobs and capacity.", ("state",), callback=_queue_gauges)
 
 # Serve static files if build directory exists
 if os.path.exists("out"):
     app.mount("/", StaticFiles(directory="out", html=True), name="static")
 
-@app.post("/api/upload")
-async def upload_audio(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+@app.post("/api/upload", openapi_extra={"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object", "required": ["file"], "properties": {
+        "file": {"type": "string", "format": "binary"},
+        "mode": {"type": "string", "enum": list(PIPELINE_MODES)},
+        "priority": {"type": "integer", "default": 0, "minimum": 0, "maximum": 9},
+    }}}}}})
+async def upload_audio(request: Request):
     """
-    Uploads an audio file and starts a background task for processing.
-    Returns a task_id immediately.
+    Uploads an audio file (multipart/form-data: "file", optional "mode" and "priority") and queues it for processing.
+    `mode` optionally selects the pipeline mode (auto, standard, mapreduce, combined);
+    `priority` (0-9, default 0 = most urgent; out-of-range values are clamped)
+    lets a client defer its own jobs: higher values wait behind lower ones.
+    The body is read as a stream (see receive_upload), so an oversized upload is cut off as it arrives.
+    Returns a task_id immediately, 413 when the file exceeds MAX_UPLOAD_BYTES,
+    or 429 with Retry-After when the queue is full.
     """
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No filename provided")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+    # Reject before reading the upload if there is no room in the queue
+    if job_queue.is_full():
+        retry_after = job_queue.retry_after()
+        raise HTTPException(status_code=429, detail="Too many pending jobs", headers={"Retry-After": str(retry_after)})
 
-    # Generate unique task ID and filename
+    # Generate unique task ID; the file is saved as <TEMP_DIR>/<task_id><extension>
     task_id = str(uuid.uuid4())
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{task_id}{file_extension}"
-    file_path = os.path.join(TEMP_DIR, unique_filename)
+    upload = await receive_upload(request, task_id)
+    file_path = upload["path"]
+    try:
+        if not upload["filename"]:
+            raise HTTPException(status_code=400, detail="No filename provided")
+        mode = upload["fields"].get("mode") or None
+        if mode is not None and mode not in PIPELINE_MODES:
+            raise HTTPException(status_code=400, detail=f"Invalid mode '{mode}'. Expected one of {list(PIPELINE_MODES)}")
+        try:
+            priority = clamp_priority(int(upload["fields"].get("priority") or 0))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="priority must be an integer") from None
+    except HTTPException:
+        if file_path:
+            _cleanup(file_path)
+        raise
 
-    # Initialize task status
-    tasks[task_id] = {
+    # Initialize task status (hash computed while streaming, for the transcript cache)
+    task_store.create(task_id, {
         "status": "pending",
+        "mode": mode or get_orchestrator().default_mode,
+        "stage": None,
+        "partial": {},
         "result": None,
-        "error": None
-    }
+        "error": None,
+        "audio_hash": upload["sha256"],
+        "priority": priority,
+    })
+    print(f"📥 [API] File uploaded for task {task_id}: {file_path}")
 
     try:
-        # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        print(f"📥 [API] File uploaded for task {task_id}: {file_path}")
+        # Hand off to the job queue
+        job_queue.submit(task_id, file_path, mode, upload["sha256"], priority=priority)
+    except QueueFullError as e:
+        task_store.update(task_id, status="failed", error=str(e))
+        _cleanup(file_path)
+        raise HTTPException(status_code=429, detail="Too many pending jobs", headers={"Retry-After": str(e.retry_after)})
+    return {"task_id": task_id, "status": "pending"}
 
-        # Add to background tasks
-        background_tasks.add_task(process_audio_task, task_id, file_path)
-        
-        return {"task_id": task_id, "status": "pending"}
+@app.post("/api/retry/{task_id}")
+async def retry_task(task_id: str):
+    """
+    Re-queues a failed task. It resumes from the first stage without a checkpoint
+    (transcript, analysis, summary, extracted_data, structured_data, then publish),
+    so e.g. a Notion outage only re-runs the publish step.
+    Returns 409 when the task is not failed or can no longer be resumed.
+    """
+    task = task_store.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.get("status") != "failed":
+        raise HTTPException(status_code=409, detail=f"Only failed tasks can be retried (status: {task.get('status')})")
 
-    except Exception as e:
-        tasks[task_id]["status"] = "failed"
-        tasks[task_id]["error"] = str(e)
-        raise HTTPException(status_code=500, detail=str(e))
+    checkpointed = restore_checkpoints(checkpoint_store.load(task_id))
+    audio_path = task.get("audio_path")
+    if "transcript" not in checkpointed and not (audio_path and os.path.exists(audio_path)):
+        raise HTTPException(status_code=409, detail="Task cannot be resumed: no transcript checkpoint and the audio is gone")
+    if job_queue.is_full():
+        raise HTTPException(status_code=429, detail="Too many pending jobs", headers={"Retry-After": str(job_queue.retry_after())})
+
+    resume_from = resume_stage(checkpointed)
+    # Partial outputs of the stages the retry skips come back from their checkpoints
+    task_store.update(task_id, status="pending", error=None, resume_from=resume_from,
+                      partial={name: value for name, value in checkpointed.items() if name in PARTIAL_OUTPUTS},
+                      retries=task.get("retries", 0) + 1)
+    try:
+        job_queue.submit(task_id, None if "transcript" in checkpointed else audio_path,
+                         task.get("mode"), task.get("audio_hash"),
+                         priority=task.get("priority", 0))
+    except QueueFullError as e:
+        task_store.update(task_id, status="failed", error=str(e))
+        raise HTTPException(status_code=429, detail="Too many pending jobs", headers={"Retry-After": str(e.retry_after)})
+
+    print(f"🔁 [API] Retrying task {task_id} from '{resume_from}'")
+    return {"task_id": task_id, "status": "pending", "resume_from": resume_from}
+
+@app.websocket("/api/live")
+async def live_meeting(websocket: WebSocket, format: LiveFormat = "webm"):
+    """
+    Live meeting mode. The client sends each audio segment as a binary message
+    (every segment must be a self-contained file in `format`) and {"type": "end"}
+    as a text message when the meeting is over.
+
+    Server events (JSON): "session" (task_id), "transcript" per segment,
+    "update" with the rolling analysis and todos, "error", and "final" with the
+    result. The result is also stored under task_id for /api/status.
+    An unsupported `format` closes the handshake with 1008 (policy violation).
+    """
+    await websocket.accept()
+    task_id = str(uuid.uuid4())
+    task_store.create(task_id, {"status": "live", "mode": "live", "result": None, "error": None})
+    print(f"🎧 [API] Live session started: {task_id}")
+
+    app_loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    connected = True
+
+    async def send_events():
+        nonlocal connected
+        while True:
+            event = await events.get()
+            try:
+                await websocket.send_text(to_json(event).decode("utf-8"))
+            except Exception:
+                connected = False
+                return
+
+    # Session coroutines run on the pipeline loop (where the async API clients live)
+    session = LiveSession(get_orchestrator(), task_id, extension=f".{format}",
+                          on_event=lambda event: app_loop.call_soon_threadsafe(events.put_nowait, event),
+                          temp_dir=TEMP_DIR)
+    sender = asyncio.create_task(send_events())
+    events.put_nowait({"type": "session", "task_id": task_id})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes") is not None:
+                pipeline_loop.submit(session.add_segment(message["bytes"]))
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") == "end":
+                    break
+                if control.get("type") == "snapshot":
+                    events.put_nowait({"type": "snapshot", **session.snapshot()})
+
+        # Meeting over (or client gone): only the last window is left to process
+        task_store.update(task_id, status="processing")
+        ended = time.perf_counter()
+        try:
+            _finish_task(task_id, await asyncio.wrap_future(pipeline_loop.submit(session.finalize())))
+        except Exception as e:
+            _fail_task(task_id, e)
+        if connected:
+            task = task_store.get(task_id)
+            events.put_nowait({"type": "final", "task_id": task_id, "status": task["status"],
+                               "result": task["result"], "error": task["error"],
+                               "finalize_seconds": round(time.perf_counter() - ended, 3)})
+            while not events.empty() and not sender.done():
+                await asyncio.sleep(0.01)
+            await websocket.close()
+    finally:
+        sender.cancel()
+
+# Long-poll / SSE: how often the store is checked for a new task version, and the longest allowed wait
+STATUS_POLL_INTERVAL = float(os.getenv("STATUS_POLL_INTERVAL", "0.25"))
+STATUS_MAX_WAIT_SECONDS = float(os.getenv("STATUS_MAX_WAIT_SECONDS", "30"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+def _etag(task_id: str, version: int) -> str:
+    return f'"{task_id}-{version}"'
+
+async def _wait_for_change(task_id: str, version: int, timeout: float) -> Optional[int]:
+    """
+    Waits up to `timeout` seconds for the task's version to move past `version`.
+    Only the version column is read while waiting. Returns the latest version (None if the task is gone).
+    """
+    deadline = time.monotonic() + timeout
+    current = version
+    while current == version and time.monotonic() < deadline:
+        await asyncio.sleep(min(STATUS_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+        current = task_store.version(task_id)
+    return current
 
 @app.get("/api/status/{task_id}")
-async def get_task_status(task_id: str):
+async def get_task_status(task_id: str, request: Request, wait: float = 0):
     """
-    Returns the current status and result of a task.
+    Returns the current status and result of a task, with an ETag that changes on every update.
+
+    Send the last ETag as If-None-Match to get 304 when nothing changed; with `wait`
+    (seconds, capped at STATUS_MAX_WAIT_SECONDS) the request is held until the task changes
+    or the wait expires (long-polling).
+    """
+    data, status, version = task_store.get_json(task_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    etag = _etag(task_id, version)
+    if request.headers.get("if-none-match") == etag:
+        if wait > 0 and status not in FINISHED_STATUSES:
+            if await _wait_for_change(task_id, version, min(wait, STATUS_MAX_WAIT_SECONDS)) != version:
+                data, status, version = task_store.get_json(task_id)
+                if data is None:
+                    raise HTTPException(status_code=404, detail="Task not found")
+                etag = _etag(task_id, version)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+    # The task record is stored as JSON (pydantic-core, one pass over the MeetingResult) and sent as is
+    return Response(data, headers={"ETag": etag, "Cache-Control": "no-cache"}, media_type="application/json")
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {to_json(data).decode('utf-8')}"]
+    return "\n".join(lines) + "\n\n"
+
+@app.get("/api/events/{task_id}")
+async def task_events(task_id: str, request: Request):
     """
-    if task_id not in tasks:
+    Server-sent events for one task:
+    "status" (pending / processing), "stage" (transcribing, analyzing, extracting, structuring, syncing),
+    "partial" ({name, value} for transcript, analysis, summary, extracted_data as each is ready),
+    then "completed" (result) or "failed" (error), after which the stream closes.
+    Event IDs are task versions; a reconnecting client is replayed the current state.
+    """
+    if task_store.version(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    return tasks[task_id]
+
+    async def stream():
+        version = 0
+        sent = {"status": None, "stage": None, "partial": set()}
+        last_write = time.monotonic()
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            current = task_store.version(task_id)
+            if current is None:
+                yield _sse("failed", {"task_id": task_id, "error": "Task not found"})
+                return
+            if current != version:
+                task, version = task_store.get_versioned(task_id)
+                if task is None:
+                    continue
+                status = task.get("status")
+                if status != sent["status"] and status not in FINISHED_STATUSES:
+                    sent["status"] = status
+                    yield _sse("status", {"task_id": task_id, "status": status}, version)
+                if task.get("stage") and task["stage"] != sent["stage"]:
+                    sent["stage"] = task["stage"]
+                    yield _sse("stage", {"task_id": task_id, "stage": task["stage"]}, version)
+                # Partial outputs that landed between two polls are still sent; a finished task has
+                # dropped them, and its final event carries the result instead
+                for name, value in (task.get("partial") or {}).items():
+                    if name not in sent["partial"]:
+                        sent["partial"].add(name)
+                        yield _sse("partial", {"task_id": task_id, "name": name, "value": value}, version)
+                if status in FINISHED_STATUSES:
+                    payload = {"task_id": task_id, "result": task.get("result")} if status == "completed" \
+                        else {"task_id": task_id, "error": task.get("error")}
+                    yield _sse(status, payload, version)
+                    return
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write >= SSE_HEARTBEAT_SECONDS:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                last_write = time.monotonic()
+            await asyncio.sleep(STATUS_POLL_INTERVAL)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/queue")
+def queue_stats():
+    """
+    Returns job queue depth, running jobs and recent wait times.
+    """
+    return job_queue.stats()
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    """
+    Returns transcript and LLM response cache hit/miss counts and size.
+    """
+    orchestrator = get_orchestrator()
+    transcript_cache = orchestrator.speech_agent.cache
+    response_cache = getattr(orchestrator.client, "cache", None)
+    return {
+        "transcripts": {"enabled": True, **transcript_cache.stats()} if transcript_cache else {"enabled": False},
+        "llm_responses": {"enabled": True, **response_cache.stats()} if response_cache else {"enabled": False},
+    }
+
+def _meeting_store():
+    # Queries stay local: the orchestrator is built, but not its SDK clients or Notion
+    store = get_orchestrator().meeting_store
+    if store is None:
+        raise HTTPException(status_code=503, detail="Meeting store is disabled (MEETING_STORE_ENABLED=false)")
+    return store
+
+def _date_param(name: str, value: Optional[str]) -> Optional[str]:
+    if value and not DATE_RE.match(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {name} '{value}'. Expected YYYY-MM-DD")
+    return value
+
+@app.get("/api/todos")
+def list_todos(owner: Optional[str] = None, due_from: Optional[str] = None, due_to: Optional[str] = None,
+               meeting_from: Optional[str] = None, meeting_to: Optional[str] = None, limit: int = 100):
+    """
+    Todos from the local meeting store, filtered by owner, due date and meeting date (YYYY-MM-DD, inclusive).
+    """
+    return {"todos": _meeting_store().todos(
+        owner=owner,
+        due_from=_date_param("due_from", due_from), due_to=_date_param("due_to", due_to),
+        meeting_from=_date_param("meeting_from", meeting_from), meeting_to=_date_param("meeting_to", meeting_to),
+        limit=max(1, min(limit, 1000)),
+    )}
+
+@app.get("/api/meetings")
+def list_meetings(date_from: Optional[str] = None, date_to: Optional[str] = None, limit: int = 50):
+    """
+    Stored meetings in a date range, most recent first.
+    """
+    return {"meetings": _meeting_store().meetings(
+        date_from=_date_param("date_from", date_from), date_to=_date_param("date_to", date_to),
+        limit=max(1, min(limit, 500)),
+    )}
+
+@app.get("/api/meetings/{meeting_id}")
+def get_meeting(meeting_id: int):
+    """
+    One stored meeting with its todos.
+    """
+    meeting = _meeting_store().meeting(meeting_id)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+@app.get("/api/search")
+def search(q: str, limit: int = 20):
+    """
+    Full-text search over meeting titles, summaries and todos.
+    """
+    return {"query": q, "results": _meeting_store().search(q, limit=max(1, min(limit, 200)))}
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus scrape endpoint: stage / API latency histograms, token usage and error counts.
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get("/")
 def root():
@@ -129,7 +664,34 @@ def root():
 
 @app.get("/api/health")
 def health_check():
-    return {"status": "ok", "mode": "persistent_async"}
+    """
+    Liveness plus cold-start figures: module import time and whether the
+    orchestrator / SDK clients have been built yet.
+    """
+    return {
+        "status": "ok",
+        "mode": "persistent_async",
+        "startup": {
+            "import_seconds": round(IMPORT_SECONDS, 4),
+            "uptime_seconds": round(time.perf_counter() - _IMPORT_STARTED, 1),
+            "orchestrator_ready": _orchestrator is not None,
+            "clients_ready": _orchestrator is not None and "_clients" in vars(_orchestrator),
+        },
+    }
+
+def _warm_up():
+    # Builds clients and agents off the request path; Notion schema validation still waits for the first sync
+    orchestrator = get_orchestrator()
+    for name in ("speech_agent", "analysis_agent", "summary_agent", "task_agent", "structuring_agent", "integration_agent"):
+        getattr(orchestrator, name)
+    print("🔥 [API] Pipeline clients warmed up.")
+
+if os.getenv("PIPELINE_WARMUP", "true").strip().lower() in ("1", "true", "yes"):
+    threading.Thread(target=_warm_up, name="pipeline-warmup", daemon=True).start()
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+COMPONENT_INIT_SECONDS.observe(IMPORT_SECONDS, component="api.import")
+print(f"⏱️ [API] Module ready in {IMPORT_SECONDS * 1000:.0f}ms (orchestrator deferred until first use)")
 
 if __name__ == "__main__":
     import uvicorn
@@ -18,25 +18,49 @@ export default function Home() {
   const [result, setResult] = useState<any>(null);
   const [error, setError] = useState<string | null>(null);
 
-  const pollTaskStatus = async (taskId: string) => {
+  const STAGE_MESSAGES: Record<string, string> = {
+    transcribing: "음성을 텍스트로 변환하고 있습니다...",
+    analyzing: "AI가 내용을 분석하고 있습니다...",
+    extracting: "요약과 할 일을 정리하고 있습니다...",
+    structuring: "결과를 구성하고 있습니다...",
+    syncing: "Notion에 동기화하고 있습니다...",
+  };
+
+  const handleTaskUpdate = (data: any): boolean => {
+    // Returns true once the task has finished
+    if (data.status === "completed") {
+      setResult(data.result);
+      setIsLoading(false);
+      setStatus("");
+      return true;
+    }
+    if (data.status === "failed") {
+      setError(data.error || "분석 중 오류가 발생했습니다.");
+      setIsLoading(false);
+      setStatus("");
+      return true;
+    }
+    if (data.stage && STAGE_MESSAGES[data.stage]) {
+      setStatus(STAGE_MESSAGES[data.stage]);
+    } else {
+      setStatus(data.status === "processing" ? "AI가 내용을 분석하고 있습니다..." : "대기 중...");
+    }
+    return false;
+  };
+
+  // Fallback when EventSource is unavailable: long-poll (the server holds the request until the task changes)
+  const pollTaskStatus = async (taskId: string, etag?: string) => {
     const baseUrl = API_URL.endsWith("/api") ? API_URL : `${API_URL.replace(/\/$/, "")}/api`;
-    
+
     try {
-      const response = await axios.get(`${baseUrl}/status/${taskId}`);
-      const data = response.data;
-
-      if (data.status === "completed") {
-        setResult(data.result);
-        setIsLoading(false);
-        setStatus("");
-      } else if (data.status === "failed") {
-        setError(data.error || "분석 중 오류가 발생했습니다.");
-        setIsLoading(false);
-        setStatus("");
-      } else {
-        // Continue polling
-        setStatus(data.status === "processing" ? "AI가 내용을 분석하고 있습니다..." : "대기 중...");
-        setTimeout(() => pollTaskStatus(taskId), 3000);
+      const response = await axios.get(`${baseUrl}/status/${taskId}`, {
+        params: { wait: 25 },
+        headers: etag ? { "If-None-Match": etag } : {},
+        validateStatus: (code) => code === 200 || code === 304,
+      });
+
+      if (response.status === 304 || !handleTaskUpdate(response.data)) {
+        pollTaskStatus(taskId, response.headers["etag"] || etag);
       }
     } catch (err) {
       console.error("❌ [Polling] Error:", err);
@@ -45,6 +69,36 @@ export default function Home() {
     }
   };
 
+  const watchTask = (taskId: string) => {
+    const baseUrl = API_URL.endsWith("/api") ? API_URL : `${API_URL.replace(/\/$/, "")}/api`;
+    if (typeof EventSource === "undefined") {
+      pollTaskStatus(taskId);
+      return;
+    }
+
+    const source = new EventSource(`${baseUrl}/events/${taskId}`);
+    let finished = false;
+    source.addEventListener("status", (e) => handleTaskUpdate(JSON.parse((e as MessageEvent).data)));
+    source.addEventListener("stage", (e) => handleTaskUpdate({ status: "processing", ...JSON.parse((e as MessageEvent).data) }));
+    source.addEventListener("completed", (e) => {
+      finished = true;
+      source.close();
+      handleTaskUpdate({ status: "completed", ...JSON.parse((e as MessageEvent).data) });
+    });
+    source.addEventListener("failed", (e) => {
+      finished = true;
+      source.close();
+      handleTaskUpdate({ status: "failed", ...JSON.parse((e as MessageEvent).data) });
+    });
+    source.onerror = () => {
+      // Stream dropped (e.g. a proxy without SSE support): continue with long-polling
+      if (!finished) {
+        source.close();
+        pollTaskStatus(taskId);
+      }
+    };
+  };
+
   const handleFileSelect = async (selectedFile: File) => {
     setFile(selectedFile);
     setError(null);
@@ -71,9 +125,9 @@ export default function Home() {
       const { task_id } = response.data;
       console.log(`🆔 [API] Task started: ${task_id}`);
       
-      // 2. Start polling for status
+      // 2. Follow progress (server-sent events, long-poll fallback)
       setStatus("업로드 완료! 분석을 시작합니다...");
-      pollTaskStatus(task_id);
+      watchTask(task_id);
 
     } catch (err: any) {
       console.error("❌ [API] Error:", err);
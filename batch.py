@@ -0,0 +1,119 @@
+import asyncio
+import glob
+import os
+import time
+from typing import Dict, List, Optional
+
+from storage import dumps
+
+AUDIO_EXTENSIONS = (".mp3", ".mp4", ".m4a", ".mpeg", ".mpga", ".wav", ".webm", ".ogg", ".flac")
+
+
+def collect_files(source: str) -> List[str]:
+    """
+    Expands a directory (audio files directly inside it) or a glob pattern
+    (supports ** for recursion) into a sorted list of absolute paths.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(os.path.abspath(path) for path in paths
+                  if os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS))
+
+
+class BatchRunner:
+    """
+    Runs many recordings through one shared orchestrator, `jobs` at a time.
+    Each finished file is appended to `output_path` (JSONL) and to the checkpoint file,
+    so a re-run skips it. Files that failed are only re-run with `retry_failed`; the new
+    output record has a higher `attempt` and supersedes the earlier one.
+    """
+
+    def __init__(self, orchestrator, output_path: str, checkpoint_path: Optional[str] = None,
+                 jobs: int = 4, mode: Optional[str] = None, retry_failed: bool = False):
+        self.orchestrator = orchestrator
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.jobs = max(1, jobs)
+        self.mode = mode
+        self.retry_failed = retry_failed
+
+    def load_checkpoint(self) -> Dict[str, List[str]]:
+        """
+        Returns file path -> statuses of its finished attempts, oldest first.
+        Lines are "<path>\t<status>"; a bare path (older checkpoints) means completed.
+        """
+        attempts: Dict[str, List[str]] = {}
+        if not os.path.exists(self.checkpoint_path):
+            return attempts
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                path, _, status = line.rstrip("\n").partition("\t")
+                if path.strip():
+                    attempts.setdefault(path.strip(), []).append(status or "completed")
+        return attempts
+
+    def _append(self, path: str, line: str):
+        # One line per write, flushed and synced so an interrupted run loses at most the file in flight
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _record(self, record: dict):
+        # fsync blocks, so writes run in a worker thread; the lock keeps lines whole and in order
+        async with self._write_lock:
+            await asyncio.to_thread(self._append, self.output_path, dumps(record))
+            await asyncio.to_thread(self._append, self.checkpoint_path, f"{record['file']}\t{record['status']}")
+
+    async def _process(self, file_path: str, attempt: int, semaphore: asyncio.Semaphore, counter: dict, total: int):
+        async with semaphore:
+            started = time.monotonic()
+            record = {"file": file_path, "status": "completed", "result": None, "error": None, "attempt": attempt}
+            try:
+                output = await self.orchestrator.arun(file_path, mode=self.mode)
+                if output is None:
+                    record.update(status="failed", error="Validation failed")
+                else:
+                    record["result"] = output
+            except Exception as e:
+                record.update(status="failed", error=str(e))
+            record["seconds"] = round(time.monotonic() - started, 2)
+
+        await self._record(record)
+        counter[record["status"]] += 1
+        done = counter["completed"] + counter["failed"]
+        icon = "✅" if record["status"] == "completed" else "❌"
+        print(f"{icon} [Batch] {done}/{total} {os.path.basename(file_path)} ({record['seconds']:.1f}s)")
+
+    async def arun(self, files: List[str]) -> dict:
+        attempts = self.load_checkpoint()
+        done = [path for path in files if "completed" in attempts.get(path, ())]
+        failed = [path for path in files if path in attempts and path not in done]
+        pending = [path for path in files if path not in attempts or (self.retry_failed and path in failed)]
+        failed_note = "retrying" if self.retry_failed else "skipped, use --retry-failed to re-run"
+        print(f"📦 [Batch] {len(files)} files, {len(done)} already done, {len(failed)} failed before ({failed_note}), "
+              f"{len(pending)} to process with {self.jobs} parallel jobs.")
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.jobs)
+        self._write_lock = asyncio.Lock()
+        counter = {"completed": 0, "failed": 0}
+        await asyncio.gather(*(self._process(path, len(attempts.get(path, ())) + 1, semaphore, counter, len(pending))
+                               for path in pending))
+
+        summary = {
+            "total": len(files),
+            "skipped": len(files) - len(pending),
+            # Earlier failures left as they were (not retried)
+            "failed_skipped": 0 if self.retry_failed else len(failed),
+            **counter,
+            "seconds": round(time.monotonic() - started, 2),
+        }
+        print(f"🏁 [Batch] Done: {summary['completed']} completed, {summary['failed']} failed, "
+              f"{summary['skipped']} skipped in {summary['seconds']:.1f}s. Results: {self.output_path}")
+        return summary
+
+    def run(self, files: List[str]) -> dict:
+        return self.orchestrator.background_loop.run(self.arun(files))
@@ -0,0 +1,350 @@
+"""
+Offline load-and-latency benchmark.
+
+Drives N concurrent uploads through the real FastAPI app (api/index.py) with the
+mock OpenAI and Notion clients injecting latency, 429s and errors, then reports
+throughput and p50/p95/p99 for uploads, end-to-end jobs and every pipeline stage.
+
+    python benchmark.py --uploads 50 --concurrency 10
+    python benchmark.py --chat-profile "median=1500,sigma=0.6,error=0.01" --save baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 0.2   # exit 1 on regression
+    python benchmark.py --chat-profile "median=1200,sigma=0.9" --hedge --deadline 60
+    python benchmark.py --model-tiers gpt-4o --save single_tier.json   # vs. the default fast-first tiers
+    python benchmark.py --serialization --todos 50   # per-job result serialization, before vs. after
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Latency profiles loosely modelled on production (see mocks.FaultProfile for the format)
+DEFAULT_CHAT_PROFILE = "median=1200,sigma=0.5"
+DEFAULT_WHISPER_PROFILE = "median=2500,sigma=0.4"
+DEFAULT_NOTION_PROFILE = "median=250,sigma=0.4,rate_limit=0.02,retry_after=0.5"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile (q in 0-100). Returns 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def configure_environment(args):
+    # Must run before api.index is imported: the task store and job queue read their settings at
+    # import, and the lazily built orchestrator reads the rest when its clients are first created
+    os.environ["OPENAI_API_KEY"] = ""  # forces the mock OpenAI clients
+    # run_benchmark warms the pipeline up itself, before the clock starts
+    os.environ["PIPELINE_WARMUP"] = "false"
+    os.environ["NOTION_MOCK"] = "true"
+    os.environ["MOCK_CHAT_PROFILE"] = args.chat_profile
+    os.environ["MOCK_WHISPER_PROFILE"] = args.whisper_profile
+    os.environ["MOCK_NOTION_PROFILE"] = args.notion_profile
+    os.environ.setdefault("STT_STATE_DIR", tempfile.mkdtemp(prefix="stt_benchmark_"))
+    # Every upload is unique, but keep caches out of the measurement anyway
+    os.environ.setdefault("TRANSCRIPT_CACHE_ENABLED", "false")
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    if args.mode:
+        os.environ["PIPELINE_MODE"] = args.mode
+    if args.hedge:
+        os.environ["LLM_HEDGE_ENABLED"] = "true"
+    if args.deadline:
+        os.environ["PIPELINE_DEADLINE_SECONDS"] = str(args.deadline)
+    if args.model_tiers:
+        os.environ["LLM_MODEL_TIERS"] = args.model_tiers
+    os.environ["MOCK_FAST_MODEL_FAILURE_RATE"] = str(args.fast_failure_rate)
+
+
+def run_benchmark(args) -> dict:
+    configure_environment(args)
+    from fastapi.testclient import TestClient
+    from api import index
+    from metrics import API_ERRORS, API_RETRIES, LLM_CALLS, LLM_HEDGES, LLM_TIER_RESULTS, STAGE_TIMEOUTS
+
+    upload_seconds: List[float] = []
+    job_seconds: List[float] = []
+    outcomes = defaultdict(int)
+    lock = threading.Lock()
+
+    def one_upload(i: int):
+        payload = os.urandom(args.size_kb * 1024)
+        started = time.perf_counter()
+        while True:
+            response = client.post("/api/upload", files={"file": (f"bench_{i}.mp3", payload, "audio/mpeg")})
+            if response.status_code != 429:
+                break
+            with lock:
+                outcomes["rejected_429"] += 1
+            time.sleep(float(response.headers.get("Retry-After", "1")))
+        uploaded = time.perf_counter()
+        if response.status_code != 200:
+            with lock:
+                outcomes[f"upload_{response.status_code}"] += 1
+            return
+        task_id = response.json()["task_id"]
+        deadline = uploaded + args.timeout
+        status = "pending"
+        while time.perf_counter() < deadline:
+            status = client.get(f"/api/status/{task_id}").json()["status"]
+            if status in ("completed", "failed"):
+                break
+            time.sleep(args.poll_interval)
+        finished = time.perf_counter()
+        with lock:
+            upload_seconds.append(uploaded - started)
+            outcomes[status if status in ("completed", "failed") else "timeout"] += 1
+            if status == "completed":
+                job_seconds.append(finished - started)
+
+    print(f"🏋️ [Benchmark] {args.uploads} uploads, concurrency {args.concurrency}, "
+          f"job backend {index.job_queue.backend} ({index.job_queue.workers} workers)")
+    # Cold start (orchestrator, clients, agents) is timed on its own and kept out of the job timings
+    warmup_started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        index._warm_up()
+    warmup = time.perf_counter() - warmup_started
+    index.get_orchestrator().recent_timelines.clear()
+    # Pipeline logging is per request and would drown the report; --verbose keeps it
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output, TestClient(index.app) as client:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(one_upload, range(args.uploads)))
+        wall = time.perf_counter() - started
+
+    stages = defaultdict(list)
+    for timeline in list(index.get_orchestrator().recent_timelines):
+        for entry in timeline:
+            stages[entry["stage"]].append(entry["duration"])
+
+    errors = {}
+    for line in API_ERRORS.samples() + API_RETRIES.samples():
+        name, value = line.rsplit(" ", 1)
+        errors[name] = float(value)
+
+    calls, hedges = LLM_CALLS.total(), LLM_HEDGES.total()
+    hedging = {
+        "enabled": bool(args.hedge),
+        "llm_calls": int(calls),
+        "hedged": int(hedges),
+        "hedge_wins": int(LLM_HEDGES.total(winner="hedge")),
+        "hedge_rate": round(hedges / calls, 4) if calls else 0.0,
+        "stage_timeouts": int(STAGE_TIMEOUTS.total()),
+    }
+
+    # agent -> model -> {accepted, escalated, exhausted}
+    tiers = defaultdict(lambda: defaultdict(dict))
+    for (agent, model, outcome), value in sorted(LLM_TIER_RESULTS.collect().items()):
+        tiers[agent][model][outcome] = int(value)
+
+    return {
+        "config": {
+            "uploads": args.uploads, "concurrency": args.concurrency, "size_kb": args.size_kb, "mode": args.mode,
+            "chat_profile": args.chat_profile, "whisper_profile": args.whisper_profile,
+            "notion_profile": args.notion_profile, "job_backend": index.job_queue.backend,
+            "job_workers": index.job_queue.workers, "hedge": bool(args.hedge), "deadline": args.deadline,
+            "model_tiers": os.getenv("LLM_MODEL_TIERS", ""), "fast_failure_rate": args.fast_failure_rate,
+        },
+        "warmup_seconds": round(warmup, 3),
+        "wall_seconds": round(wall, 3),
+        "throughput_jobs_per_minute": round(outcomes["completed"] / wall * 60, 2) if wall else 0.0,
+        "outcomes": dict(outcomes),
+        "upload": summarize(upload_seconds),
+        "end_to_end": summarize(job_seconds),
+        "stages": {name: summarize(values) for name, values in sorted(stages.items())},
+        "api_errors_and_retries": errors,
+        "hedging": hedging,
+        "model_tiers": {agent: dict(models) for agent, models in tiers.items()},
+    }
+
+
+def sample_structured_data(todos: int) -> dict:
+    """
+    Structuring-stage output shaped like a real meeting, with `todos` action items.
+    """
+    participants = ["김민수", "이서연", "Sarah", "Mike"]
+    return {
+        "summary": "스테이징 서버의 로그인 버그 수정과 분기 보고서 마감 일정에 대한 주요 결정이 내려졌습니다. " * 4,
+        "meeting_info": {"title": "주간 업무 회의", "date": "2026-01-24", "participants": participants},
+        "todos": [{"action": f"로그인 버그 수정 및 배포 #{i}", "description": "스테이징 서버에서 재현 후 핫픽스 배포, 결과를 채널에 공유",
+                   "owner": participants[i % len(participants)], "due": "2026-01-30"} for i in range(todos)],
+    }
+
+
+def run_serialization_benchmark(todos: int, iterations: int) -> dict:
+    """
+    Per-job result handling from the structuring stage to a /api/status response:
+      before: dict -> MeetingResult (validate, discarded) -> json.dumps(indent=2) -> json.loads
+              -> json.dumps(task record) for the task store -> json.loads + json.dumps for the response
+      after:  MeetingResult (validated once) -> to_json(task record) for the task store,
+              whose stored JSON is the response body
+    Reports microseconds per job and the tracemalloc peak of one job.
+    """
+    from pydantic_core import to_json
+    from agents.structure import MeetingResult
+
+    data = sample_structured_data(todos)
+
+    def before():
+        MeetingResult(**data)
+        final_output = json.dumps(data, indent=2, ensure_ascii=False)
+        record = {"status": "completed", "result": json.loads(final_output), "error": None}
+        row = json.dumps(record, ensure_ascii=False)
+        return json.dumps(json.loads(row), ensure_ascii=False).encode("utf-8")
+
+    def after():
+        record = {"status": "completed", "result": MeetingResult.model_validate(data), "error": None}
+        row = to_json(record).decode("utf-8")
+        return row.encode("utf-8")
+
+    # Same meeting either way; `after` also carries the model's optional fields (e.g. "audio": null)
+    assert MeetingResult(**json.loads(before())["result"]) == MeetingResult(**json.loads(after())["result"])
+    results = {}
+    for name, job in (("before", before), ("after", after)):
+        for _ in range(min(100, iterations)):
+            job()
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            job()
+            timings.append((time.perf_counter() - started) * 1e6)
+        tracemalloc.start()
+        job()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"p50_us": round(percentile(timings, 50), 1), "p95_us": round(percentile(timings, 95), 1),
+                         "peak_kb": round(peak / 1024, 1)}
+    return {"todos": todos, "iterations": iterations, "response_bytes": len(after()), **results}
+
+
+def print_serialization_report(report: dict):
+    print(f"\n📊 [Benchmark] Result serialization per job ({report['todos']} todos, "
+          f"{report['response_bytes']} byte response, {report['iterations']} iterations)")
+    print(f"   {'':<8} {'p50':>10} {'p95':>10} {'peak mem':>10}")
+    for name in ("before", "after"):
+        row = report[name]
+        print(f"   {name:<8} {row['p50_us']:>8.1f}µs {row['p95_us']:>8.1f}µs {row['peak_kb']:>8.1f}KB")
+    print(f"   speedup {report['before']['p50_us'] / report['after']['p50_us']:.2f}x, "
+          f"peak memory {report['after']['peak_kb'] / report['before']['peak_kb']:.0%} of before")
+
+
+def print_report(report: dict):
+    print(f"\n📊 [Benchmark] Finished in {report['wall_seconds']:.2f}s — "
+          f"{report['throughput_jobs_per_minute']:.1f} jobs/min, outcomes {report['outcomes']}")
+    if "warmup_seconds" in report:
+        print(f"   warm-up before the run (not in the timings): {report['warmup_seconds']:.2f}s")
+    rows = [("upload", report["upload"]), ("end_to_end", report["end_to_end"])]
+    rows += [(f"stage:{name}", stats) for name, stats in report["stages"].items()]
+    print(f"   {'':<24} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, stats in rows:
+        print(f"   {name:<24} {stats['count']:>5} {stats['p50']:>7.2f}s {stats['p95']:>7.2f}s "
+              f"{stats['p99']:>7.2f}s {stats['max']:>7.2f}s")
+    for name, value in report["api_errors_and_retries"].items():
+        print(f"   {name} {value:g}")
+    hedging = report.get("hedging")
+    if hedging and (hedging["enabled"] or hedging["stage_timeouts"]):
+        print(f"   hedging: {hedging['hedged']}/{hedging['llm_calls']} LLM calls hedged "
+              f"({hedging['hedge_rate']:.1%}), hedge answered first {hedging['hedge_wins']}x; "
+              f"stage timeouts {hedging['stage_timeouts']}")
+    for agent, models in report.get("model_tiers", {}).items():
+        wins = ", ".join(f"{model} {outcomes.get('accepted', 0) + outcomes.get('exhausted', 0)}"
+                         f"/{sum(outcomes.values())}" for model, outcomes in models.items())
+        print(f"   tiers {agent}: {wins} kept")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Returns regressions: p95 latencies more than `tolerance` slower, or throughput
+    more than `tolerance` lower, than the baseline report.
+    """
+    regressions = []
+    current_rows = {"end_to_end": report["end_to_end"], **{f"stage:{k}": v for k, v in report["stages"].items()}}
+    baseline_rows = {"end_to_end": baseline["end_to_end"], **{f"stage:{k}": v for k, v in baseline["stages"].items()}}
+    for name, stats in current_rows.items():
+        before = baseline_rows.get(name, {}).get("p95")
+        if before and stats["p95"] > before * (1 + tolerance):
+            regressions.append(f"{name} p95 {before:.2f}s → {stats['p95']:.2f}s")
+    before = baseline.get("throughput_jobs_per_minute")
+    if before and report["throughput_jobs_per_minute"] < before * (1 - tolerance):
+        regressions.append(f"throughput {before:.1f} → {report['throughput_jobs_per_minute']:.1f} jobs/min")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline load-and-latency benchmark for the pipeline API")
+    parser.add_argument("--uploads", type=int, default=20, help="Number of uploads (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (default: 10)")
+    parser.add_argument("--size-kb", type=int, default=256, help="Size of each synthetic upload (default: 256)")
+    parser.add_argument("--mode", default=None, help="Pipeline mode (default: PIPELINE_MODE env or auto)")
+    parser.add_argument("--chat-profile", default=DEFAULT_CHAT_PROFILE, help=f"Chat latency/faults (default: {DEFAULT_CHAT_PROFILE})")
+    parser.add_argument("--whisper-profile", default=DEFAULT_WHISPER_PROFILE, help=f"Whisper latency/faults (default: {DEFAULT_WHISPER_PROFILE})")
+    parser.add_argument("--notion-profile", default=DEFAULT_NOTION_PROFILE, help=f"Notion latency/faults (default: {DEFAULT_NOTION_PROFILE})")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-job timeout in seconds (default: 300)")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Status polling interval in seconds")
+    parser.add_argument("--hedge", action="store_true", help="Enable hedged LLM requests (LLM_HEDGE_*)")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-run deadline in seconds (PIPELINE_DEADLINE_SECONDS)")
+    parser.add_argument("--model-tiers", default=None, help="LLM_MODEL_TIERS for every agent (e.g. 'gpt-4o' for a single tier)")
+    parser.add_argument("--fast-failure-rate", type=float, default=0.1,
+                        help="Share of fast-tier mock answers that fail the checks (default: 0.1)")
+    parser.add_argument("--serialization", action="store_true",
+                        help="Only benchmark per-job result serialization (before vs. after typed results)")
+    parser.add_argument("--todos", type=int, default=20, help="Todos per result in --serialization (default: 20)")
+    parser.add_argument("--iterations", type=int, default=2000, help="Jobs timed in --serialization (default: 2000)")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs while the benchmark runs")
+    parser.add_argument("--save", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Compare against a saved report and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression ratio vs. baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.serialization:
+        report = run_serialization_benchmark(args.todos, args.iterations)
+        print_serialization_report(report)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        return
+
+    report = run_benchmark(args)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 [Benchmark] Report saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ [Benchmark] Regressions vs. baseline:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print("✅ [Benchmark] No regressions vs. baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import ValidationError
+
+from agents.structure import MeetingResult
+from storage import connect, dumps, state_path
+
+# Stage outputs persisted per task, in pipeline order. A resumed run starts at the
+# first stage missing from this list ("publish" once everything is checkpointed).
+CHECKPOINT_STAGES = ("transcript", "analysis", "summary", "extracted_data", "structured_data")
+# Checkpoints stored as JSON that are rebuilt into their model on restore
+CHECKPOINT_MODELS = {"structured_data": MeetingResult}
+
+
+def restore_checkpoints(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turns stored checkpoint payloads back into stage outputs. Payloads that are None or no
+    longer validate are dropped, so their stage runs again instead of counting as done.
+    """
+    restored = {}
+    for stage, value in raw.items():
+        if stage not in CHECKPOINT_STAGES or value is None:
+            continue
+        if stage in CHECKPOINT_MODELS:
+            try:
+                value = CHECKPOINT_MODELS[stage].model_validate(value)
+            except ValidationError as e:
+                print(f"⚠️ [Checkpoints] Ignoring invalid '{stage}' checkpoint: {e}")
+                continue
+        restored[stage] = value
+    return restored
+
+
+class CheckpointStore:
+    """
+    SQLite (WAL) store of stage outputs keyed by (task_id, stage), plus audio files kept
+    for tasks that failed before their transcript was checkpointed.
+    Entries older than `ttl_seconds` (CHECKPOINT_TTL_SECONDS) are pruned.
+    """
+
+    def __init__(self, path: Optional[str] = None, audio_dir: Optional[str] = None,
+                 ttl_seconds: Optional[float] = None, prune_interval: float = 300.0):
+        self.path = path or os.getenv("CHECKPOINT_PATH") or state_path("checkpoints.sqlite3")
+        self.audio_dir = audio_dir or state_path("retained_audio")
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400"))
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " task_id TEXT NOT NULL, stage TEXT NOT NULL, data TEXT NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (task_id, stage))"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints(created_at)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def save(self, task_id: str, stage: str, value: Any):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO checkpoints (task_id, stage, data, created_at) VALUES (?, ?, ?, ?)",
+            (task_id, stage, dumps(value), time.time())
+        )
+        self._maybe_prune()
+
+    def load(self, task_id: str) -> Dict[str, Any]:
+        rows = self._conn().execute("SELECT stage, data FROM checkpoints WHERE task_id = ?", (task_id,)).fetchall()
+        return {row["stage"]: json.loads(row["data"]) for row in rows}
+
+    def delete(self, task_id: str):
+        self._conn().execute("DELETE FROM checkpoints WHERE task_id = ?", (task_id,))
+        for name in os.listdir(self.audio_dir):
+            if name.startswith(task_id):
+                os.remove(os.path.join(self.audio_dir, name))
+
+    def retain_audio(self, task_id: str, file_path: str) -> str:
+        """
+        Moves an upload out of the temp directory so a retry can re-transcribe it.
+        Returns the new path.
+        """
+        target = os.path.join(self.audio_dir, f"{task_id}{os.path.splitext(file_path)[1]}")
+        if os.path.abspath(file_path) != os.path.abspath(target):
+            shutil.move(file_path, target)
+        return target
+
+    def prune(self) -> int:
+        """
+        Deletes checkpoints and retained audio older than the TTL. Returns the number of tasks removed.
+        """
+        cutoff = time.time() - self.ttl_seconds
+        conn = self._conn()
+        expired = {row["task_id"] for row in conn.execute(
+            "SELECT DISTINCT task_id FROM checkpoints WHERE created_at < ?", (cutoff,))}
+        conn.execute("DELETE FROM checkpoints WHERE task_id IN (SELECT task_id FROM checkpoints WHERE created_at < ?)",
+                     (cutoff,))
+        for name in os.listdir(self.audio_dir):
+            path = os.path.join(self.audio_dir, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                expired.add(os.path.splitext(name)[0])
+        return len(expired)
+
+    def _maybe_prune(self):
+        now = time.monotonic()
+        if now - self._last_prune >= self.prune_interval:
+            self._last_prune = now
+            removed = self.prune()
+            if removed:
+                print(f"🧹 [Checkpoints] Pruned checkpoints of {removed} tasks.")
+
+
+class TaskCheckpoints:
+    """
+    One task's view of a CheckpointStore, passed to `PipelineOrchestrator.arun`.
+    `on_save(stage)` runs after each checkpoint is written. Methods block on SQLite;
+    the pipeline calls them from worker threads.
+    """
+
+    def __init__(self, store: CheckpointStore, task_id: str, on_save: Optional[Callable[[str], None]] = None):
+        self.store = store
+        self.task_id = task_id
+        self.on_save = on_save
+        self.saved = set()
+
+    def load(self) -> Dict[str, Any]:
+        restored = restore_checkpoints(self.store.load(self.task_id))
+        self.saved.update(restored)
+        return restored
+
+    def save(self, stage: str, value: Any):
+        self.store.save(self.task_id, stage, value)
+        self.saved.add(stage)
+        if self.on_save is not None:
+            self.on_save(stage)
+
+    def clear(self):
+        self.store.delete(self.task_id)
+        self.saved.clear()
+
+
+def resume_stage(checkpointed: Dict[str, Any]) -> str:
+    """
+    The first stage a resumed run has to execute.
+    """
+    for stage in CHECKPOINT_STAGES:
+        if stage not in checkpointed:
+            return stage
+    return "publish"
@@ -0,0 +1,69 @@
+import os
+import time
+from typing import Dict, Optional
+
+# Largest share of the run deadline each stage may use. Shares along a path may add up
+# to more than 1: a stage gets min(share * deadline, time left), so a fast transcription
+# leaves more room for the LLM stages. Stages without a share only get the time left.
+DEFAULT_STAGE_BUDGETS = {
+    "audio": 0.15,
+    "transcript": 0.5,
+    "chunk_results": 0.45,
+    "combined": 0.45,
+    "analysis": 0.3,
+    "summary": 0.3,
+    "extracted_data": 0.3,
+    "publish": 0.2,
+}
+
+
+def parse_budgets(spec: str) -> Dict[str, float]:
+    """
+    Parses "transcript=0.4,analysis=0.25" into {stage: share}.
+    """
+    budgets = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, share = part.partition("=")
+        try:
+            budgets[name.strip()] = float(share)
+        except ValueError:
+            raise ValueError(f"Invalid stage budget '{part.strip()}' (expected stage=fraction)")
+    return budgets
+
+
+class Deadline:
+    """
+    End-to-end deadline for one pipeline run, split into per-stage budgets.
+    """
+
+    def __init__(self, seconds: float, budgets: Optional[Dict[str, float]] = None):
+        self.seconds = seconds
+        self.budgets = dict(DEFAULT_STAGE_BUDGETS if budgets is None else budgets)
+        self.expires = time.monotonic() + seconds
+
+    @classmethod
+    def from_env(cls, seconds: Optional[float] = None) -> Optional["Deadline"]:
+        """
+        Uses `seconds`, else PIPELINE_DEADLINE_SECONDS (0 disables the deadline).
+        PIPELINE_STAGE_BUDGETS overrides individual stage shares.
+        """
+        if seconds is None:
+            seconds = float(os.getenv("PIPELINE_DEADLINE_SECONDS", "0"))
+        if not seconds or seconds <= 0:
+            return None
+        budgets = dict(DEFAULT_STAGE_BUDGETS)
+        budgets.update(parse_budgets(os.getenv("PIPELINE_STAGE_BUDGETS", "")))
+        return cls(seconds, budgets)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    def budget(self, stage: str) -> float:
+        """
+        Seconds the stage may run for if it starts now.
+        """
+        remaining = self.remaining()
+        share = self.budgets.get(stage)
+        return remaining if share is None else min(share * self.seconds, remaining)
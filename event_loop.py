@@ -0,0 +1,42 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class BackgroundLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+    Lets sync code (CLI, worker threads) drive coroutines on one shared loop,
+    so async clients and their connection pools are never used across loops.
+    """
+
+    def __init__(self, name: str = "pipeline-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked child inherits the loop object but not its thread
+            if self._loop is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+                thread.start()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedules a coroutine on the loop and returns a concurrent.futures.Future.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Runs a coroutine on the loop and blocks the calling thread until it finishes.
+        """
+        return self.submit(coro).result(timeout)
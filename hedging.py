@@ -0,0 +1,108 @@
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+# Hedged requests ("The Tail at Scale"): when a call is still running after the
+# p95 (by default) of recent latencies, a duplicate is sent and whichever
+# answer arrives first is used. Costs at most ~(100 - percentile)% extra calls.
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
+
+
+class HedgePolicy:
+    """
+    Tracks recent request latencies per key (agent) and decides how long to wait
+    before hedging. Hedging is skipped until `min_samples` latencies are known
+    (unless `initial_delay` is set) and while the hedge rate is above `max_rate`.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, percentile: Optional[float] = None,
+                 min_samples: Optional[int] = None, min_delay: Optional[float] = None,
+                 initial_delay: Optional[float] = None, max_rate: Optional[float] = None, window: int = 200):
+        self.enabled = _env_flag("LLM_HEDGE_ENABLED") if enabled is None else enabled
+        self.percentile = percentile if percentile is not None else float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+        self.min_samples = min_samples if min_samples is not None else int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        self.min_delay = min_delay if min_delay is not None else float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+        self.initial_delay = initial_delay if initial_delay is not None else float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "0"))
+        self.max_rate = max_rate if max_rate is not None else float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1"))
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._calls: Deque[bool] = deque(maxlen=window)  # whether each recent call was hedged
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float):
+        """
+        Records the latency of one completed request.
+        """
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        """
+        Seconds to wait before sending a hedge, or None to not hedge this call.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._calls and sum(self._calls) / len(self._calls) >= self.max_rate:
+                return None
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay or None
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    def record_call(self, hedged: bool):
+        with self._lock:
+            self._calls.append(hedged)
+
+
+async def hedged(call: Callable[[], Awaitable[Any]], delay: Optional[float]) -> Tuple[Any, Optional[str]]:
+    """
+    Awaits `call()`; if it has not finished after `delay` seconds, starts a second `call()`
+    and returns the first successful result as (result, winner): winner is None when no
+    hedge was sent, else "primary" or "hedge". The slower request is cancelled.
+    Raises the last error if both fail.
+    """
+    primary = asyncio.ensure_future(call())
+    if delay is None:
+        return await primary, None
+
+    tasks = {primary: "primary"}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        hedge_sent = not done
+        if hedge_sent:
+            tasks[asyncio.ensure_future(call())] = "hedge"
+        error: Optional[BaseException] = None
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks.pop(task)
+                if task.exception() is None:
+                    return task.result(), name if hedge_sent else None
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+_policy: Optional[HedgePolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_policy() -> HedgePolicy:
+    """
+    Process-wide policy, built on first use so LLM_HEDGE_* from .env are picked up.
+    """
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = HedgePolicy()
+    return _policy
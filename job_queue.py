@@ -0,0 +1,165 @@
+import itertools
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+# Client-supplied priorities are clamped to this range. The default (0) is also the most
+# urgent, so a client can defer its own jobs but never move them ahead of everyone else's.
+MIN_PRIORITY, MAX_PRIORITY = 0, 9
+
+
+def clamp_priority(priority: int) -> int:
+    return min(max(int(priority), MIN_PRIORITY), MAX_PRIORITY)
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full. Retry after {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    """
+    Bounded priority queue of pipeline jobs drained by a fixed number of workers.
+    Lower `priority` values (clamped to MIN_PRIORITY..MAX_PRIORITY) run first;
+    jobs with equal priority run in submission order.
+
+    Backends:
+    - "async": `handler` is a coroutine function; up to `workers` jobs run concurrently
+      on `loop` (a BackgroundLoop) without holding a thread each.
+    - "thread": each worker thread runs one job at a time.
+    - "process": each worker thread hands its job to a process pool so CPU-bound
+      work does not contend on the GIL (the handler must be picklable).
+    """
+
+    def __init__(self, handler: Callable[..., Any], workers: Optional[int] = None,
+                 maxsize: Optional[int] = None, backend: Optional[str] = None, loop=None):
+        self.handler = handler
+        self.backend = (backend or os.getenv("JOB_BACKEND", "async")).strip().lower()
+        if self.backend not in ("async", "thread", "process"):
+            raise ValueError(f"Unknown JOB_BACKEND: {self.backend}")
+        if self.backend == "async" and loop is None:
+            raise ValueError("The async job backend needs an event loop")
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "16" if self.backend == "async" else "2"))
+        self.maxsize = maxsize or int(os.getenv("JOB_QUEUE_SIZE", "20"))
+        self.loop = loop
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._processed = 0
+        self._waits = deque(maxlen=200)      # recent queue wait times (seconds)
+        self._durations = deque(maxlen=200)  # recent job run times (seconds)
+        # Spawned, not forked: a fork would copy locks held by the parent's other threads
+        # (e.g. the pipeline warm-up) and the child could block on them forever
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) \
+            if self.backend == "process" else None
+        self._threads = []
+        if self.backend == "async":
+            self._slots = threading.Semaphore(self.workers)
+            targets = [self._dispatcher]
+        else:
+            targets = [self._worker] * self.workers
+        for i, target in enumerate(targets):
+            thread = threading.Thread(target=target, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job_id: str, *args: Any, priority: int = 0):
+        """
+        Enqueues a job. Raises QueueFullError when `maxsize` jobs are already waiting.
+        """
+        priority = clamp_priority(priority)
+        with self._lock:
+            if self._queue.qsize() >= self.maxsize:
+                raise QueueFullError(self.retry_after())
+            self._queue.put((priority, next(self._seq), time.monotonic(), job_id, args))
+
+    def is_full(self) -> bool:
+        return self._queue.qsize() >= self.maxsize
+
+    def retry_after(self) -> int:
+        """
+        Rough number of seconds until a queue slot frees up (one worker finishing a job).
+        """
+        avg_duration = (sum(self._durations) / len(self._durations)) if self._durations else 30.0
+        return max(1, math.ceil(avg_duration / self.workers))
+
+    def _start_job(self, enqueued_at: float) -> float:
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self._waits.append(started - enqueued_at)
+        return started
+
+    def _finish_job(self, job_id: str, started: float, error: Optional[BaseException]):
+        if error is not None:
+            print(f"❌ [Job Queue] Job {job_id} crashed: {error}")
+        with self._lock:
+            self._running -= 1
+            self._processed += 1
+            self._durations.append(time.monotonic() - started)
+        self._queue.task_done()
+
+    def _worker(self):
+        while True:
+            priority, _, enqueued_at, job_id, args = self._queue.get()
+            started = self._start_job(enqueued_at)
+            error = None
+            try:
+                if self._pool is not None:
+                    self._pool.submit(self.handler, job_id, *args).result()
+                else:
+                    self.handler(job_id, *args)
+            except Exception as e:
+                error = e
+            finally:
+                self._finish_job(job_id, started, error)
+
+    def _dispatcher(self):
+        # Single thread that starts jobs on the event loop whenever a slot is free.
+        # The slot is taken before dequeuing, so a waiting job stays in the queue (and in its depth).
+        while True:
+            self._slots.acquire()
+            priority, _, enqueued_at, job_id, args = self._queue.get()
+            started = self._start_job(enqueued_at)
+
+            def _done(future, job_id=job_id, started=started):
+                self._slots.release()
+                self._finish_job(job_id, started, future.exception())
+
+            self.loop.submit(self.handler(job_id, *args)).add_done_callback(_done)
+
+    def shutdown(self):
+        """
+        Stops the process pool (if any), cancelling jobs that have not started. Call on app shutdown.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            durations = list(self._durations)
+            return {
+                "backend": self.backend,
+                "workers": self.workers,
+                "running": self._running,
+                "depth": self._queue.qsize(),
+                "maxsize": self.maxsize,
+                "processed": self._processed,
+                "wait_seconds": {
+                    "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                    "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3) if waits else 0.0,
+                    "max": round(waits[-1], 3) if waits else 0.0,
+                },
+                "avg_job_seconds": round(sum(durations) / len(durations), 3) if durations else 0.0,
+            }
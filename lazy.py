@@ -0,0 +1,35 @@
+import threading
+import time
+
+from metrics import COMPONENT_INIT_SECONDS
+
+
+class lazy_property:
+    """
+    Like functools.cached_property, but concurrent first accesses build the value
+    only once (guarded by a per-instance lock), and the build time is recorded
+    in stt_component_init_seconds{component="<Class>.<name>"}.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        if self.name in cache:
+            return cache[self.name]
+        lock = cache.setdefault("_lazy_property_lock", threading.RLock())
+        with lock:
+            if self.name not in cache:
+                started = time.perf_counter()
+                cache[self.name] = self.func(instance)
+                COMPONENT_INIT_SECONDS.observe(time.perf_counter() - started,
+                                               component=f"{type(instance).__name__}.{self.name}")
+        return cache[self.name]
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agents.chunking import estimate_tokens
+from agents.structure import MeetingResult
+from metrics import PIPELINE_RUNS, PIPELINE_SECONDS
+
+# Whisper API rejects uploads above 25 MB
+LIVE_MAX_SEGMENT_BYTES = int(os.getenv("LIVE_MAX_SEGMENT_BYTES", str(25 * 1024 * 1024)))
+
+
+class LiveSession:
+    """
+    Incremental pipeline for a meeting that is still running.
+
+    Audio arrives as self-contained segments (e.g. a MediaRecorder restarted every 30s).
+    Each segment is transcribed and compacted as soon as it arrives; once enough new text
+    has accumulated (`window_tokens`), the window is analysed and its todos extracted in
+    the background, and the rolling analysis / todo list is merged and pushed to `on_event`.
+    `finalize` then only has to process the last window before summarizing and publishing.
+
+    All coroutines must run on the orchestrator's event loop.
+    """
+
+    def __init__(self, orchestrator, session_id: str, extension: str = ".webm",
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 window_tokens: Optional[int] = None, temp_dir: Optional[str] = None):
+        self.orchestrator = orchestrator
+        self.session_id = session_id
+        self.extension = extension if extension.startswith(".") else f".{extension}"
+        self.on_event = on_event or (lambda event: None)
+        self.window_tokens = window_tokens or int(os.getenv("LIVE_WINDOW_TOKENS", "1500"))
+        self.temp_dir = temp_dir or tempfile.gettempdir()
+
+        self.segments: List[str] = []                # compacted text per segment, in arrival order
+        self.analysis = ""                          # rolling analysis across finished windows
+        self.extracted: Dict[str, Any] = {}         # rolling merged todos / metadata
+        self._pending: List[str] = []               # text not yet assigned to a window
+        self._windows: List[asyncio.Task] = []      # one (analysis, partial) task per window
+        self._partials: Dict[int, dict] = {}
+        self._merge_lock = asyncio.Lock()
+        self._previous: Optional[asyncio.Future] = None  # keeps segments appended in order
+        self._next_index = 0
+        self.started = time.perf_counter()
+
+    def _emit(self, event_type: str, **payload: Any):
+        try:
+            self.on_event({"type": event_type, **payload})
+        except Exception as e:
+            print(f"⚠️ [Live Session] Could not deliver '{event_type}' event: {e}")
+
+    async def add_segment(self, audio: bytes):
+        """
+        Transcribes one audio segment. Segments are transcribed concurrently but
+        appended to the transcript in the order they were received.
+        """
+        index = self._next_index
+        self._next_index += 1
+        previous = self._previous
+        appended = asyncio.get_running_loop().create_future()
+        self._previous = appended
+
+        text = None
+        try:
+            if len(audio) > LIVE_MAX_SEGMENT_BYTES:
+                raise ValueError(f"Segment {index} exceeds {LIVE_MAX_SEGMENT_BYTES} bytes")
+            path = os.path.join(self.temp_dir, f"live_{self.session_id}_{index:05d}{self.extension}")
+            await asyncio.to_thread(_write_file, path, audio)
+            try:
+                text = await self.orchestrator.speech_agent.aprocess(path)
+            finally:
+                await asyncio.to_thread(_remove_file, path)
+            text = self.orchestrator.compact(text)
+        except Exception as e:
+            print(f"❌ [Live Session] Segment {index} failed: {e}")
+            self._emit("error", segment=index, error=str(e))
+
+        try:
+            if previous is not None:
+                await previous
+            if text:
+                self.segments.append(text)
+                self._pending.append(text)
+                self._emit("transcript", segment=index, text=text)
+                if estimate_tokens("\n".join(self._pending)) >= self.window_tokens:
+                    self._start_window()
+        finally:
+            appended.set_result(None)
+
+    def _start_window(self):
+        text = "\n".join(self._pending)
+        self._pending = []
+        index = len(self._windows)
+        print(f"🪟 [Live Session] Analyzing window {index} (~{estimate_tokens(text)} tokens)...")
+        self._windows.append(asyncio.ensure_future(self._analyze_window(index, text)))
+
+    async def _analyze_window(self, index: int, text: str) -> Tuple[str, dict]:
+        analysis = await self.orchestrator.analysis_agent.aprocess(text)
+        partial = await self.orchestrator.task_agent.aprocess(text, analysis)
+        async with self._merge_lock:
+            self._partials[index] = partial
+            self.analysis = await self.orchestrator.analysis_agent.amerge([self.analysis, analysis]) if self.analysis else analysis
+            self.extracted = self.orchestrator.task_agent.merge([self._partials[i] for i in sorted(self._partials)])
+        self._emit("update", window=index, analysis=self.analysis, extracted_data=self.extracted)
+        return analysis, partial
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "segments": len(self.segments),
+            "windows": len(self._windows),
+            "analysis": self.analysis,
+            "extracted_data": self.extracted,
+        }
+
+    async def finalize(self) -> Optional[MeetingResult]:
+        """
+        Processes the final delta, then summarizes, structures and publishes the meeting.
+        Returns the published MeetingResult, or None if there was nothing usable.
+        """
+        ended = time.perf_counter()
+        status = "error"
+        try:
+            if self._previous is not None:
+                await self._previous
+            if self._pending:
+                self._start_window()
+            if not self._windows:
+                print("❌ [Live Session] No transcript was produced.")
+                status = "failed"
+                return None
+
+            windows = await asyncio.gather(*self._windows, return_exceptions=True)
+            section_analyses = [w[0] for w in windows if not isinstance(w, BaseException)]
+            if not section_analyses:
+                raise RuntimeError(f"Every analysis window failed: {windows[0]}")
+
+            summary = await self.orchestrator.summary_agent.aprocess_sections(section_analyses, self.analysis)
+            structured_data = self.orchestrator.structuring_agent.process(summary, self.extracted)
+            output = await self.orchestrator.apublish(structured_data, f"live:{self.session_id}")
+            status = "completed" if output is not None else "failed"
+            print(f"🏁 [Live Session] Finalized {len(self.segments)} segments / {len(self._windows)} windows "
+                  f"{time.perf_counter() - ended:.2f}s after the meeting ended.")
+            return output
+        finally:
+            PIPELINE_RUNS.inc(mode="live", status=status)
+            PIPELINE_SECONDS.observe(time.perf_counter() - self.started, mode="live", status=status)
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
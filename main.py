@@ -1,11 +1,26 @@
 import argparse
+import os
 import sys
-from pipeline import PipelineOrchestrator
+import tempfile
+from pipeline import PipelineOrchestrator, PIPELINE_MODES
+from batch import BatchRunner, collect_files
+from meeting_store import MeetingStore
+
+def print_result(orchestrator: PipelineOrchestrator, result):
+    if result is not None:
+        print("\n📤 [System] Final Output:")
+        print(orchestrator.integration_agent.export(result))
 
 def main():
     parser = argparse.ArgumentParser(description="AI Meeting Assistant Pipeline")
     parser.add_argument("file", nargs="?", help="Path to the audio file")
     parser.add_argument("--mock", action="store_true", help="Run with mock data for testing")
+    parser.add_argument("--mode", choices=PIPELINE_MODES, default=None, help="Pipeline mode (default: PIPELINE_MODE env or auto)")
+    parser.add_argument("--batch", metavar="DIR_OR_GLOB", help="Process every audio file in a directory or matching a glob")
+    parser.add_argument("--jobs", type=int, default=4, help="Files processed in parallel in batch mode (default: 4)")
+    parser.add_argument("--output", default="results.jsonl", help="Batch mode JSONL output file (default: results.jsonl)")
+    parser.add_argument("--checkpoint", default=None, help="Batch mode checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--retry-failed", action="store_true", help="Batch mode: re-run files that failed in an earlier run")
     
     args = parser.parse_args()
 
@@ -13,23 +28,29 @@ def main():
 
     if args.mock:
         # Mock transcript for demonstration
-        mock_text = """
-        John: Okay everyone, let's start. We need to fix the login bug on the staging server.
-        Sarah: I can handle that. I'll have it done by tomorrow.
-        John: Great. Also, Mike, we need the quarterly report finalized.
-        Mike: Sure, I'll send the draft by Friday.
-        John: And we need to schedule a meeting with the client next week.
-        Sarah: I'll check their availability and send out an invite.
-        John: Perfect. Meeting adjourned.
-        """
-        orchestrator.run(audio_file_path="mock_audio.mp3", mock_transcript=mock_text)
+        from mocks import MOCK_TRANSCRIPT
+        # Mock meetings go to a throwaway store, not the persistent one the API queries
+        with tempfile.TemporaryDirectory() as tmp:
+            orchestrator.meeting_store = MeetingStore(os.path.join(tmp, "meetings.sqlite3"))
+            print_result(orchestrator, orchestrator.run(audio_file_path="mock_audio.mp3", mock_transcript=MOCK_TRANSCRIPT,
+                                                        mode=args.mode))
         return
 
+    if args.batch:
+        files = collect_files(args.batch)
+        if not files:
+            print(f"No audio files found for: {args.batch}")
+            sys.exit(1)
+        runner = BatchRunner(orchestrator, args.output, args.checkpoint, jobs=args.jobs, mode=args.mode,
+                             retry_failed=args.retry_failed)
+        summary = runner.run(files)
+        sys.exit(1 if summary["failed"] or summary["failed_skipped"] else 0)
+
     if not args.file:
-        print("Usage: python main.py <audio_file> or python main.py --mock")
+        print("Usage: python main.py <audio_file>, python main.py --batch <dir_or_glob> or python main.py --mock")
         sys.exit(1)
 
-    orchestrator.run(args.file)
+    print_result(orchestrator, orchestrator.run(args.file, mode=args.mode))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from agents.structure import MeetingResult, as_meeting_result
+from storage import connect, state_path
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Words (Hangul, Latin, digits) kept from a free-text search query
+QUERY_TERM_RE = re.compile(r"[\w가-힣]+")
+
+
+def _owner_key(owner: Optional[str]) -> Optional[str]:
+    owner = re.sub(r"\s+", " ", str(owner or "")).strip().lower()
+    return owner or None
+
+
+def _date(value: Optional[str]) -> Optional[str]:
+    return value if value and DATE_RE.match(str(value)) else None
+
+
+def meeting_key(result: MeetingResult, source: Optional[str] = None) -> str:
+    """
+    Identity of a stored meeting: its `source` (what the meeting was produced from, e.g. the
+    audio file's hash or a live session ID), so reprocessing the same recording replaces the
+    earlier save even when the generated title, date or summary changed.
+    Without a source, the title, date and summary stand in for it.
+    """
+    if source is not None:
+        payload = json.dumps(["source", source])
+    else:
+        info = result.meeting_info
+        payload = json.dumps([info.title, info.date, result.summary], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    Turns user input into an FTS5 query: every word must match, as a prefix
+    ("버그" matches "버그를"), with FTS syntax characters stripped.
+    """
+    terms = QUERY_TERM_RE.findall(text or "")
+    return " ".join(f'"{term}"*' for term in terms) if terms else None
+
+
+class MeetingStore:
+    """
+    Local SQLite (WAL) store of every published MeetingResult, so meetings and todos can be
+    queried without going through Notion. Todos are indexed by owner, due date and meeting date;
+    summaries, titles and todos are searchable through an FTS5 table (LIKE fallback when the
+    SQLite build has no FTS5).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MEETING_STORE_PATH") or state_path("meetings.sqlite3")
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS meetings ("
+            " id INTEGER PRIMARY KEY, meeting_key TEXT NOT NULL UNIQUE, title TEXT, meeting_date TEXT,"
+            " participants TEXT NOT NULL, summary TEXT NOT NULL, created_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS todos ("
+            " id INTEGER PRIMARY KEY, meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,"
+            " position INTEGER NOT NULL, action TEXT NOT NULL, description TEXT, owner TEXT, owner_key TEXT,"
+            " due TEXT, meeting_date TEXT);"
+            "CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(meeting_date);"
+            "CREATE INDEX IF NOT EXISTS idx_todos_owner_due ON todos(owner_key, due);"
+            "CREATE INDEX IF NOT EXISTS idx_todos_due ON todos(due);"
+            "CREATE INDEX IF NOT EXISTS idx_todos_meeting_date ON todos(meeting_date);"
+            "CREATE INDEX IF NOT EXISTS idx_todos_meeting ON todos(meeting_id, position);"
+        )
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+                " kind UNINDEXED, ref_id UNINDEXED, meeting_id UNINDEXED, title, body, owner,"
+                " tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            self.fts = True
+        except sqlite3.OperationalError:
+            print("⚠️ [Meeting Store] SQLite was built without FTS5. Falling back to LIKE search.")
+            self.fts = False
+
+    def _conn(self):
+        # One connection per thread, as in SQLiteTaskStore
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+            conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    # --- Writes ---
+
+    def save(self, result: Union[MeetingResult, dict], source: Optional[str] = None) -> int:
+        """
+        Stores a MeetingResult, replacing an earlier save with the same key (see `meeting_key`).
+        Returns the meeting ID.
+        """
+        result = as_meeting_result(result)
+        info = result.meeting_info
+        key = meeting_key(result, source)
+        meeting_date = _date(info.date)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT id FROM meetings WHERE meeting_key = ?", (key,)).fetchone()
+            if old is not None:
+                self._delete(conn, old["id"])
+            cursor = conn.execute(
+                "INSERT INTO meetings (meeting_key, title, meeting_date, participants, summary, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, info.title, meeting_date, json.dumps(info.participants, ensure_ascii=False), result.summary,
+                 time.time())
+            )
+            meeting_id = cursor.lastrowid
+            if self.fts:
+                conn.execute("INSERT INTO search_fts (kind, ref_id, meeting_id, title, body, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                             ("meeting", meeting_id, meeting_id, info.title or "", result.summary,
+                              " ".join(info.participants)))
+            for position, todo in enumerate(result.todos):
+                cursor = conn.execute(
+                    "INSERT INTO todos (meeting_id, position, action, description, owner, owner_key, due, meeting_date)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (meeting_id, position, todo.action, todo.description, todo.owner,
+                     _owner_key(todo.owner), _date(todo.due), meeting_date)
+                )
+                if self.fts:
+                    conn.execute("INSERT INTO search_fts (kind, ref_id, meeting_id, title, body, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                                 ("todo", cursor.lastrowid, meeting_id, todo.action,
+                                  todo.description or "", todo.owner or ""))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return meeting_id
+
+    def _delete(self, conn, meeting_id: int):
+        if self.fts:
+            conn.execute("DELETE FROM search_fts WHERE meeting_id = ?", (meeting_id,))
+        conn.execute("DELETE FROM todos WHERE meeting_id = ?", (meeting_id,))
+        conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    # --- Queries ---
+
+    @staticmethod
+    def _meeting(row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "date": row["meeting_date"],
+            "participants": json.loads(row["participants"]),
+            "summary": row["summary"],
+        }
+
+    @staticmethod
+    def _todo(row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "meeting_id": row["meeting_id"],
+            "meeting_title": row["title"],
+            "meeting_date": row["meeting_date"],
+            "action": row["action"],
+            "description": row["description"],
+            "owner": row["owner"],
+            "due": row["due"],
+        }
+
+    def todos(self, owner: Optional[str] = None, due_from: Optional[str] = None, due_to: Optional[str] = None,
+              meeting_from: Optional[str] = None, meeting_to: Optional[str] = None,
+              meeting_id: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Todos filtered by owner (case-insensitive), due date and meeting date ranges (inclusive,
+        YYYY-MM-DD). Ordered by due date (undated last), then meeting date.
+        """
+        clauses, params = [], []
+        if owner:
+            clauses.append("t.owner_key = ?")
+            params.append(_owner_key(owner))
+        for column, op, value in (("t.due", ">=", due_from), ("t.due", "<=", due_to),
+                                  ("t.meeting_date", ">=", meeting_from), ("t.meeting_date", "<=", meeting_to)):
+            if value:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        if meeting_id is not None:
+            clauses.append("t.meeting_id = ?")
+            params.append(meeting_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            "SELECT t.*, m.title FROM todos t JOIN meetings m ON m.id = t.meeting_id "
+            f"{where} ORDER BY t.due IS NULL, t.due, t.meeting_date DESC, t.meeting_id, t.position LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [self._todo(row) for row in rows]
+
+    def meetings(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                 limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Meetings in a date range (inclusive), most recent first.
+        """
+        clauses, params = [], []
+        if date_from:
+            clauses.append("meeting_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("meeting_date <= ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT * FROM meetings {where} ORDER BY meeting_date DESC, created_at DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [self._meeting(row) for row in rows]
+
+    def meeting(self, meeting_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        if row is None:
+            return None
+        return {**self._meeting(row), "todos": self.todos(meeting_id=meeting_id, limit=1000)}
+
+    def search(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over meeting titles, summaries and todos, best match first.
+        Each hit is {"kind": "meeting" | "todo", "meeting_id", "id", "title", "snippet"}.
+        """
+        query = fts_query(text)
+        if query is None:
+            return []
+        conn = self._conn()
+        if self.fts:
+            rows = conn.execute(
+                "SELECT kind, ref_id, meeting_id, title, snippet(search_fts, 4, '[', ']', '…', 12) AS snippet"
+                " FROM search_fts WHERE search_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit)
+            ).fetchall()
+            return [{"kind": row["kind"], "id": row["ref_id"], "meeting_id": row["meeting_id"],
+                     "title": row["title"], "snippet": row["snippet"]} for row in rows]
+
+        # Without FTS5: every word as a substring of the title / summary / todo text
+        terms = QUERY_TERM_RE.findall(text)
+        meeting_where = " AND ".join("(title || ' ' || summary) LIKE ?" for _ in terms)
+        todo_where = " AND ".join("(action || ' ' || COALESCE(description, '') || ' ' || COALESCE(owner, '')) LIKE ?"
+                                  for _ in terms)
+        likes = [f"%{term}%" for term in terms]
+        rows = conn.execute(
+            f"SELECT 'meeting' AS kind, id, id AS meeting_id, title, summary AS snippet FROM meetings WHERE {meeting_where}"
+            f" UNION ALL SELECT 'todo', id, meeting_id, action, description FROM todos WHERE {todo_where} LIMIT ?",
+            (*likes, *likes, limit)
+        ).fetchall()
+        return [{"kind": row["kind"], "id": row["id"], "meeting_id": row["meeting_id"],
+                 "title": row["title"], "snippet": row["snippet"]} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        return {
+            "meetings": conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0],
+            "todos": conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0],
+            "fts": self.fts,
+        }
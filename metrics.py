@@ -0,0 +1,272 @@
+import asyncio
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Minimal in-process metrics with Prometheus text exposition (no client library needed).
+# Values are per process; with several uvicorn workers each one reports its own.
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> Dict[Tuple[str, ...], float]:
+        """
+        Snapshot of {label values: value}.
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def total(self, **labels: str) -> float:
+        """
+        Sum over every label combination matching the given (partial) labels.
+        """
+        positions = [(self.labelnames.index(name), str(value)) for name, value in labels.items()]
+        with self._lock:
+            return sum(value for key, value in self._values.items() if all(key[i] == v for i, v in positions))
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Gauge read at scrape time from `callback`, which returns {label values tuple: value}.
+    """
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Callable[[], Dict[Tuple[str, ...], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        if self.callback is None:
+            return []
+        try:
+            values = self.callback()
+        except Exception:
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              callback: Callable[[], Dict[Tuple[str, ...], float]] = None) -> Gauge:
+        with self._lock:
+            existing = self._metrics.get(name)
+        if isinstance(existing, Gauge):
+            # Re-registering a scrape-time gauge (e.g. on app reload) just swaps the callback
+            existing.callback = callback
+            return existing
+        return self.register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = Registry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --- Pipeline metrics ---
+STAGE_SECONDS = registry.histogram(
+    "stt_pipeline_stage_duration_seconds", "Wall time of each pipeline stage.", ("stage",))
+PIPELINE_SECONDS = registry.histogram(
+    "stt_pipeline_duration_seconds", "End-to-end pipeline run time.", ("mode", "status"))
+PIPELINE_RUNS = registry.counter(
+    "stt_pipeline_runs_total", "Pipeline runs by mode and outcome.", ("mode", "status"))
+STAGE_TIMEOUTS = registry.counter(
+    "stt_pipeline_stage_timeouts_total", "Stages cancelled for exceeding their deadline budget.", ("stage",))
+TRANSCRIPT_TOKENS = registry.counter(
+    "stt_transcript_tokens_total", "Estimated transcript tokens before and after compaction.", ("stage",))
+AUDIO_SECONDS = registry.counter(
+    "stt_audio_seconds_total", "Audio duration before and after silence removal.", ("stage",))
+AUDIO_BYTES = registry.counter(
+    "stt_audio_bytes_total", "Audio file size before and after preprocessing.", ("stage",))
+
+# --- External API metrics (service: openai_chat, openai_whisper, notion) ---
+API_SECONDS = registry.histogram(
+    "stt_api_request_duration_seconds", "Latency of external API requests.", ("service", "operation"))
+API_ERRORS = registry.counter(
+    "stt_api_errors_total", "Failed external API requests by error type.", ("service", "operation", "error"))
+API_RETRIES = registry.counter(
+    "stt_api_retries_total", "Retried external API requests.", ("service", "operation"))
+LLM_TOKENS = registry.counter(
+    "stt_llm_tokens_total", "Tokens reported in OpenAI usage, by agent, model and kind.", ("agent", "model", "kind"))
+LLM_CACHE_HITS = registry.counter(
+    "stt_llm_cache_hits_total", "Chat completions served from the response cache.", ("agent",))
+LLM_CALLS = registry.counter(
+    "stt_llm_calls_total", "Chat completion calls made by agents (a hedged call counts once).", ("agent",))
+LLM_CALL_SECONDS = registry.histogram(
+    "stt_llm_call_duration_seconds", "Chat completion latency as seen by the agent, including hedging.", ("agent",))
+LLM_HEDGES = registry.counter(
+    "stt_llm_hedges_total", "Hedged chat completion calls, by which request answered first.", ("agent", "winner"))
+LLM_TIER_RESULTS = registry.counter(
+    "stt_llm_tier_results_total",
+    "Model tier outcomes per agent: accepted, escalated (failed checks, next tier tried) or exhausted (last tier failed checks).",
+    ("agent", "model", "outcome"))
+LLM_ESCALATIONS = registry.counter(
+    "stt_llm_escalations_total", "Escalations to a larger model, by the check that failed.", ("agent", "model", "reason"))
+
+
+@contextmanager
+def track_request(service: str, operation: str):
+    """
+    Times an external API request and counts it as an error (by exception class) if it raises.
+    A cancelled request (e.g. the losing copy of a hedged call) is neither timed nor counted.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except asyncio.CancelledError:
+        raise
+    except BaseException as e:
+        API_ERRORS.inc(service=service, operation=operation, error=type(e).__name__)
+        API_SECONDS.observe(time.perf_counter() - start, service=service, operation=operation)
+        raise
+    API_SECONDS.observe(time.perf_counter() - start, service=service, operation=operation)
+
+
+def record_llm_usage(agent: str, model: str, response):
+    """
+    Adds token counts from a chat completion's `usage` (absent on mocks and cache hits).
+    """
+    if getattr(response, "cached", False):
+        LLM_CACHE_HITS.inc(agent=agent)
+        return
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        count = getattr(usage, kind, None)
+        if isinstance(count, (int, float)):
+            LLM_TOKENS.inc(count, agent=agent, model=model, kind=kind.split("_")[0])
+
+
+def record_timeline(timeline: List[dict]):
+    for entry in timeline:
+        STAGE_SECONDS.observe(entry["duration"], stage=entry["stage"])
+
+
+# --- Startup ---
+COMPONENT_INIT_SECONDS = registry.histogram(
+    "stt_component_init_seconds", "Time to build lazily initialised components (clients, agents, orchestrator).",
+    ("component",), buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
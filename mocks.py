@@ -1,45 +1,303 @@
+import asyncio
 import json
+import os
+import random
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import MagicMock
 
 class MockResponse:
-    def __init__(self, content):
+    def __init__(self, content, prompt_tokens: int = 0):
         self.choices = [MagicMock(message=MagicMock(content=content))]
+        # Rough counts so token metrics have something to show in mock mode
+        self.usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=max(1, len(content) // 2))
+
+
+class FaultProfile:
+    """
+    Latency and failure injection for the mock clients.
+    Latency is log-normal around `median_ms` (`sigma` controls the tail);
+    `rate_limit` and `error` are per-request probabilities of a 429 / 5xx.
+
+    Profiles are parsed from strings such as "median=800,sigma=0.6,rate_limit=0.02,error=0.01".
+    """
+
+    def __init__(self, median_ms: float = 0.0, sigma: float = 0.5, rate_limit: float = 0.0,
+                 error: float = 0.0, retry_after: float = 1.0, seed: Optional[int] = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.rate_limit = rate_limit
+        self.error = error
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "FaultProfile":
+        fields = {"median": "median_ms", "sigma": "sigma", "rate_limit": "rate_limit",
+                  "error": "error", "retry_after": "retry_after", "seed": "seed"}
+        kwargs = {}
+        for part in (spec or "").split(","):
+            if not part.strip():
+                continue
+            key, _, value = part.partition("=")
+            key = key.strip()
+            if key not in fields:
+                raise ValueError(f"Unknown fault profile field '{key}'. Expected one of {sorted(fields)}")
+            kwargs[fields[key]] = int(value) if key == "seed" else float(value)
+        return cls(**kwargs)
+
+    @classmethod
+    def from_env(cls, name: str) -> "FaultProfile":
+        return cls.parse(os.getenv(name, ""))
+
+    def sample(self):
+        """
+        Returns (delay_seconds, fault) where fault is None, "rate_limit" or "error".
+        """
+        with self._lock:
+            delay = self.median_ms / 1000 * self._random.lognormvariate(0, self.sigma) if self.median_ms > 0 else 0.0
+            roll = self._random.random()
+        if roll < self.rate_limit:
+            return delay, "rate_limit"
+        if roll < self.rate_limit + self.error:
+            return delay, "error"
+        return delay, None
+
+    # SDK imports are deferred so mock mode stays cheap to import and works without the SDKs
+    # until a fault is actually injected
+    def _openai_error(self, fault: str, url: str) -> Exception:
+        import httpx
+        import openai
+
+        request = httpx.Request("POST", url)
+        if fault == "rate_limit":
+            response = httpx.Response(429, request=request, headers={"retry-after": str(self.retry_after)})
+            return openai.RateLimitError("Mock rate limit", response=response, body=None)
+        return openai.InternalServerError("Mock server error", response=httpx.Response(500, request=request), body=None)
+
+    def _notion_error(self, fault: str) -> Exception:
+        import httpx
+        from notion_client.errors import APIResponseError
+
+        if fault == "rate_limit":
+            return APIResponseError("rate_limited", 429, "Mock rate limit",
+                                    httpx.Headers({"Retry-After": str(self.retry_after)}), "")
+        return APIResponseError("internal_server_error", 502, "Mock server error", httpx.Headers(), "")
+
+    def apply(self, url: str = "", notion: bool = False, scale: float = 1.0):
+        delay, fault = self.sample()
+        if delay:
+            time.sleep(delay * scale)
+        if fault:
+            raise self._notion_error(fault) if notion else self._openai_error(fault, url)
+
+    async def aapply(self, url: str = "", notion: bool = False, scale: float = 1.0):
+        delay, fault = self.sample()
+        if delay:
+            await asyncio.sleep(delay * scale)
+        if fault:
+            raise self._notion_error(fault) if notion else self._openai_error(fault, url)
+
+MOCK_ANALYSIS = "회의는 로그인 버그 수정(담당: Sarah)과 분기 보고서(담당: Mike)에 집중되었습니다. 다음 주 클라이언트 미팅 일정도 논의되었습니다."
+
+MOCK_SUMMARY = "스테이징 서버의 로그인 버그 수정과 분기 보고서 마감 일정에 대한 주요 결정이 내려졌습니다. Sarah는 내일까지 버그 수정을 완료하고, Mike는 금요일까지 보고서 초안을 제출하기로 했습니다. 또한 다음 주 클라이언트 미팅 일정을 조율하기로 했습니다."
+
+MOCK_EXTRACTION = {
+    "meeting_title": "주간 업무 회의",
+    "meeting_date": "2026-01-24",
+    "participants": ["John", "Sarah", "Mike"],
+    "todos": [
+        {"action": "로그인 버그 수정", "description": "스테이징 서버에서 발생하는 로그인 버그 수정", "owner": "Sarah", "due": "2026-01-25"},
+        {"action": "분기 보고서 작성", "description": "분기 보고서 초안 작성 및 제출", "owner": "Mike", "due": "2026-01-30"},
+        {"action": "클라이언트 미팅 조율", "description": "클라이언트 가능 시간 확인 및 초대장 발송", "owner": "Sarah", "due": None}
+    ]
+}
+
+# Transcript behind the canned responses above (used by `main.py --mock`)
+MOCK_TRANSCRIPT = """
+        John: Okay everyone, let's start. We need to fix the login bug on the staging server.
+        Sarah: I can handle that. I'll have it done by tomorrow.
+        John: Great. Also, Mike, we need the quarterly report finalized.
+        Mike: Sure, I'll send the draft by Friday.
+        John: And we need to schedule a meeting with the client next week.
+        Sarah: I'll check their availability and send out an invite.
+        John: Perfect. Meeting adjourned.
+        """
+
+# The same meeting as raw speech: fillers, false starts, repeats and split turns
+MOCK_NOISY_TRANSCRIPT = """
+[00:00:01] John: Um, okay, okay everyone, uh, let's start. Let's start.
+[00:00:04] John: So, you know, we we need to fix the, uh, the login bug on the staging server.
+[00:00:09] Sarah: 음, 어, I- I can handle that. I can handle that. I'll have it done by, um, tomorrow.
+[00:00:15] John: Great. Great. Also, uh, Mike, we need the quarterly report, like, finalized.
+[00:00:21] Mike: 어... 네, sure, I'll send the draft by Friday. 그니까 Friday.
+[00:00:26] John: And, uh, we need to schedule a a meeting with the client next week.
+[00:00:31] Sarah: Hmm, I mean, I'll check their availability and, um, send out an invite.
+[00:00:36] John: Perfect. Meeting adjourned.
+"""
+
+# Facts the extraction fixtures depend on; compaction must keep every one of them
+MOCK_TRANSCRIPT_FACTS = [
+    *MOCK_EXTRACTION["participants"],
+    "login bug", "staging server", "tomorrow", "quarterly report", "draft", "Friday",
+    "client", "next week", "availability", "invite",
+]
+
+CHAT_URL = "https://api.openai.com/v1/chat/completions"
+TRANSCRIPTION_URL = "https://api.openai.com/v1/audio/transcriptions"
 
 class MockChat:
-    def __init__(self):
+    """
+    Fast-tier models ("*-mini") answer in MOCK_FAST_MODEL_LATENCY x the profile's latency
+    and return an unusable answer (MOCK_FAST_MODEL_FAILURE_RATE) to exercise escalation.
+    """
+    def __init__(self, faults: Optional[FaultProfile] = None):
         self.completions = self
+        self.faults = faults or FaultProfile()
+        self.fast_latency = float(os.getenv("MOCK_FAST_MODEL_LATENCY", "0.4"))
+        self.fast_failure_rate = float(os.getenv("MOCK_FAST_MODEL_FAILURE_RATE", "0"))
+        self._random = random.Random()
+
+    def _scale(self, model) -> float:
+        return self.fast_latency if "mini" in model else 1.0
 
     def create(self, model, messages, response_format=None):
+        self.faults.apply(CHAT_URL, scale=self._scale(model))
+        return self._respond(messages, model, response_format)
+
+    def _respond(self, messages, model: str = "", response_format=None):
+        if "mini" in model and self._random.random() < self.fast_failure_rate:
+            # Truncated JSON / a one-line English answer: fails the tier checks
+            return MockResponse('{"meeting_title": "주간' if response_format else "Meeting about bugs.")
+
         # Flatten messages to search for keywords regardless of role
         all_content = " ".join([m.get("content", "") for m in messages])
-        
+        prompt_tokens = max(1, len(all_content) // 3)
+
+        # Mock Combined Extraction (single-pass mode)
+        if "an executive summary, meeting metadata and actionable tasks" in all_content:
+            return MockResponse(json.dumps({"analysis": MOCK_ANALYSIS, "summary": MOCK_SUMMARY, **MOCK_EXTRACTION}), prompt_tokens)
+
         # Mock Analysis
         if "Analyze the following meeting transcript" in all_content or "expert business analyst" in all_content:
-            return MockResponse("회의는 로그인 버그 수정(담당: Sarah)과 분기 보고서(담당: Mike)에 집중되었습니다. 다음 주 클라이언트 미팅 일정도 논의되었습니다.")
-        
+            return MockResponse(MOCK_ANALYSIS, prompt_tokens)
+
         # Mock Summary
         if "You are an executive secretary" in all_content:
-            return MockResponse("스테이징 서버의 로그인 버그 수정과 분기 보고서 마감 일정에 대한 주요 결정이 내려졌습니다. Sarah는 내일까지 버그 수정을 완료하고, Mike는 금요일까지 보고서 초안을 제출하기로 했습니다. 또한 다음 주 클라이언트 미팅 일정을 조율하기로 했습니다.")
+            return MockResponse(MOCK_SUMMARY, prompt_tokens)
 
         # Mock Task Extraction
         if "Extract actionable tasks" in all_content:
-            mock_data = {
-                "meeting_title": "주간 업무 회의",
-                "meeting_date": "2026-01-24",
-                "participants": ["John", "Sarah", "Mike"],
-                "todos": [
-                    {"action": "로그인 버그 수정", "description": "스테이징 서버에서 발생하는 로그인 버그 수정", "owner": "Sarah", "due": "2026-01-25"},
-                    {"action": "분기 보고서 작성", "description": "분기 보고서 초안 작성 및 제출", "owner": "Mike", "due": "2026-01-30"},
-                    {"action": "클라이언트 미팅 조율", "description": "클라이언트 가능 시간 확인 및 초대장 발송", "owner": "Sarah", "due": None}
-                ]
-            }
-            return MockResponse(json.dumps(mock_data))
-            
-        return MockResponse("Mock content")
+            return MockResponse(json.dumps(MOCK_EXTRACTION), prompt_tokens)
+
+        return MockResponse("Mock content", prompt_tokens)
+
+class MockTranscriptions:
+    def __init__(self, faults: Optional[FaultProfile] = None):
+        self.faults = faults or FaultProfile()
+
+    def create(self, model, file, **kwargs):
+        self.faults.apply(TRANSCRIPTION_URL)
+        return SimpleNamespace(text="Mock Transcript Text")
 
 class MockClient:
-    def __init__(self, api_key=None):
-        self.chat = MockChat()
-        self.audio = MagicMock()
-        # Mock audio transcription
-        self.audio.transcriptions.create.return_value = MagicMock(text="Mock Transcript Text")
+    """
+    Stand-in for OpenAI. Without profiles every call returns instantly;
+    `chat_faults` / `whisper_faults` inject latency, 429s and 5xx errors
+    (defaults come from MOCK_CHAT_PROFILE / MOCK_WHISPER_PROFILE).
+    """
+    def __init__(self, api_key=None, chat_faults: Optional[FaultProfile] = None, whisper_faults: Optional[FaultProfile] = None):
+        self.chat = MockChat(chat_faults or FaultProfile.from_env("MOCK_CHAT_PROFILE"))
+        self.audio = SimpleNamespace(transcriptions=MockTranscriptions(whisper_faults or FaultProfile.from_env("MOCK_WHISPER_PROFILE")))
+
+class AsyncMockChat(MockChat):
+    async def create(self, model, messages, response_format=None):
+        await self.faults.aapply(CHAT_URL, scale=self._scale(model))
+        return self._respond(messages, model, response_format)
+
+class AsyncMockTranscriptions(MockTranscriptions):
+    async def create(self, model, file, **kwargs):
+        await self.faults.aapply(TRANSCRIPTION_URL)
+        return SimpleNamespace(text="Mock Transcript Text")
+
+class AsyncMockClient:
+    """
+    Async counterpart of MockClient (mirrors AsyncOpenAI).
+    """
+    def __init__(self, api_key=None, chat_faults: Optional[FaultProfile] = None, whisper_faults: Optional[FaultProfile] = None):
+        self.chat = AsyncMockChat(chat_faults or FaultProfile.from_env("MOCK_CHAT_PROFILE"))
+        self.audio = SimpleNamespace(transcriptions=AsyncMockTranscriptions(whisper_faults or FaultProfile.from_env("MOCK_WHISPER_PROFILE")))
+
+
+# --- Notion ---
+
+MOCK_NOTION_DATABASE_ID = "mock-database"
+
+def mock_notion_schema() -> dict:
+    """
+    databases.retrieve payload matching IntegrationAgent's default property names.
+    """
+    types = {"Name": "title", "Meeting Title": "rich_text", "Description": "rich_text", "Participants": "rich_text",
+             "Assignee": "rich_text", "Meeting Date": "date", "Due Date": "date"}
+    return {
+        "id": MOCK_NOTION_DATABASE_ID,
+        "title": [{"plain_text": "Mock Tasks"}],
+        "properties": {name: {"type": kind} for name, kind in types.items()},
+    }
+
+class MockNotionDatabases:
+    def __init__(self, faults: FaultProfile):
+        self.faults = faults
+
+    def retrieve(self, database_id, **kwargs):
+        self.faults.apply(notion=True)
+        return mock_notion_schema()
+
+class MockNotionPages:
+    def __init__(self, faults: FaultProfile):
+        self.faults = faults
+
+    def create(self, parent, properties, **kwargs):
+        self.faults.apply(notion=True)
+        return {"id": str(uuid.uuid4()), "object": "page", "properties": properties}
+
+    def update(self, page_id, properties, **kwargs):
+        self.faults.apply(notion=True)
+        return {"id": page_id, "object": "page", "properties": properties}
+
+class MockNotionClient:
+    """
+    Stand-in for notion_client.Client used when NOTION_MOCK is set.
+    Latency and 429 / 502 injection come from `faults` (default: MOCK_NOTION_PROFILE).
+    """
+    def __init__(self, auth=None, faults: Optional[FaultProfile] = None):
+        faults = faults or FaultProfile.from_env("MOCK_NOTION_PROFILE")
+        self.databases = MockNotionDatabases(faults)
+        self.pages = MockNotionPages(faults)
+
+class AsyncMockNotionDatabases(MockNotionDatabases):
+    async def retrieve(self, database_id, **kwargs):
+        await self.faults.aapply(notion=True)
+        return mock_notion_schema()
+
+class AsyncMockNotionPages(MockNotionPages):
+    async def create(self, parent, properties, **kwargs):
+        await self.faults.aapply(notion=True)
+        return {"id": str(uuid.uuid4()), "object": "page", "properties": properties}
+
+    async def update(self, page_id, properties, **kwargs):
+        await self.faults.aapply(notion=True)
+        return {"id": page_id, "object": "page", "properties": properties}
+
+class AsyncMockNotionClient:
+    """
+    Async counterpart of MockNotionClient (mirrors notion_client.AsyncClient).
+    """
+    def __init__(self, auth=None, faults: Optional[FaultProfile] = None):
+        faults = faults or FaultProfile.from_env("MOCK_NOTION_PROFILE")
+        self.databases = AsyncMockNotionDatabases(faults)
+        self.pages = AsyncMockNotionPages(faults)
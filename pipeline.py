@@ -1,71 +1,446 @@
+import asyncio
+import hashlib
 import os
-from openai import OpenAI
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 from dotenv import load_dotenv
-from mocks import MockClient
+from stages import StageGraph, StageTimeoutError
+from event_loop import BackgroundLoop
+from lazy import lazy_property
+from cache import CachedClient, ResponseCache, TranscriptCache
+from checkpoints import CHECKPOINT_STAGES, TaskCheckpoints
+from deadline import Deadline
+from meeting_store import MeetingStore
+from metrics import PIPELINE_RUNS, PIPELINE_SECONDS, STAGE_TIMEOUTS, record_timeline
 
 # Import Agents
 from agents.speech import SpeechAgent
+from agents.preprocess import AudioPreprocessingAgent
 from agents.analysis import AnalysisAgent, SummarizationAgent
 from agents.task import TaskExtractionAgent
-from agents.structure import StructuringAgent, IntegrationAgent
+from agents.structure import StructuringAgent, IntegrationAgent, AudioPreprocessing, MeetingResult
+from agents.combined import CombinedExtractionAgent
+from agents.chunking import chunk_transcript, estimate_tokens
+from agents.compaction import TranscriptCompactionAgent
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+PIPELINE_MODES = ("auto", "standard", "mapreduce", "combined")
+
+# Client-facing progress: stage name -> phase (phases only move forward, in this order)
+PROGRESS_PHASES = ("transcribing", "analyzing", "extracting", "structuring", "syncing")
+STAGE_PHASES = {
+    "audio": "transcribing", "transcript": "transcribing",
+    "compacted": "analyzing", "chunks": "analyzing", "chunk_results": "analyzing", "analysis": "analyzing",
+    "combined": "extracting", "summary": "extracting", "extracted_data": "extracting",
+    "structured_data": "structuring",
+}
+# Stage outputs pushed to the client as soon as they are ready
+PARTIAL_OUTPUTS = ("transcript", "analysis", "summary", "extracted_data")
+
+
+class OrderedWrites:
+    """
+    Runs blocking callbacks (task-store and checkpoint writes) in worker threads, one at a
+    time and in submission order, so stage events never block the pipeline loop.
+    Failures are logged, not raised. `flush()` waits for everything submitted so far.
+    """
+
+    def __init__(self):
+        self._last: Optional[asyncio.Future] = None
+
+    def submit(self, failure: str, func: Callable[..., Any], *args: Any):
+        previous = self._last
+
+        async def write():
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                await asyncio.to_thread(func, *args)
+            except Exception as e:
+                print(f"⚠️ [System] {failure}: {e}")
+
+        self._last = asyncio.ensure_future(write())
+
+    async def flush(self):
+        if self._last is not None:
+            await asyncio.wait([self._last])
+
+
+class ProgressReporter:
+    """
+    Turns StageGraph stage events into progress events for `on_progress`:
+    {"type": "stage", "stage": <phase>} and {"type": "partial", "name": ..., "value": ...}.
+    Events are delivered in order through `writes`, off the event loop.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 writes: Optional[OrderedWrites] = None):
+        self.on_progress = on_progress
+        self.writes = writes or OrderedWrites()
+        self.phase: Optional[str] = None
+
+    def _emit(self, event: Dict[str, Any]):
+        if self.on_progress is not None:
+            self.writes.submit("Could not report progress", self.on_progress, event)
+
+    def enter(self, phase: str):
+        if self.phase is not None and PROGRESS_PHASES.index(phase) <= PROGRESS_PHASES.index(self.phase):
+            return
+        self.phase = phase
+        self._emit({"type": "stage", "stage": phase})
+
+    def on_stage(self, name: str, state: str, output: Any):
+        if state == "started" and name in STAGE_PHASES:
+            self.enter(STAGE_PHASES[name])
+        elif state == "finished" and name in PARTIAL_OUTPUTS:
+            self._emit({"type": "partial", "name": name, "value": output})
 
 # Load environment variables
 load_dotenv()
 
 class PipelineOrchestrator:
-    def __init__(self):
-        # Initialize OpenAI Client
+    """
+    Clients and agents are built on first use, so constructing the orchestrator
+    (e.g. at API import time) does not import the SDKs or call Notion.
+    """
+
+    def __init__(self, background_loop: Optional[BackgroundLoop] = None):
+        # Pipeline mode: "auto" (map-reduce only for long transcripts), "standard", "mapreduce"
+        # or "combined" (analysis, summary and todos from a single LLM call)
+        self.default_mode = os.getenv("PIPELINE_MODE", "auto").strip().lower()
+        self.mapreduce_threshold_tokens = int(os.getenv("MAPREDUCE_THRESHOLD_TOKENS", "12000"))
+        self.mapreduce_chunk_tokens = int(os.getenv("MAPREDUCE_CHUNK_TOKENS", "6000"))
+        self.mapreduce_fan_in = int(os.getenv("MAPREDUCE_FAN_IN", "4"))
+        self.mapreduce_concurrency = int(os.getenv("MAPREDUCE_MAX_CONCURRENCY", "4"))
+        # Fail the run (keeping its checkpoints for a retry) when the Notion sync does not fully succeed
+        self.notion_sync_required = os.getenv("NOTION_SYNC_REQUIRED", "false").strip().lower() in ("1", "true", "yes")
+
+        # Event loop that sync callers use to drive `arun`
+        self.background_loop = background_loop or BackgroundLoop()
+
+        # Timeline of the most recent run (stage, start, end, duration in seconds),
+        # plus a bounded history of recent runs for per-stage percentiles (benchmark.py)
+        self.last_timeline = []
+        self.recent_timelines = deque(maxlen=int(os.getenv("TIMELINE_HISTORY", "500")))
+
+    @lazy_property
+    def _clients(self) -> Tuple["OpenAI", "AsyncOpenAI"]:
+        # Initialize OpenAI Clients (sync for direct agent calls, async for the pipeline)
         api_key = os.getenv("OPENAI_API_KEY")
-        
+
         if not api_key or "your_api_key_here" in api_key:
             print("⚠️ [System] OPENAI_API_KEY not found or invalid. Switching to MOCK MODE for demonstration.")
-            self.client = MockClient()
+            from mocks import AsyncMockClient, MockClient
+            client, async_client = MockClient(), AsyncMockClient()
         else:
-            self.client = OpenAI(api_key=api_key)
+            from openai import AsyncOpenAI, OpenAI
+            client, async_client = OpenAI(api_key=api_key), AsyncOpenAI(api_key=api_key)
 
-        # Initialize Agents
-        self.speech_agent = SpeechAgent(self.client)
-        self.analysis_agent = AnalysisAgent(self.client)
-        self.summary_agent = SummarizationAgent(self.client)
-        self.task_agent = TaskExtractionAgent(self.client)
-        self.structuring_agent = StructuringAgent()
-        self.integration_agent = IntegrationAgent()
+        # Optional persistent LLM response cache in front of chat completions
+        if os.getenv("LLM_CACHE_ENABLED", "false").strip().lower() in ("1", "true", "yes"):
+            print("🗄️ [System] LLM response cache enabled.")
+            response_cache = ResponseCache()
+            client = CachedClient(client, response_cache)
+            async_client = CachedClient(async_client, response_cache, is_async=True)
+        return client, async_client
 
-    def run(self, audio_file_path: str, mock_transcript: str = None):
-        print("\n🚀 [System] Starting AI Pipeline...")
-        
-        # Step 1: Speech to Text
-        if mock_transcript:
-            print("ℹ️ [System] Using mock transcript for demonstration.")
-            transcript = mock_transcript
-        else:
-            transcript = self.speech_agent.process(audio_file_path)
+    @property
+    def client(self) -> "OpenAI":
+        return self._clients[0]
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        return self._clients[1]
+
+    # --- Agents ---
+
+    @lazy_property
+    def speech_agent(self) -> SpeechAgent:
+        transcript_cache = None
+        if os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes"):
+            transcript_cache = TranscriptCache()
+        return SpeechAgent(self.client, cache=transcript_cache, async_client=self.async_client)
+
+    @lazy_property
+    def preprocess_agent(self) -> Optional[AudioPreprocessingAgent]:
+        # Optional downmix / silence removal before the Whisper upload (needs ffmpeg and numpy)
+        if os.getenv("AUDIO_PREPROCESS_ENABLED", "false").strip().lower() in ("1", "true", "yes"):
+            return AudioPreprocessingAgent()
+        return None
+
+    @lazy_property
+    def compaction_agent(self) -> Optional[TranscriptCompactionAgent]:
+        if os.getenv("TRANSCRIPT_COMPACTION_ENABLED", "true").strip().lower() in ("1", "true", "yes"):
+            return TranscriptCompactionAgent()
+        return None
+
+    @lazy_property
+    def analysis_agent(self) -> AnalysisAgent:
+        return AnalysisAgent(self.client, self.async_client)
+
+    @lazy_property
+    def summary_agent(self) -> SummarizationAgent:
+        return SummarizationAgent(self.client, self.async_client)
+
+    @lazy_property
+    def task_agent(self) -> TaskExtractionAgent:
+        return TaskExtractionAgent(self.client, self.async_client)
 
+    @lazy_property
+    def combined_agent(self) -> CombinedExtractionAgent:
+        return CombinedExtractionAgent(self.client, self.async_client)
+
+    @lazy_property
+    def structuring_agent(self) -> StructuringAgent:
+        return StructuringAgent()
+
+    @lazy_property
+    def integration_agent(self) -> IntegrationAgent:
+        return IntegrationAgent()
+
+    @lazy_property
+    def meeting_store(self) -> Optional[MeetingStore]:
+        # Local copy of every published result, queried by /api/todos, /api/meetings and /api/search
+        if os.getenv("MEETING_STORE_ENABLED", "true").strip().lower() in ("1", "true", "yes"):
+            return MeetingStore()
+        return None
+
+    def compact(self, transcript: str) -> str:
+        if self.compaction_agent is None:
+            return transcript
+        return self.compaction_agent.process(transcript)
+
+    def _resolve_mode(self, mode: str, transcript: str) -> str:
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{mode}'. Expected one of {PIPELINE_MODES}")
+        if mode != "auto":
+            return mode
+        tokens = estimate_tokens(transcript)
+        if tokens > self.mapreduce_threshold_tokens:
+            print(f"ℹ️ [System] Transcript is ~{tokens} tokens. Switching to map-reduce mode.")
+            return "mapreduce"
+        return "standard"
+
+    def _add_standard_stages(self, graph: StageGraph):
         # Step 2: Analysis
-        analysis = self.analysis_agent.process(transcript)
-
-        # Step 3: Summarization
-        summary = self.summary_agent.process(transcript, analysis)
-
-        # Step 4: Task Extraction (Now returns dict with metadata)
-        extracted_data = self.task_agent.process(transcript, analysis)
-
-        # Step 5: Structuring
-        structured_data = self.structuring_agent.process(summary, extracted_data)
-
-        # Step 6: Integration & Validation
-        if self.integration_agent.validate(structured_data):
-            # Attempt to sync to Notion
-            self.integration_agent.sync_to_notion(structured_data)
-            
-            final_output = self.integration_agent.export(structured_data)
-            print("\n📤 [System] Final Output Generated:")
-            print(final_output)
-            return final_output
+        graph.add("analysis", self.analysis_agent.aprocess, deps=["compacted"])
+        # Step 3 & 4: Summarization and Task Extraction only need transcript + analysis, so they run concurrently
+        graph.add("summary", self.summary_agent.aprocess, deps=["compacted", "analysis"])
+        graph.add("extracted_data", self.task_agent.aprocess, deps=["compacted", "analysis"])
+
+    def _add_mapreduce_stages(self, graph: StageGraph):
+        # Step 2: Per-chunk analysis and task extraction (concurrent across chunks)
+        graph.add("chunks", lambda transcript: chunk_transcript(transcript, self.mapreduce_chunk_tokens), deps=["compacted"])
+        graph.add("chunk_results", self._map_chunks, deps=["chunks"])
+        # Step 3: Hierarchical merge of partial analyses, then summary from the section analyses
+        graph.add("analysis", lambda chunk_results: self._reduce_analyses([a for a, _ in chunk_results]), deps=["chunk_results"])
+        graph.add("summary", lambda chunk_results, analysis: self.summary_agent.aprocess_sections([a for a, _ in chunk_results], analysis),
+                  deps=["chunk_results", "analysis"])
+        # Step 4: Deduplicated todo list (runs alongside the analysis merge)
+        graph.add("extracted_data", lambda chunk_results: self.task_agent.merge([t for _, t in chunk_results]), deps=["chunk_results"])
+
+    def _add_combined_stages(self, graph: StageGraph):
+        # Steps 2-4 in one structured-output call
+        graph.add("combined", self.combined_agent.aprocess, deps=["compacted"])
+        graph.add("analysis", lambda combined: combined["analysis"], deps=["combined"])
+        graph.add("summary", lambda combined: combined["summary"], deps=["combined"])
+        graph.add("extracted_data", lambda combined: combined["extracted_data"], deps=["combined"])
+
+    async def _map_chunks(self, chunks: List[str]) -> List[Tuple[str, dict]]:
+        print(f"🧩 [System] Map-reduce: processing {len(chunks)} chunks "
+              f"(≤{self.mapreduce_chunk_tokens} tokens each, concurrency {self.mapreduce_concurrency})")
+        semaphore = asyncio.Semaphore(max(1, self.mapreduce_concurrency))
+
+        async def process_chunk(chunk: str) -> Tuple[str, dict]:
+            async with semaphore:
+                chunk_analysis = await self.analysis_agent.aprocess(chunk)
+                return chunk_analysis, await self.task_agent.aprocess(chunk, chunk_analysis)
+
+        return list(await asyncio.gather(*(process_chunk(chunk) for chunk in chunks)))
+
+    async def _reduce_analyses(self, analyses: List[str]) -> str:
+        """
+        Merges analyses in groups of `mapreduce_fan_in`, level by level, until one remains.
+        Groups within a level are merged concurrently.
+        """
+        fan_in = max(2, self.mapreduce_fan_in)
+        semaphore = asyncio.Semaphore(max(1, self.mapreduce_concurrency))
+
+        async def merge_group(group: List[str]) -> str:
+            async with semaphore:
+                return await self.analysis_agent.amerge(group)
+
+        while len(analyses) > 1:
+            groups = [analyses[i:i + fan_in] for i in range(0, len(analyses), fan_in)]
+            analyses = list(await asyncio.gather(*(merge_group(group) for group in groups)))
+        return analyses[0]
+
+    def run(self, audio_file_path: str, mock_transcript: str = None, mode: str = None, audio_hash: str = None,
+            on_progress: Optional[Callable[[Dict[str, Any]], None]] = None, deadline: Optional[float] = None,
+            checkpoints: Optional[TaskCheckpoints] = None) -> Optional[MeetingResult]:
+        """
+        Sync entry point: runs `arun` on the orchestrator's background event loop.
+        """
+        return self.background_loop.run(self.arun(audio_file_path, mock_transcript, mode, audio_hash, on_progress,
+                                                  deadline, checkpoints))
+
+    async def arun(self, audio_file_path: str, mock_transcript: str = None, mode: str = None, audio_hash: str = None,
+                   on_progress: Optional[Callable[[Dict[str, Any]], None]] = None, deadline: Optional[float] = None,
+                   checkpoints: Optional[TaskCheckpoints] = None) -> Optional[MeetingResult]:
+        """
+        Runs the full pipeline. `audio_hash` (SHA-256 of the file, e.g. computed during upload)
+        lets the transcript cache skip re-reading the file. `on_progress` receives phase
+        transitions and partial outputs (see ProgressReporter); it is called in a worker thread,
+        one event at a time, and every call has finished when arun returns.
+        `deadline` (seconds, default PIPELINE_DEADLINE_SECONDS) bounds the whole run: each stage
+        gets a share of it and raises StageTimeoutError when that runs out.
+        With `checkpoints`, stage outputs in CHECKPOINT_STAGES are saved as they finish and
+        a run that already has checkpoints resumes after the last saved stage.
+        """
+        print("\n🚀 [System] Starting AI Pipeline...")
+        # Progress and checkpoint writes hit SQLite, so they run in order off the loop
+        writes = OrderedWrites()
+        progress = ProgressReporter(on_progress, writes)
+        restored = await asyncio.to_thread(checkpoints.load) if checkpoints is not None else {}
+        if restored:
+            print(f"♻️ [System] Resuming from checkpoints: {', '.join(sorted(restored))}")
+
+        def on_stage(name: str, state: str, output: Any):
+            progress.on_stage(name, state, output)
+            # A None output (e.g. failed validation) is not a result worth resuming from
+            if checkpoints is not None and state == "finished" and name in CHECKPOINT_STAGES and output is not None:
+                writes.submit(f"Could not checkpoint '{name}'", checkpoints.save, name, output)
+
+        budget = Deadline.from_env(deadline)
+        graph = StageGraph(on_event=on_stage, timeout_for=budget.budget if budget else None)
+        started = time.perf_counter()
+        run = {"mode": mode or self.default_mode, "status": "error"}
+        try:
+            output = await self._arun(graph, run, audio_file_path, mock_transcript, audio_hash, progress, budget, restored)
+            run["status"] = "completed" if output is not None else "failed"
+            return output
+        except StageTimeoutError as e:
+            run["status"] = "timeout"
+            STAGE_TIMEOUTS.inc(stage=e.stage)
+            print(f"⏰ [System] {e}")
+            raise
+        finally:
+            await writes.flush()
+            record_timeline(graph.timeline)
+            PIPELINE_RUNS.inc(**run)
+            PIPELINE_SECONDS.observe(time.perf_counter() - started, **run)
+
+    async def _arun(self, graph: StageGraph, run: dict, audio_file_path: str, mock_transcript: str, audio_hash: str,
+                    progress: ProgressReporter, deadline: Optional[Deadline], restored: Dict[str, Any]):
+
+        # Step 1: Speech to Text (preprocessing only runs on a transcript cache miss)
+        async def prepare_audio():
+            if mock_transcript:
+                return None
+            cache_key, cached = await self.speech_agent.alookup(audio_file_path, audio_hash)
+            report = None
+            if cached is None and self.preprocess_agent is not None:
+                report = await self.preprocess_agent.aprocess(audio_file_path)
+            return {"cache_key": cache_key, "transcript": cached, "preprocess": report}
+
+        async def transcribe(audio):
+            if mock_transcript:
+                print("ℹ️ [System] Using mock transcript for demonstration.")
+                return mock_transcript
+            if audio["transcript"] is not None:
+                return audio["transcript"]
+            report = audio["preprocess"]
+            if report is None:
+                return await self.speech_agent.atranscribe(audio_file_path, audio["cache_key"])
+            try:
+                # Cached under the original file's hash so re-uploads still hit
+                return await self.speech_agent.atranscribe(report["path"], audio["cache_key"])
+            finally:
+                os.remove(report["path"])
+
+        graph.add("audio", prepare_audio)
+        graph.add("transcript", transcribe, deps=["audio"])
+        # Step 1.5: Deterministic clean-up that shrinks every downstream prompt
+        graph.add("compacted", self.compact, deps=["transcript"])
+        results = await graph.arun(restored)
+
+        # Steps 2-4 depend on the mode, which may depend on the transcript length
+        mode = run["mode"] = self._resolve_mode(run["mode"], results["compacted"])
+        if mode == "mapreduce":
+            self._add_mapreduce_stages(graph)
+        elif mode == "combined":
+            self._add_combined_stages(graph)
         else:
+            self._add_standard_stages(graph)
+        # Step 5: Structuring. Silence-removal savings travel with the
+        # result (and its checkpoint); a run resumed after transcription has none to attach.
+        preprocess = (results.get("audio") or {}).get("preprocess")
+
+        def structure(summary: str, extracted_data: dict) -> Optional[MeetingResult]:
+            result = self.structuring_agent.process(summary, extracted_data)
+            if result is not None and preprocess:
+                result.audio = AudioPreprocessing.model_validate(preprocess)
+            return result
+
+        graph.add("structured_data", structure, deps=["summary", "extracted_data"])
+        results = await graph.arun(results)
+
+        self.last_timeline = graph.timeline
+        self.recent_timelines.append(graph.timeline)
+        print(f"⏱️ [System] Stage timeline ({mode} mode):")
+        print(graph.format_timeline())
+
+        # The recording the meeting came from: its file hash, else the transcript's
+        source = audio_hash or (results.get("audio") or {}).get("cache_key") \
+            or hashlib.sha256(results["transcript"].encode("utf-8")).hexdigest()
+        progress.enter("syncing")
+        if deadline is None:
+            return await self.apublish(results["structured_data"], source)
+        budget = deadline.budget("publish")
+        try:
+            return await asyncio.wait_for(self.apublish(results["structured_data"], source), budget)
+        except asyncio.TimeoutError:
+            raise StageTimeoutError("publish", budget) from None
+
+    async def apublish(self, structured_data: Union[MeetingResult, dict, None],
+                       source: Optional[str] = None) -> Optional[MeetingResult]:
+        """
+        Step 6: validates the structured result, saves it to the local meeting store
+        (keyed by `source`, see meeting_store.meeting_key) and syncs it to Notion. Returns the MeetingResult (serialized only by the caller, e.g.
+        at the API boundary), or None if validation fails. Raises RuntimeError on a
+        failed sync when NOTION_SYNC_REQUIRED is set.
+        """
+        result = self.integration_agent.validate(structured_data)
+        if result is None:
             print("❌ [System] Pipeline failed at validation stage.")
             return None
 
+        await self.astore(result, source)
+
+        # Attempt to sync to Notion
+        synced = await self.integration_agent.async_sync_to_notion(result, source)
+        if not synced and self.notion_sync_required:
+            raise RuntimeError("Notion sync failed")
+
+        print(f"📤 [System] Final Output Generated: '{result.meeting_info.title}' with {len(result.todos)} todos.")
+        return result
+
+    async def astore(self, result: MeetingResult, source: Optional[str] = None):
+        """
+        Saves the result to the meeting store. A failed save is logged, not raised:
+        the store is a query index, Notion and the task result remain the record.
+        """
+        if self.meeting_store is None:
+            return
+        try:
+            meeting_id = await asyncio.to_thread(self.meeting_store.save, result, source)
+            print(f"🗃️ [System] Saved to meeting store (meeting {meeting_id}).")
+        except Exception as e:
+            print(f"⚠️ [System] Meeting store save failed: {e}")
+
 if __name__ == "__main__":
     # Test run
     orchestrator = PipelineOrchestrator()
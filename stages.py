@@ -0,0 +1,152 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class StageTimeoutError(TimeoutError):
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"Stage '{stage}' exceeded its {budget:.1f}s budget")
+        self.stage = stage
+        self.budget = budget
+
+
+class Stage:
+    def __init__(self, name: str, func: Callable[..., Any], deps: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+class StageGraph:
+    """
+    Runs pipeline stages as a dependency graph.
+    Each stage starts as soon as all of its dependencies have finished,
+    so independent stages (e.g. summary and task extraction) run concurrently.
+    Stages may be added between runs; the timeline accumulates across runs.
+    `on_event(stage, "started" | "finished", output)` is called around every stage
+    (output is None for "started"); it must be cheap and must not raise.
+    `timeout_for(stage)` returns the stage's time budget in seconds (None = unbounded);
+    it is only enforced on awaitable stages.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[str, str, Any], None]] = None,
+                 timeout_for: Optional[Callable[[str], Optional[float]]] = None):
+        self.on_event = on_event
+        self.timeout_for = timeout_for
+        self.stages: Dict[str, Stage] = {}
+        self.timeline: List[Dict[str, Any]] = []
+        self._t0: Optional[float] = None
+
+    def add(self, name: str, func: Callable[..., Any], deps: Sequence[str] = ()) -> "StageGraph":
+        """
+        Registers a stage. `func` is called with the outputs of `deps` as positional arguments, in order.
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, func, deps)
+        return self
+
+    def _notify(self, name: str, state: str, output: Any = None):
+        if self.on_event is not None:
+            self.on_event(name, state, output)
+
+    def _needed(self, results: Dict[str, Any]) -> Dict[str, Stage]:
+        """
+        Stages that still have to run: every unfinished stage nothing else depends on,
+        plus the unfinished stages those depend on. Stages whose dependents are all
+        already in `results` (e.g. restored from a checkpoint) are skipped.
+        """
+        dependents = {dep for stage in self.stages.values() for dep in stage.deps}
+        stack = [name for name in self.stages if name not in dependents]
+        needed: Dict[str, Stage] = {}
+        while stack:
+            name = stack.pop()
+            if name in needed or name in results or name not in self.stages:
+                continue
+            needed[name] = self.stages[name]
+            stack.extend(self.stages[name].deps)
+        return needed
+
+    def _check(self, initial: Dict[str, Any]):
+        known = set(self.stages) | set(initial)
+        for stage in self.stages.values():
+            unknown = [d for d in stage.deps if d not in known]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {unknown}")
+
+    async def arun(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Executes every stage and returns a dict of stage name -> output.
+        Values in `initial` are treated as already-completed stages, and stages only
+        needed to produce them are skipped. The first stage error cancels pending stages and is re-raised.
+        Every stage is an asyncio task on the current loop: coroutine functions (or callables
+        returning awaitables) are awaited; plain sync stage functions run inline on the loop,
+        so they must be cheap.
+        """
+        results: Dict[str, Any] = dict(initial or {})
+        self._check(results)
+
+        pending = self._needed(results)
+        running: Dict[asyncio.Task, str] = {}
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        t0 = self._t0
+
+        async def _execute(stage: Stage):
+            start = time.perf_counter()
+            self._notify(stage.name, "started")
+            try:
+                output = stage.func(*[results[d] for d in stage.deps])
+                if inspect.isawaitable(output):
+                    budget = self.timeout_for(stage.name) if self.timeout_for else None
+                    if budget is None:
+                        output = await output
+                    else:
+                        try:
+                            output = await asyncio.wait_for(output, budget)
+                        except asyncio.TimeoutError:
+                            raise StageTimeoutError(stage.name, budget) from None
+                self._notify(stage.name, "finished", output)
+                return output
+            finally:
+                end = time.perf_counter()
+                self.timeline.append({
+                    "stage": stage.name,
+                    "start": round(start - t0, 3),
+                    "end": round(end - t0, 3),
+                    "duration": round(end - start, 3),
+                })
+
+        try:
+            while pending or running:
+                ready = [s for s in pending.values() if all(d in results for d in s.deps)]
+                for stage in ready:
+                    del pending[stage.name]
+                    running[asyncio.ensure_future(_execute(stage))] = stage.name
+
+                if not running:
+                    raise RuntimeError(f"Stage graph has a dependency cycle: {sorted(pending)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+
+        self.timeline.sort(key=lambda e: e["start"])
+        return results
+
+    def format_timeline(self) -> str:
+        """
+        Renders the last run's timeline as one line per stage.
+        """
+        if not self.timeline:
+            return ""
+        total = max(e["end"] for e in self.timeline)
+        busy = sum(e["duration"] for e in self.timeline)
+        lines = [f"   - {e['stage']:<16} {e['start']:>7.2f}s → {e['end']:>7.2f}s ({e['duration']:.2f}s)" for e in self.timeline]
+        lines.append(f"   wall: {total:.2f}s, sum of stages: {busy:.2f}s, saved: {max(busy - total, 0):.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,37 @@
+import os
+import sqlite3
+import tempfile
+from typing import Any
+
+from pydantic_core import to_json
+
+# Root directory for local state (caches, indexes, stores)
+STATE_DIR = os.getenv("STT_STATE_DIR", os.path.join(tempfile.gettempdir(), "stt_todo"))
+
+
+def state_path(*parts: str) -> str:
+    """
+    Returns a path under STATE_DIR, creating its parent directory.
+    """
+    path = os.path.join(STATE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def connect(path: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Opens a SQLite connection in WAL mode so several threads/processes can share the file.
+    """
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def dumps(value: Any) -> str:
+    """
+    JSON text for the SQLite stores. pydantic-core encodes models nested in the value
+    (e.g. a MeetingResult in a task record) directly, without a dict / json.dumps pass.
+    """
+    return to_json(value).decode("utf-8")
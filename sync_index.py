@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+from storage import connect, state_path
+
+
+def _normalize(value) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+
+def todo_fingerprint(database_id: str, meeting_info: dict, todo: dict, occurrence: int = 0,
+                     source: Optional[str] = None, position: int = 0) -> str:
+    """
+    Stable identity of a todo row in the target database.
+    With `source` (what the meeting was produced from, e.g. the audio hash): the source and the
+    todo's `position`, so a re-run that rewords, re-titles or reassigns todos updates the same
+    rows (the content itself is compared through `content_hash`).
+    Without one: the meeting's title + date and the todo's action + owner, with `occurrence`
+    separating identical todos within the same meeting.
+    """
+    if source is not None:
+        parts = [database_id, "source", source, str(position)]
+    else:
+        parts = [
+            database_id,
+            _normalize(meeting_info.get("title")),
+            _normalize(meeting_info.get("date")),
+            _normalize(todo.get("action")),
+            _normalize(todo.get("owner")),
+            str(occurrence),
+        ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def content_hash(properties: dict) -> str:
+    payload = json.dumps(properties, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SyncIndex:
+    """
+    Local SQLite index of todo fingerprint -> Notion page ID (and the hash of the
+    properties last written), so re-syncs can skip or update rows instead of duplicating them.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("NOTION_SYNC_INDEX_PATH") or state_path("notion_sync_index.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS synced_rows ("
+            " fingerprint TEXT PRIMARY KEY, page_id TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL, synced_at REAL NOT NULL)"
+        )
+
+    def get(self, fingerprint: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns (page_id, content_hash) for a synced row, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_id, content_hash FROM synced_rows WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        return (row["page_id"], row["content_hash"]) if row else None
+
+    def put(self, fingerprint: str, page_id: str, properties_hash: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO synced_rows (fingerprint, page_id, content_hash, synced_at) VALUES (?, ?, ?, ?)",
+                (fingerprint, page_id, properties_hash, time.time())
+            )
+
+    def delete(self, fingerprint: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM synced_rows WHERE fingerprint = ?", (fingerprint,))
@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+from storage import connect, dumps, state_path
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class TaskStore(ABC):
+    """
+    Job state keyed by task ID. Completed jobs are pruned once older than `ttl_seconds`;
+    failed jobs are kept for `failed_ttl_seconds` (at least `ttl_seconds`) so they can still be retried.
+    Every write bumps the task's `version`, which clients use as an ETag / event ID.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, failed_ttl_seconds: Optional[float] = None,
+                 prune_interval: float = 60.0):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("TASK_TTL_SECONDS", "3600"))
+        self.failed_ttl_seconds = max(failed_ttl_seconds or 0.0, self.ttl_seconds)
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+
+    @abstractmethod
+    def create(self, task_id: str, record: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def update(self, task_id: str, **fields: Any):
+        ...
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_versioned(task_id)[0]
+
+    @abstractmethod
+    def get_versioned(self, task_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Returns (record, version); (None, 0) for an unknown task.
+        """
+
+    @abstractmethod
+    def get_json(self, task_id: str) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Returns (record as JSON, status, version) without decoding the stored record;
+        (None, None, 0) for an unknown task.
+        """
+
+    @abstractmethod
+    def version(self, task_id: str) -> Optional[int]:
+        """
+        Cheap change check: the current version without loading the record.
+        """
+
+    @abstractmethod
+    def prune(self) -> int:
+        """
+        Deletes finished tasks older than their TTL. Returns the number removed.
+        """
+
+    def _cutoffs(self) -> Dict[str, float]:
+        # Finished status -> updated-before time at which it expires
+        now = time.time()
+        return {"completed": now - self.ttl_seconds, "failed": now - self.failed_ttl_seconds}
+
+    def _maybe_prune(self):
+        now = time.monotonic()
+        if now - self._last_prune >= self.prune_interval:
+            self._last_prune = now
+            removed = self.prune()
+            if removed:
+                print(f"🧹 [Task Store] Pruned {removed} finished tasks.")
+
+
+class MemoryTaskStore(TaskStore):
+    """
+    In-process store. Only valid with a single API worker process.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._updated: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def create(self, task_id: str, record: Dict[str, Any]):
+        with self._lock:
+            self._tasks[task_id] = dict(record)
+            self._updated[task_id] = time.time()
+            self._versions[task_id] = 1
+        self._maybe_prune()
+
+    def update(self, task_id: str, **fields: Any):
+        with self._lock:
+            if task_id not in self._tasks:
+                raise KeyError(task_id)
+            self._tasks[task_id].update(fields)
+            self._updated[task_id] = time.time()
+            self._versions[task_id] += 1
+
+    def get_versioned(self, task_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                return None, 0
+            return dict(record), self._versions[task_id]
+
+    def get_json(self, task_id: str) -> Tuple[Optional[str], Optional[str], int]:
+        record, version = self.get_versioned(task_id)
+        if record is None:
+            return None, None, 0
+        return dumps(record), record.get("status"), version
+
+    def version(self, task_id: str) -> Optional[int]:
+        with self._lock:
+            return self._versions.get(task_id)
+
+    def prune(self) -> int:
+        cutoffs = self._cutoffs()
+        with self._lock:
+            expired = [task_id for task_id, record in self._tasks.items()
+                       if record.get("status") in cutoffs and self._updated[task_id] < cutoffs[record["status"]]]
+            for task_id in expired:
+                del self._tasks[task_id]
+                del self._updated[task_id]
+                del self._versions[task_id]
+        return len(expired)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLite (WAL) store shared by every worker process on the host.
+    """
+
+    def __init__(self, path: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or os.getenv("TASK_STORE_PATH") or state_path("tasks.sqlite3")
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY, status TEXT NOT NULL, data TEXT NOT NULL,"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL, version INTEGER NOT NULL DEFAULT 1)"
+        )
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+        if "version" not in columns:
+            # Stores created before versioning
+            conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(status, updated_at)")
+
+    def _conn(self):
+        # One connection per thread; WAL lets readers proceed while a writer commits
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def create(self, task_id: str, record: Dict[str, Any]):
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO tasks (task_id, status, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (task_id, record.get("status", "pending"), dumps(record), now, now)
+        )
+        self._maybe_prune()
+
+    def update(self, task_id: str, **fields: Any):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                raise KeyError(task_id)
+            record = json.loads(row["data"])
+            record.update(fields)
+            conn.execute(
+                "UPDATE tasks SET status = ?, data = ?, updated_at = ?, version = version + 1 WHERE task_id = ?",
+                (record.get("status", "pending"), dumps(record), time.time(), task_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_versioned(self, task_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        row = self._conn().execute("SELECT data, version FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return (json.loads(row["data"]), row["version"]) if row else (None, 0)
+
+    def get_json(self, task_id: str) -> Tuple[Optional[str], Optional[str], int]:
+        # The row already holds the record as JSON (written by `dumps`), so it is returned as is
+        row = self._conn().execute("SELECT data, status, version FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return (row["data"], row["status"], row["version"]) if row else (None, None, 0)
+
+    def version(self, task_id: str) -> Optional[int]:
+        row = self._conn().execute("SELECT version FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return row["version"] if row else None
+
+    def prune(self) -> int:
+        cutoffs = self._cutoffs()
+        where = " OR ".join("(status = ? AND updated_at < ?)" for _ in cutoffs)
+        cursor = self._conn().execute(f"DELETE FROM tasks WHERE {where}",
+                                      [value for item in cutoffs.items() for value in item])
+        return cursor.rowcount
+
+
+def create_task_store(**kwargs: Any) -> TaskStore:
+    """
+    Builds the store selected by TASK_STORE ("sqlite" by default, or "memory"); `kwargs` go to the store.
+    """
+    backend = os.getenv("TASK_STORE", "sqlite").strip().lower()
+    if backend == "memory":
+        return MemoryTaskStore(**kwargs)
+    if backend == "sqlite":
+        return SQLiteTaskStore(**kwargs)
+    raise ValueError(f"Unknown TASK_STORE backend: {backend}")
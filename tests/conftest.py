@@ -0,0 +1,22 @@
+import pytest
+
+import storage
+
+# Settings from the developer's environment / .env that would point tests at real services or shared files
+ISOLATED_ENV = (
+    "OPENAI_API_KEY", "NOTION_API_KEY", "NOTION_DATABASE_ID", "NOTION_MOCK", "PIPELINE_MODE",
+    "LLM_CACHE_ENABLED", "LLM_HEDGE_ENABLED", "MOCK_CHAT_PROFILE", "MOCK_NOTION_PROFILE",
+    "CHECKPOINT_PATH", "TASK_STORE_PATH", "MEETING_STORE_PATH", "LLM_CACHE_PATH",
+    "NOTION_SYNC_INDEX_PATH", "NOTION_SCHEMA_CACHE_PATH",
+)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    # Stores, caches and indexes go to a per-test directory, and every client runs in mock mode
+    path = tmp_path / "state"
+    path.mkdir()
+    monkeypatch.setattr(storage, "STATE_DIR", str(path))
+    for name in ISOLATED_ENV:
+        monkeypatch.delenv(name, raising=False)
+    return path
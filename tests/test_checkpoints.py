@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from agents.structure import MeetingResult
+from checkpoints import CHECKPOINT_STAGES, CheckpointStore, TaskCheckpoints, restore_checkpoints, resume_stage
+from mocks import MOCK_TRANSCRIPT
+from pipeline import PipelineOrchestrator
+
+STRUCTURED = {
+    "summary": "Launch planning.",
+    "meeting_info": {"title": "Launch sync", "date": "2026-10-01", "participants": ["Sarah"]},
+    "todos": [{"action": "Draft the release notes", "description": None, "owner": "Sarah", "due": None}],
+    "audio": {"original_seconds": 10.0, "processed_seconds": 8.0, "removed_seconds": 2.0,
+              "original_bytes": 1000, "processed_bytes": 800, "removed_bytes": 200},
+}
+
+
+@pytest.fixture
+def store(state_dir):
+    return CheckpointStore(path=str(state_dir / "checkpoints.sqlite3"), audio_dir=str(state_dir / "audio"))
+
+
+def test_restore_rebuilds_models_and_drops_unusable_payloads():
+    restored = restore_checkpoints({
+        "transcript": "hello",
+        "analysis": None,
+        "summary": "short",
+        "structured_data": STRUCTURED,
+        "compacted": "not a checkpoint stage",
+    })
+    assert set(restored) == {"transcript", "summary", "structured_data"}
+    assert isinstance(restored["structured_data"], MeetingResult)
+    assert restored["structured_data"].audio.removed_seconds == 2.0
+
+    invalid = restore_checkpoints({"transcript": "hello", "structured_data": {"summary": "no meeting info"}})
+    assert set(invalid) == {"transcript"}
+
+
+def test_resume_stage():
+    assert resume_stage({}) == "transcript"
+    assert resume_stage({"transcript": "t", "analysis": "a"}) == "summary"
+    # Stages after a gap still run again
+    assert resume_stage({"transcript": "t", "summary": "s"}) == "analysis"
+    assert resume_stage({stage: "x" for stage in CHECKPOINT_STAGES}) == "publish"
+
+
+def test_store_round_trip_and_delete(store):
+    checkpoints = TaskCheckpoints(store, "task-1")
+    checkpoints.save("transcript", "hello")
+    checkpoints.save("structured_data", MeetingResult.model_validate(STRUCTURED))
+    assert checkpoints.saved == {"transcript", "structured_data"}
+
+    restored = TaskCheckpoints(store, "task-1").load()
+    assert restored["structured_data"] == MeetingResult.model_validate(STRUCTURED)
+    assert TaskCheckpoints(store, "task-2").load() == {}
+
+    checkpoints.clear()
+    assert store.load("task-1") == {}
+
+
+def test_prune_removes_expired_tasks(store):
+    store.save("old", "transcript", "hello")
+    store.ttl_seconds = 0.0
+    assert store.prune() == 1
+    assert store.load("old") == {}
+
+
+def test_pipeline_checkpoints_every_stage_and_resumes(store):
+    orchestrator = PipelineOrchestrator()
+    checkpoints = TaskCheckpoints(store, "task-1")
+    result = asyncio.run(orchestrator.arun("mock_audio.mp3", mock_transcript=MOCK_TRANSCRIPT, mode="standard",
+                                           checkpoints=checkpoints))
+    assert result is not None
+    assert checkpoints.saved == set(CHECKPOINT_STAGES)
+
+    # Keep the transcript and analysis only: the retry must not touch the (missing) audio
+    # file and must only run the stages after them
+    for stage in ("summary", "extracted_data", "structured_data"):
+        store._conn().execute("DELETE FROM checkpoints WHERE task_id = ? AND stage = ?", ("task-1", stage))
+    resumed = asyncio.run(orchestrator.arun("missing.mp3", mode="standard", checkpoints=TaskCheckpoints(store, "task-1")))
+    assert resumed is not None
+    assert resumed.todos == result.todos
+    ran = {entry["stage"] for entry in orchestrator.last_timeline}
+    assert ran.isdisjoint({"audio", "transcript", "analysis"})
+    assert {"summary", "extracted_data", "structured_data"} <= ran
@@ -0,0 +1,47 @@
+from agents.compaction import compact_transcript, missing_facts
+from mocks import MOCK_NOISY_TRANSCRIPT, MOCK_TRANSCRIPT, MOCK_TRANSCRIPT_FACTS
+
+
+def compact(text: str) -> str:
+    return compact_transcript(text)[0]
+
+
+def test_mock_fixtures_keep_every_fact():
+    for fixture in (MOCK_TRANSCRIPT, MOCK_NOISY_TRANSCRIPT):
+        assert missing_facts(compact(fixture), MOCK_TRANSCRIPT_FACTS) == []
+
+
+def test_times_are_not_speaker_labels():
+    assert compact("We meet at 10:30 on Friday.") == "We meet at 10:30 on Friday."
+    assert compact("Sarah: We meet at 10:30, um, on Friday.") == "Sarah: We meet at 10:30 on Friday."
+
+
+def test_non_speaker_colons_are_left_alone():
+    assert compact("The plan is: ship it on Monday.") == "The plan is: ship it on Monday."
+    assert compact("Sarah: Check https://example.com/docs today.") == "Sarah: Check https://example.com/docs today."
+
+
+def test_speaker_labels():
+    assert compact("Speaker 1: Hello.\nSPEAKER_02: Hi.\n화자 3: 안녕하세요.") == "S1: Hello.\nS2: Hi.\nS3: 안녕하세요."
+    assert compact("Dr. Kim: Let's start.\nDr. Kim: Agenda first.") == "Dr. Kim: Let's start. Agenda first."
+    assert compact("[00:01:05] 김민수: 음 시작할게요.") == "김민수: 시작할게요."
+
+
+def test_decimals_and_urls_survive_sentence_dedupe():
+    text = "Revenue grew 3.5 percent to 1.5 million. Details are on example.com today."
+    assert compact(text) == text
+
+
+def test_repeated_sentences_are_dropped_with_original_separators():
+    assert compact("Sarah: Let's start. Let's start. Version 2.1 ships Friday.") == \
+        "Sarah: Let's start. Version 2.1 ships Friday."
+
+
+def test_legitimate_repeats_are_kept():
+    assert compact("We flew to Bora Bora last year.") == "We flew to Bora Bora last year."
+    assert compact("Mike: The tests pass, pass rate is 98.5 percent.") == "Mike: The tests pass, pass rate is 98.5 percent."
+
+
+def test_stutters_and_triple_repeats_are_collapsed():
+    assert compact("I I think we we need the the report.") == "I think we need the report."
+    assert compact("Check check check the mic.") == "Check the mic."
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from hedging import HedgePolicy, hedged
+
+
+def policy(**kwargs) -> HedgePolicy:
+    options = dict(enabled=True, percentile=95, min_samples=5, min_delay=0.01, initial_delay=0, max_rate=0.5)
+    options.update(kwargs)
+    return HedgePolicy(**options)
+
+
+def test_delay_follows_the_latency_percentile():
+    hedge = policy()
+    assert hedge.delay("agent") is None  # too few samples yet
+    for seconds in (0.1, 0.2, 0.3, 0.4, 2.0):
+        hedge.observe("agent", seconds)
+    assert hedge.delay("agent") == 2.0
+    assert hedge.delay("other") is None
+    assert policy(enabled=False).delay("agent") is None
+
+
+def test_hedging_pauses_above_the_max_rate():
+    hedge = policy(initial_delay=0.5)
+    assert hedge.delay("agent") == 0.5
+    hedge.record_call(True)
+    hedge.record_call(False)
+    assert hedge.delay("agent") is None
+
+
+def test_slow_primary_loses_to_the_hedge():
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        await asyncio.sleep(1.0 if len(calls) == 1 else 0.01)
+        return f"answer-{len(calls)}"
+
+    result, winner = asyncio.run(hedged(call, delay=0.02))
+    assert (result, winner) == ("answer-2", "hedge")
+
+
+def test_fast_primary_sends_no_hedge():
+    async def call():
+        return "answer"
+
+    assert asyncio.run(hedged(call, delay=0.5)) == ("answer", None)
+    assert asyncio.run(hedged(call, delay=None)) == ("answer", None)
+
+
+def test_failed_hedge_falls_back_to_the_primary():
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 2:
+            raise RuntimeError("hedge failed")
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(hedged(call, delay=0.01)) == ("primary", "primary")
+
+
+def test_both_failures_raise():
+    async def call():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError, match="down"):
+        asyncio.run(hedged(call, delay=0.001))
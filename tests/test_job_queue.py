@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from event_loop import BackgroundLoop
+from job_queue import MAX_PRIORITY, JobQueue, QueueFullError, clamp_priority
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_clamp_priority():
+    assert clamp_priority(-5) == 0
+    assert clamp_priority("3") == 3
+    assert clamp_priority(42) == MAX_PRIORITY
+
+
+def test_lower_priority_runs_first_and_ties_keep_submission_order():
+    gate = threading.Event()
+    order = []
+
+    def handler(job_id):
+        if job_id == "blocker":
+            gate.wait(5)
+        order.append(job_id)
+
+    jobs = JobQueue(handler, workers=1, maxsize=10, backend="thread")
+    jobs.submit("blocker")
+    wait_for(lambda: jobs.stats()["running"] == 1)
+    jobs.submit("late", priority=5)
+    jobs.submit("first", priority=0)
+    jobs.submit("second", priority=0)
+    jobs.submit("clamped", priority=99)
+    gate.set()
+    wait_for(lambda: jobs.stats()["processed"] == 5)
+    assert order == ["blocker", "first", "second", "late", "clamped"]
+
+
+def test_full_queue_raises_with_retry_after():
+    gate = threading.Event()
+    jobs = JobQueue(lambda job_id: gate.wait(5), workers=1, maxsize=2, backend="thread")
+    jobs.submit("running")
+    wait_for(lambda: jobs.stats()["running"] == 1)
+    jobs.submit("queued-1")
+    jobs.submit("queued-2")
+    assert jobs.is_full()
+    with pytest.raises(QueueFullError) as error:
+        jobs.submit("rejected")
+    assert error.value.retry_after >= 1
+    gate.set()
+    wait_for(lambda: jobs.stats()["processed"] == 3)
+
+
+def test_async_backend_keeps_waiting_jobs_queued():
+    loop = BackgroundLoop(name="test-loop")
+    release = threading.Event()
+    finished = []
+
+    async def handler(job_id):
+        await asyncio.to_thread(release.wait, 5)
+        finished.append(job_id)
+
+    jobs = JobQueue(handler, workers=2, maxsize=1, backend="async", loop=loop)
+    for running, job_id in enumerate(("a", "b"), start=1):
+        jobs.submit(job_id)
+        wait_for(lambda: jobs.stats()["running"] == running)
+    # Both slots are busy, so the next job waits in the queue and counts towards its depth
+    jobs.submit("c")
+    assert jobs.stats()["depth"] == 1
+    with pytest.raises(QueueFullError):
+        jobs.submit("d")
+    release.set()
+    wait_for(lambda: jobs.stats()["processed"] == 3)
+    assert sorted(finished) == ["a", "b", "c"]
+
+
+def test_crashed_job_frees_its_worker():
+    def handler(job_id):
+        if job_id == "bad":
+            raise RuntimeError("boom")
+
+    jobs = JobQueue(handler, workers=1, maxsize=5, backend="thread")
+    jobs.submit("bad")
+    jobs.submit("good")
+    wait_for(lambda: jobs.stats()["processed"] == 2)
+    assert jobs.stats()["running"] == 0
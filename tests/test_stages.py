@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from stages import StageGraph, StageTimeoutError
+
+
+def run(graph: StageGraph, initial=None) -> dict:
+    return asyncio.run(graph.arun(initial))
+
+
+def test_stages_receive_dependency_outputs_in_order():
+    graph = StageGraph()
+    graph.add("transcript", lambda: "hello")
+    graph.add("summary", lambda transcript: transcript.upper(), deps=["transcript"])
+    graph.add("result", lambda summary, transcript: f"{summary}/{transcript}", deps=["summary", "transcript"])
+    assert run(graph)["result"] == "HELLO/hello"
+
+
+def test_independent_stages_run_concurrently():
+    running, peak = 0, 0
+
+    async def stage(*_):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return "done"
+
+    graph = StageGraph()
+    graph.add("transcript", stage)
+    graph.add("summary", stage, deps=["transcript"])
+    graph.add("todos", stage, deps=["transcript"])
+    run(graph)
+    assert peak == 2
+
+
+def test_restored_results_skip_the_stages_that_produced_them():
+    calls = []
+
+    def stage(name):
+        def func(*_):
+            calls.append(name)
+            return name
+        return func
+
+    graph = StageGraph()
+    graph.add("audio", stage("audio"))
+    graph.add("transcript", stage("transcript"), deps=["audio"])
+    graph.add("summary", stage("summary"), deps=["transcript"])
+    graph.add("todos", stage("todos"), deps=["transcript"])
+    results = run(graph, {"transcript": "restored", "summary": "restored"})
+    assert calls == ["todos"]
+    assert results["summary"] == "restored"
+
+
+def test_events_wrap_every_stage():
+    events = []
+    graph = StageGraph(on_event=lambda name, state, output: events.append((name, state, output)))
+    graph.add("transcript", lambda: "hello")
+    run(graph)
+    assert events == [("transcript", "started", None), ("transcript", "finished", "hello")]
+
+
+def test_unknown_dependency_and_cycles_are_rejected():
+    graph = StageGraph().add("summary", lambda t: t, deps=["transcript"])
+    with pytest.raises(ValueError, match="unknown stage"):
+        run(graph)
+    with pytest.raises(ValueError, match="Duplicate stage"):
+        graph.add("summary", lambda: None)
+
+    graph = StageGraph()
+    graph.add("result", lambda a, b: None, deps=["a", "b"])
+    graph.add("a", lambda b: None, deps=["b"])
+    graph.add("b", lambda a: None, deps=["a"])
+    with pytest.raises(RuntimeError, match="dependency cycle"):
+        run(graph)
+
+
+def test_stage_budget_raises_and_cancels_pending_stages():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def sibling():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    graph = StageGraph(timeout_for=lambda stage: 0.05 if stage == "summary" else None)
+    graph.add("summary", slow)
+    graph.add("todos", sibling)
+
+    async def main():
+        with pytest.raises(StageTimeoutError) as error:
+            await graph.arun()
+        await asyncio.sleep(0)
+        return error.value
+
+    error = asyncio.run(main())
+    assert (error.stage, error.budget) == ("summary", 0.05)
+    assert cancelled.is_set()
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from agents.structure import IntegrationAgent
+from sync_index import SyncIndex, content_hash, todo_fingerprint
+
+MEETING = {
+    "summary": "Launch planning.",
+    "meeting_info": {"title": "Launch sync", "date": "2026-10-01", "participants": ["Sarah", "Tom"]},
+    "todos": [
+        {"action": "Draft the release notes", "description": None, "owner": "Sarah", "due": "2026-10-05"},
+        {"action": "Book the demo room", "description": None, "owner": "Tom", "due": None},
+        {"action": "Book the demo room", "description": None, "owner": "Tom", "due": None},
+    ],
+}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("NOTION_MOCK", "true")
+    monkeypatch.setenv("NOTION_RATE_LIMIT", "1000")
+    monkeypatch.setenv("NOTION_RATE_BURST", "1000")
+    return IntegrationAgent()
+
+
+def sync(agent: IntegrationAgent, data: dict, source=None) -> list:
+    assert asyncio.run(agent.async_sync_to_notion(data, source))
+    return [row["status"] for row in agent.last_sync_report]
+
+
+def test_fingerprint_with_source_ignores_llm_wording():
+    todo = MEETING["todos"][0]
+    reworded = dict(todo, action="Write the release notes", owner="Tom")
+    assert todo_fingerprint("db", MEETING["meeting_info"], todo, source="abc", position=0) == \
+        todo_fingerprint("db", {"title": "Other"}, reworded, source="abc", position=0)
+    assert todo_fingerprint("db", MEETING["meeting_info"], todo, source="abc", position=0) != \
+        todo_fingerprint("db", MEETING["meeting_info"], todo, source="abc", position=1)
+    assert todo_fingerprint("db", MEETING["meeting_info"], todo) != \
+        todo_fingerprint("db", MEETING["meeting_info"], todo, occurrence=1)
+
+
+def test_index_round_trip(state_dir):
+    index = SyncIndex(str(state_dir / "index.sqlite3"))
+    assert index.get("fp") is None
+    index.put("fp", "page-1", content_hash({"Name": "x"}))
+    assert index.get("fp") == ("page-1", content_hash({"Name": "x"}))
+    index.delete("fp")
+    assert index.get("fp") is None
+
+
+def test_resync_skips_unchanged_rows(agent):
+    assert sync(agent, MEETING) == ["created", "created", "created"]
+    assert sync(agent, MEETING) == ["skipped", "skipped", "skipped"]
+
+
+def test_rerun_of_same_source_updates_rows_in_place(agent):
+    assert sync(agent, MEETING, source="audio-hash") == ["created", "created", "created"]
+    page_ids = [agent.sync_index.get(row)[0] for row in _fingerprints(agent, MEETING, "audio-hash")]
+
+    # A re-run whose LLM output re-titles the meeting and reassigns a todo
+    rerun = {**MEETING, "meeting_info": {**MEETING["meeting_info"], "title": "Launch planning"},
+             "todos": [dict(MEETING["todos"][0], owner="Tom")] + MEETING["todos"][1:]}
+    assert sync(agent, rerun, source="audio-hash") == ["updated", "updated", "updated"]
+    assert [agent.sync_index.get(row)[0] for row in _fingerprints(agent, rerun, "audio-hash")] == page_ids
+    assert sync(agent, rerun, source="audio-hash") == ["skipped", "skipped", "skipped"]
+
+
+def _fingerprints(agent: IntegrationAgent, data: dict, source: str) -> list:
+    return [todo_fingerprint(agent.database_id, data["meeting_info"], todo, source=source, position=position)
+            for position, todo in enumerate(data["todos"])]
@@ -0,0 +1,57 @@
+import json
+import time
+
+import pytest
+
+from task_store import MemoryTaskStore, SQLiteTaskStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, state_dir):
+    def make(**kwargs):
+        if request.param == "memory":
+            return MemoryTaskStore(**kwargs)
+        return SQLiteTaskStore(path=str(state_dir / "tasks.sqlite3"), **kwargs)
+    return make
+
+
+def test_every_write_bumps_the_version(make_store):
+    store = make_store()
+    assert store.get_versioned("missing") == (None, 0)
+    assert store.get_json("missing") == (None, None, 0)
+    assert store.version("missing") is None
+
+    store.create("task-1", {"status": "pending", "result": None})
+    assert store.version("task-1") == 1
+    store.update("task-1", status="processing", stage="transcript")
+    store.update("task-1", stage="summary")
+    record, version = store.get_versioned("task-1")
+    assert version == store.version("task-1") == 3
+    assert record == {"status": "processing", "result": None, "stage": "summary"}
+
+    data, status, version = store.get_json("task-1")
+    assert (json.loads(data), status, version) == (record, "processing", 3)
+
+    with pytest.raises(KeyError):
+        store.update("missing", status="failed")
+
+
+def test_prune_keeps_failed_tasks_for_longer(make_store):
+    store = make_store(ttl_seconds=0.0, failed_ttl_seconds=0.2)
+    for task_id, status in (("done", "completed"), ("broken", "failed"), ("busy", "processing")):
+        store.create(task_id, {"status": "pending"})
+        store.update(task_id, status=status)
+
+    assert store.prune() == 1
+    assert store.get("done") is None
+    assert store.get("broken") is not None
+
+    time.sleep(0.3)
+    assert store.prune() == 1
+    assert store.get("broken") is None
+    # Unfinished tasks never expire
+    assert store.get("busy") == {"status": "processing"}
+
+
+def test_failed_ttl_is_at_least_the_completed_ttl(make_store):
+    assert make_store(ttl_seconds=60.0, failed_ttl_seconds=10.0).failed_ttl_seconds == 60.0